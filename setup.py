@@ -27,38 +27,55 @@ os.makedirs(os.path.join(RESOURCES_DIR, "profiles"), exist_ok=True)
 os.makedirs(os.path.join(RESOURCES_DIR, "themes"), exist_ok=True)
 os.makedirs(os.path.join(RESOURCES_DIR, "macros"), exist_ok=True)
 
-# Clean previous build
+# Build as a single self-extracting executable only when explicitly requested;
+# the default one-folder build avoids unpacking the bundle on every launch
+ONEFILE = os.getenv('THAMYRIS_ONEFILE') == '1'
+
+# Clean previous distribution (the build directory is kept so PyInstaller
+# can reuse its analysis cache between builds)
 if os.path.exists(DIST_DIR):
     shutil.rmtree(DIST_DIR)
-if os.path.exists(BUILD_DIR):
-    shutil.rmtree(BUILD_DIR)
 if os.path.exists(SPEC_FILE):
     os.remove(SPEC_FILE)
 
 # Define PyInstaller arguments
 pyinstaller_args = [
     '--name=%s' % APP_NAME,
-    '--onedir',
     '--windowed',
-    '--add-data=%s;%s' % (os.path.join(RESOURCES_DIR, '*'), 'resources'),
+    '--add-data=%s%s%s' % (os.path.join(RESOURCES_DIR, '*'), os.pathsep, 'resources'),
     '--icon=%s' % os.path.join(ROOT_DIR, 'resources', 'icon.ico'),
     '--noconfirm',
-    '--clean',
-    os.path.join(SRC_DIR, 'main.py')
+    '--hidden-import=orjson',
+    # Standard library packages the application never uses
+    '--exclude-module=tkinter',
+    '--exclude-module=unittest',
+    '--exclude-module=test',
+    '--exclude-module=pydoc_data',
 ]
 
+if ONEFILE:
+    pyinstaller_args.append('--onefile')
+else:
+    pyinstaller_args += ['--onedir', '--contents-directory=lib']
+
+pyinstaller_args.append(os.path.join(SRC_DIR, 'main.py'))
+
 # Run PyInstaller
 run(pyinstaller_args)
 
+# One-file builds produce a bare executable in DIST_DIR; one-folder builds
+# produce DIST_DIR/APP_NAME
+APP_DIR = DIST_DIR if ONEFILE else os.path.join(DIST_DIR, APP_NAME)
+
 # Copy additional files to the distribution directory
-shutil.copy(os.path.join(ROOT_DIR, 'README.md'), os.path.join(DIST_DIR, APP_NAME))
-shutil.copy(os.path.join(ROOT_DIR, 'LICENSE'), os.path.join(DIST_DIR, APP_NAME))
+shutil.copy(os.path.join(ROOT_DIR, 'README.md'), APP_DIR)
+shutil.copy(os.path.join(ROOT_DIR, 'LICENSE'), APP_DIR)
 
 # Create empty resource directories in the distribution
-os.makedirs(os.path.join(DIST_DIR, APP_NAME, 'resources', 'sounds'), exist_ok=True)
-os.makedirs(os.path.join(DIST_DIR, APP_NAME, 'resources', 'profiles'), exist_ok=True)
-os.makedirs(os.path.join(DIST_DIR, APP_NAME, 'resources', 'themes'), exist_ok=True)
-os.makedirs(os.path.join(DIST_DIR, APP_NAME, 'resources', 'macros'), exist_ok=True)
+os.makedirs(os.path.join(APP_DIR, 'resources', 'sounds'), exist_ok=True)
+os.makedirs(os.path.join(APP_DIR, 'resources', 'profiles'), exist_ok=True)
+os.makedirs(os.path.join(APP_DIR, 'resources', 'themes'), exist_ok=True)
+os.makedirs(os.path.join(APP_DIR, 'resources', 'macros'), exist_ok=True)
 
 print(f"Build completed! {APP_NAME} v{VERSION} has been packaged successfully.")
-print(f"The application can be found in: {os.path.join(DIST_DIR, APP_NAME)}")
+print(f"The application can be found in: {APP_DIR}")
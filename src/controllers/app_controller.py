@@ -2,14 +2,15 @@
 App controller - Main application controller
 """
 import os
-import threading
 import asyncio
-from PyQt6.QtCore import QObject, pyqtSignal, QThread
+import concurrent.futures
+from PyQt6.QtCore import QObject, pyqtSignal, QThread, QTimer, QCoreApplication
 
 from models.settings import Settings, Theme
 from models.profile import Profile, Tab
 from models.sound import Sound, ChannelType, PlaybackMode
 from models.audio_player import AudioPlayer
+from models.sound_cache import SoundCache
 from models.sound_file_manager import SoundFileManager
 from models.profile_manager import ProfileManager
 from models.theme_file_manager import ThemeFileManager
@@ -23,6 +24,7 @@ class AppController(QObject):
     
     # Signals
     channels_updated = pyqtSignal(list)  # List of available voice channels
+    discord_connected = pyqtSignal(bool)  # Whether a voice connection succeeded
     
     def __init__(self):
         super().__init__()
@@ -30,6 +32,11 @@ class AppController(QObject):
         # Get base directory
         self.base_directory = os.getcwd()
         
+        # Resolve the settings file location once
+        settings_dir = os.path.join(self.base_directory, 'resources', 'settings')
+        os.makedirs(settings_dir, exist_ok=True)
+        self.settings_path = os.path.join(settings_dir, 'settings.json')
+        
         # Initialize file managers
         self.sound_file_manager = SoundFileManager(self.base_directory)
         self.profile_manager = ProfileManager(self.base_directory)
@@ -38,12 +45,47 @@ class AppController(QObject):
         # Initialize models
         self.settings = self.load_settings()
         self.profile = self.load_last_profile() or Profile.create_empty()
-        self.discord_integration = DiscordIntegration()
-        self.audio_player = AudioPlayer(self.settings.master_volume)
+        
+        # Sounds are decoded once and shared by local and Discord playback
+        self.sound_cache = SoundCache()
+        self.discord_integration = DiscordIntegration(self.sound_cache)
+        self.audio_player = AudioPlayer(self.settings.master_volume, self.sound_cache)
+        
+        # Background decoding of profile sounds into the sound cache
+        self._prewarm_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix='sound-prewarm'
+        )
+        self._prewarm_futures = {}  # File path -> pre-decode future
         
         # Initialize views
         self.main_window = MainWindow()
         
+        # Fonts already resolved, by (family, size), and the one last applied
+        self._font_cache = {}
+        self._last_font_key = None
+        
+        # Coalesce rapid settings changes (e.g. slider drags) into a single write
+        self._settings_save_timer = QTimer(self)
+        self._settings_save_timer.setSingleShot(True)
+        self._settings_save_timer.setInterval(750)
+        self._settings_save_timer.timeout.connect(self._flush_settings)
+        
+        # Coalesce rapid ambient track switches into a single transition
+        self._pending_ambient_index = -1
+        self._pending_ambient_timer = QTimer(self)
+        self._pending_ambient_timer.setSingleShot(True)
+        self._pending_ambient_timer.setInterval(120)
+        self._pending_ambient_timer.timeout.connect(self._play_pending_ambient)
+        
+        # Index of the ambient track actually playing (-1 if none)
+        self._playing_ambient_index = -1
+        
+        # Make sure a pending write is not lost on exit
+        QCoreApplication.instance().aboutToQuit.connect(self._flush_pending_settings)
+        
+        # Drop queued pre-decodes on exit rather than wait for them
+        QCoreApplication.instance().aboutToQuit.connect(self._stop_prewarm)
+        
         # Connect signals and slots
         self.connect_signals()
     
@@ -71,12 +113,17 @@ class AppController(QObject):
         
         # Controller signals
         self.channels_updated.connect(self.main_window.update_channel_list)
+        self.discord_connected.connect(self.main_window.set_discord_connected)
     
     def start(self):
         """Start the application"""
         # Start the audio player
         self.audio_player.start()
         
+        # Refresh the channel list as soon as the bot has guild data. This runs
+        # on the bot thread; channels_updated is delivered to the GUI queued.
+        self.discord_integration.set_ready_callback(self.update_channel_list)
+        
         # Start the Discord integration
         self.discord_integration.start_bot()
         
@@ -86,53 +133,84 @@ class AppController(QObject):
         # Load the profile
         self.apply_profile()
         
-        # Show the main window
+        # Show the main window, themed from its first paint
+        ThemeManager.flush_pending_theme()
         self.main_window.show()
-        
-        # Schedule a task to update the channel list
-        threading.Timer(2.0, self.update_channel_list).start()
     
     def load_settings(self):
         """Load application settings"""
-        settings_dir = os.path.join(os.getcwd(), 'resources', 'settings')
-        os.makedirs(settings_dir, exist_ok=True)
-        
-        settings_path = os.path.join(settings_dir, 'settings.json')
-        return Settings.load_from_file(settings_path)
+        return Settings.load_from_file(self.settings_path)
     
     def save_settings(self):
         """Save application settings"""
-        settings_dir = os.path.join(os.getcwd(), 'resources', 'settings')
-        os.makedirs(settings_dir, exist_ok=True)
-        
-        settings_path = os.path.join(settings_dir, 'settings.json')
-        self.settings.save_to_file(settings_path)
+        self.settings.save_to_file(self.settings_path)
+    
+    def schedule_save_settings(self):
+        """Save settings once changes have settled"""
+        # Restarting the timer pushes the write back until changes stop
+        self._settings_save_timer.start()
+    
+    def _flush_settings(self):
+        """Write settings to disk"""
+        self.save_settings()
+    
+    def _flush_pending_settings(self):
+        """Write settings immediately if a delayed save is pending"""
+        if self._settings_save_timer.isActive():
+            self._settings_save_timer.stop()
+            self._flush_settings()
     
     def apply_settings(self):
         """Apply settings to the application"""
-        # Apply theme
-        ThemeManager.apply_theme(self.settings.theme)
+        # Apply theme, with the selected theme file's colours for a custom one
+        colors = None
+        if self.settings.theme == Theme.CUSTOM:
+            colors = self._load_custom_theme_colors()
+        ThemeManager.apply_theme(self.settings.theme, colors)
+        
+        channel_volumes = {
+            ChannelType.AMBIENT: self.settings.ambient_volume,
+            ChannelType.EFFECTS_1: self.settings.effects_volume,
+            ChannelType.EFFECTS_2: self.settings.effects_volume,
+            ChannelType.EFFECTS_3: self.settings.effects_volume
+        }
         
         # Set audio player settings
         self.audio_player.set_master_volume(self.settings.master_volume)
-        self.audio_player.set_channel_volume(ChannelType.AMBIENT, self.settings.ambient_volume)
-        self.audio_player.set_channel_volume(ChannelType.EFFECTS_1, self.settings.effects_volume)
-        self.audio_player.set_channel_volume(ChannelType.EFFECTS_2, self.settings.effects_volume)
-        self.audio_player.set_channel_volume(ChannelType.EFFECTS_3, self.settings.effects_volume)
-        self.audio_player.set_voice_ducking(True, self.settings.voice_ducking_amount)
+        self.audio_player.set_channel_volumes(channel_volumes)
+        self.audio_player.set_voice_ducking(self.settings.voice_ducking_enabled,
+                                            self.settings.voice_ducking_amount)
         
         # Update UI
-        self.main_window.master_volume_slider.setValue(int(self.settings.master_volume * 100))
-        self.main_window.channel_mixer.set_channel_volume(ChannelType.AMBIENT, self.settings.ambient_volume)
-        self.main_window.channel_mixer.set_channel_volume(ChannelType.EFFECTS_1, self.settings.effects_volume)
-        self.main_window.channel_mixer.set_channel_volume(ChannelType.EFFECTS_2, self.settings.effects_volume)
-        self.main_window.channel_mixer.set_channel_volume(ChannelType.EFFECTS_3, self.settings.effects_volume)
-        self.main_window.channel_mixer.set_voice_ducking(True, self.settings.voice_ducking_amount)
-        
-        # Apply font settings
-        from PyQt6.QtGui import QFont
-        font = QFont(self.settings.font_family, self.settings.font_size)
-        self.main_window.setFont(font)
+        self.main_window.set_master_volume(self.settings.master_volume)
+        self.main_window.channel_mixer.set_channel_volumes(channel_volumes)
+        self.main_window.channel_mixer.set_voice_ducking(self.settings.voice_ducking_enabled,
+                                                         self.settings.voice_ducking_amount)
+        
+        # Apply font settings, skipping the widget-tree font update if unchanged
+        font_key = (self.settings.font_family, self.settings.font_size)
+        if font_key != self._last_font_key:
+            font = self._font_cache.get(font_key)
+            if font is None:
+                from PyQt6.QtGui import QFont
+                font = self._font_cache[font_key] = QFont(*font_key)
+            self.main_window.setFont(font)
+            self._last_font_key = font_key
+    
+    def _load_custom_theme_colors(self):
+        """Load the colours of the theme file selected for the custom theme
+        
+        Returns:
+            Colours by theme file key, or None if the theme file is missing
+        """
+        name = self.settings.custom_theme
+        for theme in self.theme_file_manager.get_available_themes():
+            if theme['name'] == name:
+                theme_file = self.theme_file_manager.load_theme(theme['path'])
+                return theme_file.colors if theme_file else None
+        
+        print(f"Custom theme file not found: {name or '(none selected)'}")
+        return None
     
     def load_last_profile(self):
         """Load the last used profile"""
@@ -145,13 +223,17 @@ class AppController(QObject):
         """Load a profile from a file"""
         profile = self.profile_manager.load_profile(file_path)
         if profile:
+            # Stop the old profile's ambient track while it can still be
+            # looked up; this also forgets which index was playing
+            self.stop_ambient()
+            
             self.profile = profile
             self.settings.last_profile = file_path
             self.save_settings()
             self.apply_profile()
             
             # Update main window title
-            profile_name = os.path.basename(file_path).split('.')[0]
+            profile_name = profile.name
             self.main_window.setWindowTitle(f"Thamyris - {profile_name}")
             
             # Show confirmation message
@@ -162,15 +244,16 @@ class AppController(QObject):
         # Update profile from UI
         self.update_profile_from_ui()
         
-        # Save the profile
-        self.profile_manager.save_profile(self.profile, os.path.basename(file_path).split('.')[0])
+        # Save the profile under the file's name
+        self.profile.name = os.path.splitext(os.path.basename(file_path))[0]
+        self.profile_manager.save_profile(self.profile)
         
         # Update settings
         self.settings.last_profile = file_path
         self.save_settings()
         
         # Update main window title
-        self.main_window.setWindowTitle(f"Thamyris - {os.path.basename(file_path).split('.')[0]}")
+        self.main_window.setWindowTitle(f"Thamyris - {self.profile.name}")
         
         # Show confirmation message
         self.main_window.statusBar().showMessage(f"Profile saved: {os.path.basename(file_path)}", 3000)
@@ -186,41 +269,18 @@ class AppController(QObject):
         # Iterate through all tabs in the UI
         for tab_index in range(self.main_window.tab_widget.count()):
             tab_name = self.main_window.tab_widget.tabText(tab_index)
-            tab = Tab(name=tab_name)
             
-            # Get the tab's scroll area
-            scroll = self.main_window.tab_widget.widget(tab_index)
-            
-            # Get the tab content widget
-            tab_content = scroll.widget()
-            
-            # Get all sound buttons in the tab
-            for i in range(tab_content.layout().count()):
-                item = tab_content.layout().itemAt(i)
-                if item and item.widget():
-                    button = item.widget()
-                    if isinstance(button, SoundButton):
-                        # Add the sound to the tab
-                        tab.sounds.append(button.sound)
+            # Each tab's content widget keeps the list of its sounds
+            tab_content = self.main_window.tab_widget.widget(tab_index).widget()
+            tab = Tab(name=tab_name, sounds=list(tab_content.sound_list))
             
             # Add the tab to the profile
             self.profile.tabs.append(tab)
     
     def apply_profile(self):
         """Apply the profile to the UI"""
-        # Clear existing tabs
-        while self.main_window.tab_widget.count() > 0:
-            self.main_window.tab_widget.removeTab(0)
-        
-        # Add tabs from profile
-        for tab in self.profile.tabs:
-            self.main_window.add_tab(tab.name)
-            
-            # Add sounds to the tab
-            for sound in tab.sounds:
-                self.main_window.add_sound_button(
-                    self.main_window.tab_widget.count() - 1, sound
-                )
+        # Update the tabs, reusing existing tabs and buttons where possible
+        self.main_window.sync_tabs(self.profile.tabs)
         
         # Set active tab
         if self.profile.active_tab_index < self.main_window.tab_widget.count():
@@ -236,21 +296,43 @@ class AppController(QObject):
             # Play the active ambient track
             if self.profile.active_ambient_index < len(self.profile.ambient_tracks):
                 self.play_ambient(self.profile.active_ambient_index)
+        
+        # Decode the tab sounds ahead of their first press. Ambient tracks are
+        # usually large, so they are left to decode when played.
+        # Forget finished pre-decodes; the cache says whether they stuck
+        self._prewarm_futures = {
+            path: future for path, future in self._prewarm_futures.items() if not future.done()
+        }
+        for sound in self.profile.all_sounds():
+            path = sound.file_path
+            if path in self._prewarm_futures or self.sound_cache.contains(path):
+                continue
+            self._prewarm_futures[path] = self._prewarm_pool.submit(self.sound_cache.get_pcm, path)
+    
+    def _stop_prewarm(self):
+        """Cancel pre-decodes that have not started"""
+        self._prewarm_pool.shutdown(wait=False, cancel_futures=True)
     
     def update_channel_list(self):
         """Update the list of available voice channels"""
-        channels = self.discord_integration.get_available_channels()
-        self.channels_updated.emit(channels)
+        # The result may arrive on the bot thread; the signal is queued to the GUI
+        self.discord_integration.get_available_channels(self.channels_updated.emit)
     
     def connect_discord(self, channel_id):
         """Connect to a Discord voice channel"""
-        result = self.discord_integration.connect_to_channel(channel_id)
-        self.main_window.set_discord_connected(result)
+        started = self.discord_integration.connect_to_channel(
+            channel_id, self.discord_connected.emit
+        )
+        if not started:
+            self.main_window.set_discord_connected(False)
     
     def disconnect_discord(self):
         """Disconnect from Discord voice channel"""
-        self.discord_integration.disconnect()
-        self.main_window.set_discord_connected(False)
+        started = self.discord_integration.disconnect(
+            lambda: self.discord_connected.emit(False)
+        )
+        if not started:
+            self.main_window.set_discord_connected(False)
     
     def play_sound(self, sound):
         """Play a sound"""
@@ -291,7 +373,7 @@ class AppController(QObject):
             self.settings.effects_volume = volume
         
         # Save settings
-        self.save_settings()
+        self.schedule_save_settings()
     
     def set_voice_ducking_enabled(self, enabled):
         """Enable or disable voice ducking"""
@@ -300,16 +382,16 @@ class AppController(QObject):
         
         # Update settings
         self.settings.voice_ducking_enabled = enabled
-        self.save_settings()
+        self.schedule_save_settings()
     
     def set_voice_ducking_amount(self, amount):
         """Set the voice ducking amount"""
         # Update audio player
-        self.audio_player.set_voice_ducking(True, amount)
+        self.audio_player.set_voice_ducking(self.settings.voice_ducking_enabled, amount)
         
         # Update settings
         self.settings.voice_ducking_amount = amount
-        self.save_settings()
+        self.schedule_save_settings()
     
     def set_master_volume(self, volume):
         """Set the master volume"""
@@ -318,13 +400,33 @@ class AppController(QObject):
         
         # Update settings
         self.settings.master_volume = volume
-        self.save_settings()
+        self.schedule_save_settings()
     
     def play_ambient(self, index):
-        """Play an ambient track"""
+        """Play an ambient track
+        
+        The switch happens after a short delay, so clicking quickly through
+        the tracks only stops and starts playback once.
+        """
         if index < 0 or index >= len(self.profile.ambient_tracks):
             return
         
+        # Nothing to do if this track is already playing
+        if index == self._playing_ambient_index and not self._pending_ambient_timer.isActive():
+            return
+        
+        self._pending_ambient_index = index
+        self._pending_ambient_timer.start()
+    
+    def _play_pending_ambient(self):
+        """Switch to the most recently requested ambient track"""
+        index = self._pending_ambient_index
+        if index < 0 or index >= len(self.profile.ambient_tracks):
+            return
+        
+        if index == self._playing_ambient_index:
+            return
+        
         # Stop any current ambient
         self.stop_ambient()
         
@@ -335,15 +437,20 @@ class AppController(QObject):
         
         # Update profile
         self.profile.active_ambient_index = index
+        self._playing_ambient_index = index
     
     def stop_ambient(self):
         """Stop the ambient track"""
+        # Cancel any switch that has not happened yet
+        self._pending_ambient_timer.stop()
+        
         if self.profile.active_ambient_index >= 0 and self.profile.active_ambient_index < len(self.profile.ambient_tracks):
             sound = self.profile.ambient_tracks[self.profile.active_ambient_index]
             self.stop_sound(sound.file_path)
         
         # Update profile
         self.profile.active_ambient_index = -1
+        self._playing_ambient_index = -1
     
     def add_ambient(self, file_path):
         """Add an ambient track"""
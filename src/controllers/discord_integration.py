@@ -1,24 +1,44 @@
 """
 Discord bot integration module - Connects the Discord bot with the application
 """
+from __future__ import annotations
+
 import os
 import asyncio
 import threading
-from typing import Optional, List, Dict, Any, Callable
+import concurrent.futures
+from typing import Optional, List, Dict, Any, Callable, TYPE_CHECKING
 
-from models.sound import Sound
-from discord_bot import SoundboardBot
+# discord.py is heavy to import, so it is only loaded on the bot thread
+if TYPE_CHECKING:
+    from models.sound import Sound
+    from models.sound_cache import SoundCache
+    from discord_bot import SoundboardBot
 
 class DiscordIntegration:
     """Class for integrating the Discord bot with the application"""
     
-    def __init__(self):
-        """Initialize the Discord integration"""
+    def __init__(self, sound_cache: Optional[SoundCache] = None):
+        """Initialize the Discord integration
+        
+        Args:
+            sound_cache: Optional decoded audio cache to share with the bot
+        """
+        self.sound_cache = sound_cache
         self.bot: Optional[SoundboardBot] = None
         self.bot_thread: Optional[threading.Thread] = None
         self.is_connected = False
         self.current_channel_id = None
         self.loop = asyncio.new_event_loop()
+        self._ready_callback: Optional[Callable[[], None]] = None
+    
+    def set_ready_callback(self, callback: Optional[Callable[[], None]]):
+        """Set a callback to run whenever the bot is ready
+        
+        The callback is called from the bot thread, so it must only do
+        thread-safe work such as emitting a Qt signal.
+        """
+        self._ready_callback = callback
     
     def start_bot(self):
         """Start the Discord bot in a separate thread"""
@@ -27,7 +47,7 @@ class DiscordIntegration:
         
         def run_bot_thread():
             asyncio.set_event_loop(self.loop)
-            self.bot = self.loop.run_until_complete(self._create_and_start_bot())
+            self.loop.run_until_complete(self._create_and_start_bot())
         
         self.bot_thread = threading.Thread(target=run_bot_thread, daemon=True)
         self.bot_thread.start()
@@ -35,58 +55,91 @@ class DiscordIntegration:
     async def _create_and_start_bot(self):
         """Create and start the Discord bot"""
         from discord_bot import run_bot
-        return await run_bot()
+        return await run_bot(on_ready=self._on_bot_ready, sound_cache=self.sound_cache)
+    
+    def _on_bot_ready(self, bot: SoundboardBot):
+        """Handle the bot becoming ready (called on the bot's event loop)"""
+        self.bot = bot
+        
+        if self._ready_callback:
+            self._ready_callback()
     
-    def connect_to_channel(self, channel_id: str) -> bool:
-        """Connect to a voice channel"""
+    def submit_async(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the bot's event loop without waiting for it"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    def connect_to_channel(self, channel_id: str,
+                           callback: Optional[Callable[[bool], None]] = None) -> bool:
+        """Start connecting to a voice channel
+        
+        Args:
+            channel_id: ID of the voice channel to join
+            callback: Optional function called from the bot thread with
+                      whether the connection succeeded
+        
+        Returns:
+            bool: True if the connection attempt was started
+        """
         if not self.bot:
             return False
         
         self.current_channel_id = channel_id
         
         # Get the channel
-        channel = None
-        for guild in self.bot.guilds:
-            for voice_channel in guild.voice_channels:
-                if str(voice_channel.id) == channel_id:
-                    channel = voice_channel
-                    break
-            if channel:
-                break
-        
+        channel = self.bot.get_voice_channel(channel_id)
         if not channel:
             return False
         
         # Connect to the channel
-        future = asyncio.run_coroutine_threadsafe(
-            self.bot.join_voice_channel(channel),
-            self.loop
+        future = self.submit_async(
+            asyncio.wait_for(self.bot.join_voice_channel(channel), timeout=10)
         )
         
-        try:
-            future.result(timeout=10)
-            self.is_connected = True
-            return True
-        except Exception as e:
-            print(f"Error connecting to voice channel: {e}")
-            return False
+        def on_done(future):
+            try:
+                future.result()
+                self.is_connected = True
+            except Exception as e:
+                print(f"Error connecting to voice channel: {e}")
+                self.is_connected = False
+            
+            if callback:
+                callback(self.is_connected)
+        
+        future.add_done_callback(on_done)
+        return True
     
-    def disconnect(self):
-        """Disconnect from the voice channel"""
+    def disconnect(self, callback: Optional[Callable[[], None]] = None) -> bool:
+        """Start disconnecting from the voice channel
+        
+        Args:
+            callback: Optional function called from the bot thread once the
+                      bot has left the channel
+        
+        Returns:
+            bool: True if the disconnection was started
+        """
         if not self.bot:
-            return
+            return False
         
-        future = asyncio.run_coroutine_threadsafe(
-            self.bot.leave_voice_channel(),
-            self.loop
+        future = self.submit_async(
+            asyncio.wait_for(self.bot.leave_voice_channel(), timeout=5)
         )
         
-        try:
-            future.result(timeout=5)
-            self.is_connected = False
-            self.current_channel_id = None
-        except Exception as e:
-            print(f"Error disconnecting from voice channel: {e}")
+        def on_done(future):
+            try:
+                future.result()
+                self.is_connected = False
+                self.current_channel_id = None
+            except Exception as e:
+                print(f"Error disconnecting from voice channel: {e}")
+                return
+            
+            if callback:
+                callback()
+        
+        future.add_done_callback(on_done)
+        return True
     
     def play_sound(self, sound: Sound) -> bool:
         """Play a sound in the voice channel"""
@@ -109,7 +162,7 @@ class DiscordIntegration:
         if not self.bot or not self.is_connected:
             return
         
-        self.bot.stop_sound(os.path.basename(sound_path))
+        self.bot.stop_sound(sound_path)
     
     def stop_all_sounds(self):
         """Stop all sounds"""
@@ -118,18 +171,33 @@ class DiscordIntegration:
         
         self.bot.stop_all_sounds()
     
-    def get_available_channels(self) -> List[Dict[str, Any]]:
-        """Get a list of available voice channels"""
+    def get_available_channels(self, callback: Callable[[List[Dict[str, Any]]], None]):
+        """Get a list of available voice channels
+        
+        Args:
+            callback: Function called with the channel list. It is called
+                      immediately when the list is cached, otherwise from the
+                      bot thread once the list has been built.
+        """
         if not self.bot:
-            return []
+            callback([])
+            return
         
-        future = asyncio.run_coroutine_threadsafe(
-            asyncio.to_thread(self.bot.get_available_channels),
-            self.loop
+        # Use the bot's cached list when it has been built
+        channels = self.bot.cached_channels
+        if channels is not None:
+            callback(channels)
+            return
+        
+        future = self.submit_async(
+            asyncio.to_thread(self.bot.get_available_channels)
         )
         
-        try:
-            return future.result(timeout=5)
-        except Exception as e:
-            print(f"Error getting available channels: {e}")
-            return []
+        def on_done(future):
+            try:
+                callback(future.result())
+            except Exception as e:
+                print(f"Error getting available channels: {e}")
+                callback([])
+        
+        future.add_done_callback(on_done)
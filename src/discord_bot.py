@@ -2,14 +2,18 @@
 Discord bot implementation - Handles Discord API integration
 """
 import os
+import io
 import asyncio
 import logging
+import threading
 from typing import Optional, Dict, List, Callable, Any
 
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 
+from models.sound_cache import SoundCache
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('discord_bot')
@@ -17,7 +21,7 @@ logger = logging.getLogger('discord_bot')
 class SoundboardBot(commands.Bot):
     """Discord bot for soundboard functionality"""
     
-    def __init__(self):
+    def __init__(self, sound_cache: Optional[SoundCache] = None):
         intents = discord.Intents.default()
         intents.message_content = True
         intents.voice_states = True
@@ -31,7 +35,23 @@ class SoundboardBot(commands.Bot):
         
         # Voice client
         self.voice_client: Optional[discord.VoiceClient] = None
-        self.audio_players: Dict[str, discord.AudioSource] = {}
+        self.audio_players: Dict[str, discord.AudioSource] = {}  # absolute path -> source
+        
+        # Decoded audio, shared with the local audio player
+        self.sound_cache = sound_cache or SoundCache()
+        
+        # Cached list of available voice channels (None until first built)
+        self._channels_cache: Optional[List[Dict[str, Any]]] = None
+        self._channels_lock = threading.Lock()
+        
+        # Called (on the bot's event loop) each time the bot becomes ready
+        self._on_ready_cb: Optional[Callable[[], None]] = None
+        
+        # Refresh the channel cache whenever guild or channel state changes
+        for event in ('on_guild_join', 'on_guild_remove', 'on_guild_update',
+                      'on_guild_channel_create', 'on_guild_channel_delete',
+                      'on_guild_channel_update'):
+            self.add_listener(self._on_guild_state_changed, event)
     
     async def cmd_join(self, ctx):
         """Join command handler"""
@@ -65,6 +85,46 @@ class SoundboardBot(commands.Bot):
         """Called when the bot is ready"""
         logger.info(f'Logged in as {self.user} (ID: {self.user.id})')
         logger.info('------')
+        
+        # Guild data is available now, so build the channel cache
+        self._rebuild_channels_cache()
+        
+        if self._on_ready_cb:
+            self._on_ready_cb()
+    
+    def set_ready_callback(self, callback: Optional[Callable[[], None]]):
+        """Set a callback to run whenever the bot becomes ready"""
+        self._on_ready_cb = callback
+    
+    async def _on_guild_state_changed(self, *args):
+        """Rebuild the channel cache after a guild or channel change"""
+        self._rebuild_channels_cache()
+    
+    def _rebuild_channels_cache(self):
+        """Build the list of available voice channels from the current guilds"""
+        channels = [
+            {'id': str(channel.id), 'name': channel.name, 'guild': guild.name}
+            for guild in self.guilds
+            for channel in guild.voice_channels
+        ]
+        
+        with self._channels_lock:
+            self._channels_cache = channels
+        return channels
+    
+    @property
+    def cached_channels(self) -> Optional[List[Dict[str, Any]]]:
+        """The cached voice channel list, or None if it has not been built yet"""
+        with self._channels_lock:
+            return self._channels_cache
+    
+    def get_voice_channel(self, channel_id: str) -> Optional[discord.VoiceChannel]:
+        """Look up a voice channel by ID"""
+        # get_channel is a dictionary lookup in discord.py's connection state
+        channel = self.get_channel(int(channel_id))
+        if isinstance(channel, discord.VoiceChannel):
+            return channel
+        return None
     
     async def join_voice_channel(self, channel):
         """Join a voice channel"""
@@ -91,12 +151,20 @@ class SoundboardBot(commands.Bot):
         
         try:
             # Stop any existing audio on this source if needed
-            source_id = os.path.basename(file_path)
+            source_id = os.path.abspath(file_path)
             if source_id in self.audio_players:
                 self.stop_sound(source_id)
             
-            # Create audio source
-            audio_source = discord.FFmpegPCMAudio(file_path)
+            # Create audio source, replaying from decoded PCM when possible.
+            # This runs on the caller's thread, usually the GUI's, so only
+            # PCM already cached is used; FFmpeg streams anything else.
+            pcm = None
+            if not loop and self.sound_cache.has_pcm(file_path):
+                pcm = self.sound_cache.get_pcm(file_path)
+            if pcm is not None:
+                audio_source = discord.PCMAudio(io.BytesIO(pcm))
+            else:
+                audio_source = discord.FFmpegPCMAudio(file_path)
             audio_source = discord.PCMVolumeTransformer(audio_source, volume=volume)
             
             # Store the audio source
@@ -114,13 +182,19 @@ class SoundboardBot(commands.Bot):
             logger.error(f'Error playing sound: {e}')
             return False
     
-    def stop_sound(self, source_id: str):
+    def stop_sound(self, file_path: str):
         """Stop a specific sound"""
-        if source_id in self.audio_players:
-            if self.voice_client and self.voice_client.is_playing():
-                self.voice_client.stop()
-            del self.audio_players[source_id]
-            logger.info(f'Stopped sound: {source_id}')
+        audio_source = self.audio_players.pop(os.path.abspath(file_path), None)
+        if audio_source is None:
+            return
+        
+        # Only stop the voice client if this sound is what it is playing;
+        # stopping the player also cleans up its source
+        if self.voice_client and self.voice_client.source is audio_source:
+            self.voice_client.stop()
+        else:
+            audio_source.cleanup()
+        logger.info(f'Stopped sound: {file_path}')
     
     def stop_all_sounds(self):
         """Stop all sounds"""
@@ -130,20 +204,25 @@ class SoundboardBot(commands.Bot):
         logger.info('Stopped all sounds')
     
     def get_available_channels(self) -> List[Dict[str, Any]]:
-        """Get a list of available voice channels"""
-        channels = []
-        for guild in self.guilds:
-            for channel in guild.voice_channels:
-                channels.append({
-                    'id': str(channel.id),
-                    'name': channel.name,
-                    'guild': guild.name
-                })
+        """Get a list of available voice channels
+        
+        The same list object is returned until guild or channel state
+        changes, so callers can compare by identity to skip updates.
+        """
+        channels = self.cached_channels
+        if channels is None:
+            channels = self._rebuild_channels_cache()
         return channels
 
 
-async def run_bot():
-    """Run the Discord bot"""
+async def run_bot(on_ready: Optional[Callable[[SoundboardBot], None]] = None,
+                  sound_cache: Optional[SoundCache] = None):
+    """Run the Discord bot
+    
+    Args:
+        on_ready: Optional callback called with the bot once it is ready
+        sound_cache: Optional decoded audio cache to share with the bot
+    """
     # Load environment variables
     load_dotenv()
     
@@ -154,7 +233,9 @@ async def run_bot():
         return None
     
     # Create and start the bot
-    bot = SoundboardBot()
+    bot = SoundboardBot(sound_cache)
+    if on_ready:
+        bot.set_ready_callback(lambda: on_ready(bot))
     try:
         await bot.start(token)
     except Exception as e:
@@ -1,6 +1,7 @@
 """
 Audio fade controller - Handles fade in/out effects for audio
 """
+import functools
 import numpy as np
 from enum import Enum
 from typing import Dict, Any
@@ -14,6 +15,40 @@ class FadeType(Enum):
     SINUSOIDAL = 3
 
 
+@functools.lru_cache(maxsize=64)
+def _build_fade_curve(num_samples: int, fade_type: FadeType, fade_in: bool) -> np.ndarray:
+    """Build a read-only fade curve
+    
+    Curves are cached because the same fade length and type recurs for
+    every sound loaded at the same sample rate.
+    """
+    # Ramp from 0 to 1 in float32 to match the sound buffers, transformed
+    # in place so each curve needs a single allocation
+    curve = np.arange(num_samples, dtype=np.float32)
+    if num_samples > 1:
+        curve *= np.float32(1.0 / (num_samples - 1))
+    
+    if fade_type == FadeType.EXPONENTIAL:
+        np.square(curve, out=curve)
+    elif fade_type == FadeType.LOGARITHMIC:
+        np.sqrt(curve, out=curve)
+    elif fade_type == FadeType.SINUSOIDAL:
+        # (1 - cos(x * pi)) / 2
+        curve *= np.float32(np.pi)
+        np.cos(curve, out=curve)
+        curve *= np.float32(-0.5)
+        curve += np.float32(0.5)
+    # Linear, and any unknown type, keeps the ramp
+    
+    # Reverse for fade out
+    if not fade_in:
+        curve = curve[::-1]
+    
+    # Shared between callers, so it must not be modified
+    curve.setflags(write=False)
+    return curve
+
+
 class AudioFadeController:
     """Class for handling audio fade in/out effects"""
     
@@ -34,12 +69,15 @@ class AudioFadeController:
         """Set the fade type"""
         self.fade_type = fade_type
     
-    def apply_fade_in(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    def apply_fade_in(self, audio: np.ndarray, sample_rate: int,
+                      inplace: bool = False) -> np.ndarray:
         """Apply fade in effect to audio
         
         Args:
             audio: Audio data as numpy array
             sample_rate: Sample rate of the audio
+            inplace: Modify audio directly instead of a copy, for callers
+                that own the buffer
             
         Returns:
             Audio data with fade in applied
@@ -60,23 +98,20 @@ class AudioFadeController:
         fade_curve = self._create_fade_curve(fade_samples, True)
         
         # Apply fade
-        result = audio.copy()
-        
-        # Handle mono or stereo
-        if len(result.shape) == 1:  # Mono
-            result[:fade_samples] *= fade_curve
-        else:  # Stereo or multi-channel
-            for channel in range(result.shape[1]):
-                result[:fade_samples, channel] *= fade_curve
+        result = audio if inplace else audio.copy()
+        self._apply_curve(result, slice(None, fade_samples), fade_curve)
         
         return result
     
-    def apply_fade_out(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    def apply_fade_out(self, audio: np.ndarray, sample_rate: int,
+                       inplace: bool = False) -> np.ndarray:
         """Apply fade out effect to audio
         
         Args:
             audio: Audio data as numpy array
             sample_rate: Sample rate of the audio
+            inplace: Modify audio directly instead of a copy, for callers
+                that own the buffer
             
         Returns:
             Audio data with fade out applied
@@ -97,17 +132,24 @@ class AudioFadeController:
         fade_curve = self._create_fade_curve(fade_samples, False)
         
         # Apply fade
-        result = audio.copy()
-        
-        # Handle mono or stereo
-        if len(result.shape) == 1:  # Mono
-            result[-fade_samples:] *= fade_curve
-        else:  # Stereo or multi-channel
-            for channel in range(result.shape[1]):
-                result[-fade_samples:, channel] *= fade_curve
+        result = audio if inplace else audio.copy()
+        self._apply_curve(result, slice(-fade_samples, None), fade_curve)
         
         return result
     
+    def _apply_curve(self, audio: np.ndarray, region: slice, fade_curve: np.ndarray):
+        """Multiply a region of audio by a fade curve in place
+        
+        Args:
+            audio: Mono (samples,) or multi-channel (samples, channels) audio
+            region: Slice of samples the curve covers
+            fade_curve: Fade curve with one value per sample in region
+        """
+        # Broadcast the curve across all channels in a single ufunc call
+        curve = fade_curve if audio.ndim == 1 else fade_curve[:, None]
+        section = audio[region]
+        np.multiply(section, curve, out=section)
+    
     def _create_fade_curve(self, num_samples: int, fade_in: bool) -> np.ndarray:
         """Create a fade curve
         
@@ -116,23 +158,6 @@ class AudioFadeController:
             fade_in: True for fade in, False for fade out
             
         Returns:
-            Numpy array with fade curve values
+            Read-only numpy array with fade curve values
         """
-        x = np.linspace(0, 1, num_samples)
-        
-        if self.fade_type == FadeType.LINEAR:
-            curve = x
-        elif self.fade_type == FadeType.EXPONENTIAL:
-            curve = x ** 2
-        elif self.fade_type == FadeType.LOGARITHMIC:
-            curve = np.sqrt(x)
-        elif self.fade_type == FadeType.SINUSOIDAL:
-            curve = (1 - np.cos(x * np.pi)) / 2
-        else:
-            curve = x  # Default to linear
-        
-        # Reverse for fade out
-        if not fade_in:
-            curve = curve[::-1]
-        
-        return curve
+        return _build_fade_curve(num_samples, self.fade_type, fade_in)
@@ -2,108 +2,275 @@
 Audio player model - Handles audio playback and mixing
 """
 import os
+import queue
+import sys
 import threading
 import time
-from typing import Dict, List, Optional, Callable
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Callable, Tuple
 import sounddevice as sd
-import soundfile as sf
 import numpy as np
+from numba import njit
 
 from models.sound import Sound, PlaybackMode, ChannelType
 from models.audio_fade_controller import AudioFadeController, FadeType
+from models.sound_cache import SoundCache
+
+
+# Numba cannot locate a cache directory inside a frozen (PyInstaller) build
+_JIT_OPTIONS = dict(nogil=True, cache=not getattr(sys, 'frozen', False),
+                    fastmath=True, boundscheck=False)
+
+
+@njit(**_JIT_OPTIONS)
+def _frames_left(buffer, position, frames):
+    """Number of frames, up to `frames`, left in buffer from position"""
+    return max(min(frames, buffer.shape[0] - position), 0)
+
+
+@njit(**_JIT_OPTIONS)
+def _mix_range(out, buffer, position, gain, start, stop):
+    """Add frames start..stop of buffer, offset by position, into out"""
+    for i in range(start, stop):
+        out[i, 0] += buffer[position + i, 0] * gain
+        out[i, 1] += buffer[position + i, 1] * gain
+
+
+@njit(**_JIT_OPTIONS)
+def _mix_kernel(out, buffer, position, gain, frames):
+    """Add up to `frames` stereo frames of buffer, from position, into out
+    
+    Returns:
+        Number of frames mixed
+    """
+    count = _frames_left(buffer, position, frames)
+    _mix_range(out, buffer, position, gain, 0, count)
+    return count
+
+
+@njit(**_JIT_OPTIONS)
+def _mix2_kernel(out, b0, p0, g0, b1, p1, g1, frames):
+    """Mix two sounds into out in one pass, as _mix_kernel does for one
+    
+    Returns:
+        Number of frames mixed from each sound
+    """
+    n0 = _frames_left(b0, p0, frames)
+    n1 = _frames_left(b1, p1, frames)
+    common = min(n0, n1)
+    for i in range(common):
+        out[i, 0] += b0[p0 + i, 0] * g0 + b1[p1 + i, 0] * g1
+        out[i, 1] += b0[p0 + i, 1] * g0 + b1[p1 + i, 1] * g1
+    _mix_range(out, b0, p0, g0, common, n0)
+    _mix_range(out, b1, p1, g1, common, n1)
+    return n0, n1
+
+
+@njit(**_JIT_OPTIONS)
+def _mix3_kernel(out, b0, p0, g0, b1, p1, g1, b2, p2, g2, frames):
+    """Mix three sounds into out in one pass, as _mix_kernel does for one
+    
+    Returns:
+        Number of frames mixed from each sound
+    """
+    n0 = _frames_left(b0, p0, frames)
+    n1 = _frames_left(b1, p1, frames)
+    n2 = _frames_left(b2, p2, frames)
+    common = min(n0, n1, n2)
+    for i in range(common):
+        out[i, 0] += b0[p0 + i, 0] * g0 + b1[p1 + i, 0] * g1 + b2[p2 + i, 0] * g2
+        out[i, 1] += b0[p0 + i, 1] * g0 + b1[p1 + i, 1] * g1 + b2[p2 + i, 1] * g2
+    _mix_range(out, b0, p0, g0, common, n0)
+    _mix_range(out, b1, p1, g1, common, n1)
+    _mix_range(out, b2, p2, g2, common, n2)
+    return n0, n1, n2
 
 
 class AudioChannel:
-    """Class representing an audio channel for mixing"""
-    def __init__(self, channel_type: ChannelType, volume: float = 1.0):
+    """Class representing an audio channel for mixing
+    
+    Channel gain is supplied by the AudioPlayer when mixing, since channel
+    volumes, master volume and ducking are all owned by the player.
+    
+    Playing sounds live in fixed voice slots held as parallel arrays, so the
+    audio thread mixes from contiguous arrays rather than per-sound dicts.
+    The channel lock is only held to snapshot the active slots and to write
+    their positions back; the mix itself runs without it. Each slot carries
+    a generation number so a slot reused mid-block is not overwritten.
+    
+    Finish callbacks are queued to the player's callback thread rather than
+    run on the audio thread.
+    """
+    
+    MAX_VOICES = 32
+    
+    def __init__(self, channel_type: ChannelType, finished_queue: queue.SimpleQueue):
         self.channel_type = channel_type
-        self.volume = volume
-        self.active_sounds: Dict[str, Dict] = {}  # sound_id -> sound info
-    
-    def add_sound(self, sound_id: str, sound: Sound, buffer: np.ndarray, 
-                  sample_rate: int, callback: Optional[Callable] = None):
-        """Add a sound to the channel"""
-        self.active_sounds[sound_id] = {
-            'sound': sound,
-            'buffer': buffer,
-            'sample_rate': sample_rate,
-            'position': 0,
-            'callback': callback
-        }
+        self.finished_queue = finished_queue  # (sound_id, callback) pairs
+        self.lock = threading.Lock()
+        self.slots: Dict[str, int] = {}  # sound_id -> slot
+        self.sound_ids: List[Optional[str]] = [None] * self.MAX_VOICES
+        self.buffers: List[Optional[np.ndarray]] = [None] * self.MAX_VOICES
+        self.callbacks: List[Optional[Callable]] = [None] * self.MAX_VOICES
+        self.positions = np.zeros(self.MAX_VOICES, dtype=np.int64)
+        self.lengths = np.zeros(self.MAX_VOICES, dtype=np.int64)
+        self.gains = np.zeros(self.MAX_VOICES, dtype=np.float32)
+        self.loops = np.zeros(self.MAX_VOICES, dtype=np.bool_)
+        self.active = np.zeros(self.MAX_VOICES, dtype=np.bool_)
+        self.generations = np.zeros(self.MAX_VOICES, dtype=np.int64)
+    
+    def add_sound(self, sound_id: str, sound: Sound, buffer: np.ndarray,
+                  callback: Optional[Callable] = None) -> bool:
+        """Add a sound to the channel, restarting it if already playing
+        
+        Returns:
+            True if the sound was added, False if every voice is busy
+        """
+        with self.lock:
+            slot = self.slots.get(sound_id)
+            if slot is None:
+                free = np.flatnonzero(~self.active)
+                if len(free) == 0:
+                    print(f"No free voice for sound: {sound_id}")
+                    return False
+                slot = int(free[0])
+                self.slots[sound_id] = slot
+            
+            self.sound_ids[slot] = sound_id
+            self.buffers[slot] = buffer
+            self.callbacks[slot] = callback
+            self.positions[slot] = 0
+            self.lengths[slot] = len(buffer)
+            self.gains[slot] = sound.volume
+            self.loops[slot] = sound.playback_mode == PlaybackMode.LOOP
+            self.generations[slot] += 1
+            self.active[slot] = True
+        return True
     
     def remove_sound(self, sound_id: str):
         """Remove a sound from the channel"""
-        if sound_id in self.active_sounds:
-            del self.active_sounds[sound_id]
+        with self.lock:
+            slot = self.slots.pop(sound_id, None)
+            if slot is not None:
+                self._free_slot(slot)
     
-    def get_mixed_audio(self, frames: int, sample_rate: int) -> np.ndarray:
-        """Get mixed audio for this channel"""
-        if not self.active_sounds:
-            return np.zeros((frames, 2))
+    def clear(self):
+        """Remove every sound from the channel"""
+        with self.lock:
+            for slot in self.slots.values():
+                self._free_slot(slot)
+            self.slots.clear()
+    
+    def _free_slot(self, slot: int):
+        """Release a voice slot, with the channel lock held"""
+        self.active[slot] = False
+        self.sound_ids[slot] = None
+        self.buffers[slot] = None
+        self.callbacks[slot] = None
+    
+    def mix_into(self, out: np.ndarray, frames: int, gain: float) -> bool:
+        """Add this channel's audio into an output buffer
         
-        # Mix all active sounds
-        mixed = np.zeros((frames, 2))
-        sounds_to_remove = []
+        Args:
+            out: Stereo (frames, 2) buffer to accumulate into
+            frames: Number of frames to mix
+            gain: Channel gain applied on top of each sound's volume
         
-        for sound_id, sound_info in self.active_sounds.items():
-            buffer = sound_info['buffer']
-            position = sound_info['position']
-            sound = sound_info['sound']
-            
-            # Calculate how many frames to read
-            frames_left = len(buffer) - position
-            frames_to_read = min(frames, frames_left)
-            
-            if frames_to_read > 0:
-                # Add the audio to the mix
-                chunk = buffer[position:position+frames_to_read]
-                if len(chunk.shape) == 1:  # Mono
-                    chunk = np.column_stack((chunk, chunk))
-                elif chunk.shape[1] == 1:  # Mono as (n, 1)
-                    chunk = np.column_stack((chunk[:, 0], chunk[:, 0]))
-                
-                # Apply volume
-                chunk = chunk * sound.volume * self.volume
-                
-                # Add to mix (only the frames we have)
-                mixed[:frames_to_read] += chunk
-                
-                # Update position
-                sound_info['position'] = position + frames_to_read
-            
-            # Check if we've reached the end
-            if sound_info['position'] >= len(buffer):
-                # Handle looping
-                if sound.playback_mode == PlaybackMode.LOOP:
-                    sound_info['position'] = 0
-                else:
-                    sounds_to_remove.append(sound_id)
-                    if sound_info['callback']:
-                        sound_info['callback'](sound_id)
+        Returns:
+            True if any sound was mixed
+        """
+        # Idle channels skip the lock entirely
+        if not self.slots:
+            return False
         
-        # Remove finished sounds
-        for sound_id in sounds_to_remove:
-            self.remove_sound(sound_id)
+        # Snapshot the active voices so the GUI thread can add or remove
+        # sounds while we mix
+        with self.lock:
+            slots = np.flatnonzero(self.active)
+            if len(slots) == 0:
+                return False
+            buffers = [self.buffers[slot] for slot in slots]
+            positions = self.positions[slots]
+            lengths = self.lengths[slots]
+            gains = self.gains[slots] * gain
+            loops = self.loops[slots]
+            generations = self.generations[slots]
         
-        return mixed
+        # Buffers are always stereo (frames, 2), so the kernels need no
+        # shape checks. Up to three sounds, the common case, are mixed in a
+        # single pass over the output.
+        p, g = positions, gains
+        if len(buffers) == 1:
+            p[0] += _mix_kernel(out, buffers[0], p[0], g[0], frames)
+        elif len(buffers) == 2:
+            p += _mix2_kernel(out, buffers[0], p[0], g[0], buffers[1], p[1], g[1], frames)
+        elif len(buffers) == 3:
+            p += _mix3_kernel(out, buffers[0], p[0], g[0], buffers[1], p[1], g[1],
+                              buffers[2], p[2], g[2], frames)
+        else:
+            for i, buffer in enumerate(buffers):
+                p[i] += _mix_kernel(out, buffer, p[i], g[i], frames)
+        
+        # Loop back to the start or finish sounds that reached their end
+        ended = positions >= lengths
+        positions[ended & loops] = 0
+        finished = ended & ~loops
+        
+        with self.lock:
+            # Skip slots that were stopped or restarted while mixing
+            current = self.active[slots] & (self.generations[slots] == generations)
+            self.positions[slots[current]] = positions[current]
+            for slot in slots[current & finished]:
+                sound_id = self.sound_ids[slot]
+                if self.callbacks[slot]:
+                    self.finished_queue.put((sound_id, self.callbacks[slot]))
+                del self.slots[sound_id]
+                self._free_slot(slot)
+        
+        return True
 
 
 class AudioPlayer:
     """Class for handling audio playback and mixing"""
-    def __init__(self, master_volume: float = 0.8):
+    
+    BLOCKSIZE = 512  # Frames per audio callback
+    MAX_BUFFER_BYTES = 256 * 1024 * 1024  # Upper bound on faded float32 buffers kept
+    
+    def __init__(self, master_volume: float = 0.8, sound_cache: Optional[SoundCache] = None):
         self.master_volume = master_volume
+        self.sound_cache = sound_cache or SoundCache()
+        
+        # Finish callbacks run on their own thread so they cannot stall the
+        # audio thread
+        self._finished_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._callback_thread = threading.Thread(target=self._run_finished_callbacks, daemon=True)
+        self._callback_thread.start()
+        
         self.channels: Dict[ChannelType, AudioChannel] = {
-            ChannelType.AMBIENT: AudioChannel(ChannelType.AMBIENT, 0.5),
-            ChannelType.EFFECTS_1: AudioChannel(ChannelType.EFFECTS_1, 0.7),
-            ChannelType.EFFECTS_2: AudioChannel(ChannelType.EFFECTS_2, 0.7),
-            ChannelType.EFFECTS_3: AudioChannel(ChannelType.EFFECTS_3, 0.7)
+            channel_type: AudioChannel(channel_type, self._finished_queue)
+            for channel_type in ChannelType
         }
-        self.sample_rate = 44100
+        
+        # Channel volumes, indexed by ChannelType.value
+        self._channel_gains = np.array([0.5, 0.7, 0.7, 0.7], dtype=np.float32)
+        self._block_gains = np.empty_like(self._channel_gains)  # Scratch for the callback
+        self.sample_rate = SoundCache.SAMPLE_RATE  # Sounds are decoded to this rate
         self.stream = None
         self.is_playing = False
-        self.sound_buffers: Dict[str, np.ndarray] = {}
-        self.sound_sample_rates: Dict[str, int] = {}
+        # Faded buffers keyed by _buffer_key, least recently used first
+        self.sound_buffers: OrderedDict[Tuple, np.ndarray] = OrderedDict()
+        self._buffer_bytes = 0
+        self._buffer_lock = threading.Lock()  # Buffers are loaded on the GUI and load threads
+        self._fade_lock = threading.Lock()  # The fade controller is configured per sound
         self.lock = threading.Lock()
+        
+        # Sounds not yet decoded load here so a cold play never blocks the GUI.
+        # Stops bump these generations so a load finishing later does not
+        # start a sound the user already stopped.
+        self._load_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='sound-load')
+        self._stop_generation = 0
+        self._path_generations: Dict[str, int] = {}
         self.voice_ducking_enabled = True
         self.voice_ducking_amount = 0.5
         self.fade_controller = AudioFadeController()
@@ -113,44 +280,61 @@ class AudioPlayer:
         if self.stream is not None:
             return
         
+        # Compile the mixing kernels now rather than in the first audio
+        # block, with the argument types mix_into passes
+        out = np.zeros((1, 2), dtype=np.float32)
+        voice = (np.zeros((1, 2), dtype=np.float32), np.int64(0), np.float32(1.0))
+        _mix_kernel(out, *voice, 1)
+        _mix2_kernel(out, *voice, *voice, 1)
+        _mix3_kernel(out, *voice, *voice, *voice, 1)
+        
         def callback(outdata, frames, time, status):
             if status:
                 print(f"Audio status: {status}")
             
-            with self.lock:
-                # Get audio from each channel
-                ambient = self.channels[ChannelType.AMBIENT].get_mixed_audio(frames, self.sample_rate)
-                effects1 = self.channels[ChannelType.EFFECTS_1].get_mixed_audio(frames, self.sample_rate)
-                effects2 = self.channels[ChannelType.EFFECTS_2].get_mixed_audio(frames, self.sample_rate)
-                effects3 = self.channels[ChannelType.EFFECTS_3].get_mixed_audio(frames, self.sample_rate)
-                
-                # Apply voice ducking if enabled
-                if self.voice_ducking_enabled and (
-                    np.any(effects1) or np.any(effects2) or np.any(effects3)
-                ):
-                    ducking_factor = 1.0 - self.voice_ducking_amount
-                    ambient = ambient * ducking_factor
-                
-                # Mix all channels
-                mixed = ambient + effects1 + effects2 + effects3
-                
-                # Apply master volume
-                mixed = mixed * self.master_volume
-                
-                # Clip to prevent distortion
-                mixed = np.clip(mixed, -1.0, 1.0)
-                
-                # Output the audio
-                outdata[:] = mixed
+            # Mixing runs without the player lock, in a kernel that releases
+            # the GIL, so the GUI thread is never held up by the audio thread.
+            # Combine channel and master volume into one gain per channel.
+            gains = np.multiply(self._channel_gains, self.master_volume, out=self._block_gains)
+            
+            # Mix every channel straight into the output buffer, effects
+            # first so we know whether to duck the ambient channel
+            outdata.fill(0)
+            effects_playing = False
+            for channel_type in (ChannelType.EFFECTS_1, ChannelType.EFFECTS_2, ChannelType.EFFECTS_3):
+                if self.channels[channel_type].mix_into(outdata, frames, gains[channel_type.value]):
+                    effects_playing = True
+            
+            # Apply voice ducking if enabled
+            ambient_gain = gains[ChannelType.AMBIENT.value]
+            if self.voice_ducking_enabled and effects_playing:
+                ambient_gain *= 1.0 - self.voice_ducking_amount
+            ambient_playing = self.channels[ChannelType.AMBIENT].mix_into(outdata, frames, ambient_gain)
+            
+            # Clip to prevent distortion; silence needs no clipping
+            if effects_playing or ambient_playing:
+                np.clip(outdata, -1.0, 1.0, out=outdata)
         
         self.stream = sd.OutputStream(
             samplerate=self.sample_rate,
             channels=2,
+            dtype='float32',
+            blocksize=self.BLOCKSIZE,
+            latency='low',
             callback=callback
         )
         self.stream.start()
         self.is_playing = True
     
+    def _run_finished_callbacks(self):
+        """Thread function calling finish callbacks queued by the mixer"""
+        while True:
+            sound_id, callback = self._finished_queue.get()
+            try:
+                callback(sound_id)
+            except Exception as e:
+                print(f"Error in sound finished callback: {e}")
+    
     def stop(self):
         """Stop the audio playback"""
         if self.stream is not None:
@@ -159,78 +343,165 @@ class AudioPlayer:
             self.stream = None
             self.is_playing = False
     
+    @staticmethod
+    def _buffer_key(sound: Sound) -> Tuple:
+        """Key for a sound's faded buffer
+        
+        Fades are baked into the buffer, so sounds sharing a file but not
+        fade settings need separate buffers. The file's modification time
+        is part of the key so a file replaced on disk is loaded again.
+        """
+        try:
+            mtime = os.stat(sound.file_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        fade_in = sound.fade_in if sound.fade_in_enabled else 0
+        fade_out = sound.fade_out if sound.fade_out_enabled else 0
+        return (sound.file_path, mtime, fade_in, fade_out)
+    
     def load_sound(self, sound: Sound) -> bool:
         """Load a sound file into memory"""
+        return self._load_buffer(sound) is not None
+    
+    def _load_buffer(self, sound: Sound) -> Optional[np.ndarray]:
+        """Get a sound's faded buffer, decoding and storing it if needed"""
+        key = self._buffer_key(sound)
+        with self._buffer_lock:
+            data = self.sound_buffers.get(key)
+            if data is not None:
+                self.sound_buffers.move_to_end(key)
+                return data
+        
         try:
             if not os.path.exists(sound.file_path):
                 print(f"Sound file not found: {sound.file_path}")
-                return False
+                return None
             
-            data, sample_rate = sf.read(sound.file_path)
+            # Decode through the cache shared with the Discord bot
+            pcm = self.sound_cache.get_pcm(sound.file_path)
+            if pcm is None:
+                return None
             
-            # Apply fade in/out if enabled
-            if sound.fade_in_enabled and sound.fade_in_duration > 0:
-                self.fade_controller.set_fade_in_duration(sound.fade_in_duration)
-                self.fade_controller.set_fade_type(FadeType.LINEAR)
-                data = self.fade_controller.apply_fade_in(data, sample_rate)
+            # Convert once to contiguous float32 stereo (frames, 2) so the
+            # mixer never touches float64 or reshapes in the audio callback
+            data = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+            data *= np.float32(1.0 / 32768.0)
+            data = data.reshape(-1, SoundCache.CHANNELS)
+            sample_rate = SoundCache.SAMPLE_RATE
             
-            if sound.fade_out_enabled and sound.fade_out_duration > 0:
-                self.fade_controller.set_fade_out_duration(sound.fade_out_duration)
-                self.fade_controller.set_fade_type(FadeType.LINEAR)
-                data = self.fade_controller.apply_fade_out(data, sample_rate)
-            
-            # Store the buffer and sample rate
-            self.sound_buffers[sound.file_path] = data
-            self.sound_sample_rates[sound.file_path] = sample_rate
+            # Apply fade in/out if enabled. The buffer was just converted, so
+            # nothing else references it and it can be faded in place.
+            # Sound fade durations are in milliseconds.
+            with self._fade_lock:
+                if sound.fade_in_enabled and sound.fade_in > 0:
+                    self.fade_controller.set_fade_in_duration(sound.fade_in / 1000.0)
+                    self.fade_controller.set_fade_type(FadeType.LINEAR)
+                    data = self.fade_controller.apply_fade_in(data, sample_rate, inplace=True)
+                
+                if sound.fade_out_enabled and sound.fade_out > 0:
+                    self.fade_controller.set_fade_out_duration(sound.fade_out / 1000.0)
+                    self.fade_controller.set_fade_type(FadeType.LINEAR)
+                    data = self.fade_controller.apply_fade_out(data, sample_rate, inplace=True)
             
-            return True
+            self._store_buffer(key, data)
+            return data
         except Exception as e:
             print(f"Error loading sound: {e}")
-            return False
+            return None
+    
+    def _store_buffer(self, key: Tuple, data: np.ndarray):
+        """Store a buffer, evicting the least recently used past the limit
+        
+        Playing voices hold their own reference, so evicting a buffer never
+        cuts a sound off; it is only decoded again on its next play.
+        """
+        with self._buffer_lock:
+            previous = self.sound_buffers.pop(key, None)
+            if previous is not None:
+                self._buffer_bytes -= previous.nbytes
+            self.sound_buffers[key] = data
+            self._buffer_bytes += data.nbytes
+            
+            # Never evict the buffer just stored
+            while self._buffer_bytes > self.MAX_BUFFER_BYTES and len(self.sound_buffers) > 1:
+                _, evicted = self.sound_buffers.popitem(last=False)
+                self._buffer_bytes -= evicted.nbytes
     
     def play_sound(self, sound: Sound, callback: Optional[Callable] = None) -> bool:
-        """Play a sound"""
+        """Play a sound
+        
+        A sound whose audio is not decoded yet is loaded in the background
+        and starts once ready, so this returns True without waiting for it.
+        """
         try:
             # Make sure the audio engine is running
             if not self.is_playing:
                 self.start()
             
-            # Load the sound if not already loaded
-            if sound.file_path not in self.sound_buffers:
-                if not self.load_sound(sound):
-                    return False
+            key = self._buffer_key(sound)
+            with self._buffer_lock:
+                loaded = key in self.sound_buffers
             
-            # Get the buffer and sample rate
-            buffer = self.sound_buffers[sound.file_path]
-            sample_rate = self.sound_sample_rates[sound.file_path]
-            
-            # Add the sound to the appropriate channel
-            with self.lock:
-                self.channels[sound.channel].add_sound(
-                    sound.file_path, sound, buffer, sample_rate, callback
+            # Converting cached PCM is quick; a decode is not
+            if loaded or self.sound_cache.has_pcm(sound.file_path):
+                data = self._load_buffer(sound)
+                if data is None:
+                    return False
+                return self.channels[sound.channel].add_sound(
+                    sound.file_path, sound, data, callback
                 )
             
+            with self.lock:
+                generation = (self._stop_generation, self._path_generations.get(sound.file_path, 0))
+            future = self._load_pool.submit(self._load_buffer, sound)
+            future.add_done_callback(
+                lambda f: self._on_buffer_loaded(f, sound, callback, generation)
+            )
             return True
         except Exception as e:
             print(f"Error playing sound: {e}")
             return False
     
+    def _on_buffer_loaded(self, future, sound: Sound, callback: Optional[Callable],
+                          generation: Tuple[int, int]):
+        """Start a sound loaded in the background unless it was stopped meanwhile"""
+        if future.cancelled():
+            return
+        data = future.result()
+        if data is None:
+            return
+        
+        with self.lock:
+            current = (self._stop_generation, self._path_generations.get(sound.file_path, 0))
+        if current != generation:
+            return
+        
+        self.channels[sound.channel].add_sound(sound.file_path, sound, data, callback)
+    
     def stop_sound(self, sound_path: str):
         """Stop a specific sound"""
         with self.lock:
-            for channel in self.channels.values():
-                channel.remove_sound(sound_path)
+            self._path_generations[sound_path] = self._path_generations.get(sound_path, 0) + 1
+        for channel in self.channels.values():
+            channel.remove_sound(sound_path)
     
     def stop_all_sounds(self):
         """Stop all sounds"""
         with self.lock:
-            for channel in self.channels.values():
-                channel.active_sounds.clear()
+            self._stop_generation += 1
+        for channel in self.channels.values():
+            channel.clear()
     
     def set_channel_volume(self, channel_type: ChannelType, volume: float):
         """Set the volume for a channel"""
         with self.lock:
-            self.channels[channel_type].volume = max(0.0, min(1.0, volume))
+            self._channel_gains[channel_type.value] = max(0.0, min(1.0, volume))
+    
+    def set_channel_volumes(self, volumes: Dict[ChannelType, float]):
+        """Set the volume for several channels at once"""
+        with self.lock:
+            for channel_type, volume in volumes.items():
+                self._channel_gains[channel_type.value] = max(0.0, min(1.0, volume))
     
     def set_master_volume(self, volume: float):
         """Set the master volume"""
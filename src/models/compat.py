@@ -0,0 +1,8 @@
+"""
+Compatibility - Options that depend on the running Python version
+"""
+import sys
+
+
+# Slotted dataclasses need Python 3.10; older versions keep a __dict__
+DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
@@ -120,12 +120,8 @@ class DiscordBot:
     
     def get_available_channels(self) -> List[Dict[str, Any]]:
         """Get a list of available voice channels"""
-        channels = []
-        for guild in self.bot.guilds:
-            for channel in guild.voice_channels:
-                channels.append({
-                    'id': str(channel.id),
-                    'name': channel.name,
-                    'guild': guild.name
-                })
-        return channels
+        return [
+            {'id': str(channel.id), 'name': channel.name, 'guild': guild.name}
+            for guild in self.bot.guilds
+            for channel in guild.voice_channels
+        ]
@@ -0,0 +1,29 @@
+"""
+Filenames - Turning profile, macro and theme names into safe filenames
+"""
+import re
+from typing import Optional
+
+
+# Characters not allowed in filenames on Windows, the most restrictive platform
+_INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
+
+
+def sanitize_filename(filename: str, max_length: Optional[int] = None) -> str:
+    """
+    Sanitize a filename to be safe for the filesystem
+    
+    Args:
+        filename: The filename to sanitize
+        max_length: Length to truncate the result to, if any
+        
+    Returns:
+        Sanitized filename
+    """
+    # Replace invalid characters with underscores in a single pass
+    filename = _INVALID_FILENAME_CHARS.sub('_', filename)
+    
+    if max_length is not None:
+        filename = filename[:max_length]
+    
+    return filename
@@ -3,8 +3,9 @@ Hotkey manager - Manages global hotkeys for the application
 """
 import keyboard
 import threading
+from types import MappingProxyType
 from PyQt6.QtCore import QObject, pyqtSignal
-from typing import Dict, Callable, Any
+from typing import Dict, Callable, Any, Mapping, Tuple
 
 
 class HotkeyManager(QObject):
@@ -16,6 +17,7 @@ class HotkeyManager(QObject):
     def __init__(self):
         super().__init__()
         self.hotkeys: Dict[str, Dict[str, Any]] = {}
+        self._snapshot: Tuple[Mapping[str, str], ...] = ()  # Rebuilt when hotkeys change
         self.is_running = False
         self.lock = threading.Lock()
     
@@ -24,11 +26,8 @@ class HotkeyManager(QObject):
         if self.is_running:
             return
         
+        # The keyboard module delivers hotkeys from its own listener thread
         self.is_running = True
-        
-        # Start a thread to handle hotkeys
-        self.thread = threading.Thread(target=self._hotkey_thread, daemon=True)
-        self.thread.start()
     
     def stop(self):
         """Stop the hotkey manager"""
@@ -36,13 +35,13 @@ class HotkeyManager(QObject):
         
         # Unregister all hotkeys
         with self.lock:
-            for hotkey in self.hotkeys:
-                try:
-                    keyboard.unhook_key(hotkey)
-                except:
-                    pass
+            try:
+                keyboard.remove_all_hotkeys()
+            except Exception as e:
+                print(f"Error removing hotkeys: {e}")
             
             self.hotkeys.clear()
+            self._update_snapshot()
     
     def register_hotkey(self, key_combination: str, name: str, callback: Callable = None):
         """Register a hotkey
@@ -69,6 +68,7 @@ class HotkeyManager(QObject):
                     'name': name,
                     'callback': callback
                 }
+                self._update_snapshot()
                 
                 return True
         except Exception as e:
@@ -95,6 +95,7 @@ class HotkeyManager(QObject):
                 
                 # Remove the hotkey info
                 del self.hotkeys[key_combination]
+                self._update_snapshot()
                 
                 return True
         except Exception as e:
@@ -102,19 +103,23 @@ class HotkeyManager(QObject):
             return False
     
     def get_registered_hotkeys(self):
-        """Get a list of registered hotkeys
+        """Get the registered hotkeys
         
         Returns:
-            list: List of dictionaries with hotkey information
+            tuple: Read-only mappings with hotkey information
         """
-        with self.lock:
-            return [
-                {
-                    'key_combination': key,
-                    'name': info['name']
-                }
-                for key, info in self.hotkeys.items()
-            ]
+        # Replaced wholesale on change, so it can be read without the lock
+        return self._snapshot
+    
+    def _update_snapshot(self):
+        """Rebuild the registered hotkey snapshot, with the lock held"""
+        self._snapshot = tuple(
+            MappingProxyType({
+                'key_combination': key,
+                'name': info['name']
+            })
+            for key, info in self.hotkeys.items()
+        )
     
     def _on_hotkey_triggered(self, key_combination: str):
         """Handle hotkey trigger
@@ -122,20 +127,17 @@ class HotkeyManager(QObject):
         Args:
             key_combination: Key combination that was triggered
         """
+        # Get the hotkey info
         with self.lock:
-            if key_combination in self.hotkeys:
-                # Get the hotkey info
-                info = self.hotkeys[key_combination]
-                
-                # Call the callback if provided
-                if info['callback']:
-                    info['callback']()
-                
-                # Emit the signal
-                self.hotkey_triggered.emit(info['name'])
-    
-    def _hotkey_thread(self):
-        """Thread function for handling hotkeys"""
-        while self.is_running:
-            # Let keyboard module handle events
-            keyboard.wait()
+            info = self.hotkeys.get(key_combination)
+        
+        if info is None:
+            return
+        
+        # Call the callback outside the lock, so it may register or
+        # unregister hotkeys and does not hold up other hotkeys
+        if info['callback']:
+            info['callback']()
+        
+        # Emit the signal
+        self.hotkey_triggered.emit(info['name'])
@@ -0,0 +1,56 @@
+"""
+JSON file cache - Parsed JSON shared by the profile, settings and macro loaders
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Tuple
+
+import orjson
+
+
+MAX_ENTRIES = 128
+
+# abspath -> ((st_mtime_ns, st_size), data), least recently used first
+_cache: 'OrderedDict[str, Tuple[Tuple[int, int], Any]]' = OrderedDict()
+_lock = threading.Lock()
+
+
+def load_json(file_path: str) -> Any:
+    """Load a JSON file, reusing the parsed data while the file is unchanged
+    
+    The returned data is shared between callers and must be treated as
+    read-only; the from_dict constructors copy what they keep.
+    
+    Args:
+        file_path: Path to the JSON file
+    
+    Returns:
+        Parsed JSON data
+    """
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and entry[0] == key:
+            _cache.move_to_end(path)
+            return entry[1]
+    
+    with open(path, 'rb') as f:
+        data = orjson.loads(f.read())
+    
+    with _lock:
+        _cache[path] = (key, data)
+        _cache.move_to_end(path)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    
+    return data
+
+
+def invalidate(file_path: str):
+    """Drop a file's cached data after it is written or deleted"""
+    with _lock:
+        _cache.pop(os.path.abspath(file_path), None)
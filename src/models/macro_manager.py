@@ -1,18 +1,26 @@
 """
 Macro system - Manages sound macros for the application
 """
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer
-from typing import List, Dict, Any
-import json
+from PyQt6.QtCore import QObject, pyqtSignal, QTimer, QElapsedTimer
+from typing import List, Dict, Any, Optional, Tuple
+import concurrent.futures
+import functools
+import orjson
 import os
 import uuid
 
+from models import json_file_cache
+from models.filenames import sanitize_filename
+
+# Longest macro filename stem written, in characters
+MAX_FILENAME_LENGTH = 255
+
 
 class MacroStep:
     """Class representing a step in a macro"""
     
     def __init__(self, sound_id: str = None, delay: float = 0.0):
-        self.id = str(uuid.uuid4())
+        self.id = uuid.uuid4().hex
         self.sound_id = sound_id
         self.delay = delay  # Delay in seconds before playing this sound
     
@@ -27,8 +35,9 @@ class MacroStep:
     @classmethod
     def from_dict(cls, data):
         """Create from dictionary"""
-        step = cls()
-        step.id = data.get('id', str(uuid.uuid4()))
+        # Skip __init__ so a fresh id is only generated when none was saved
+        step = cls.__new__(cls)
+        step.id = data.get('id') or uuid.uuid4().hex
         step.sound_id = data.get('sound_id')
         step.delay = data.get('delay', 0.0)
         return step
@@ -38,36 +47,58 @@ class Macro:
     """Class representing a sound macro"""
     
     def __init__(self, name: str = "New Macro"):
-        self.id = str(uuid.uuid4())
+        self.id = uuid.uuid4().hex
         self.name = name
         self.steps: List[MacroStep] = []
+        self._index: Dict[str, int] = {}  # step id -> position in steps
         self.hotkey = None  # Optional hotkey assignment
     
     def add_step(self, sound_id: str, delay: float = 0.0):
         """Add a step to the macro"""
         step = MacroStep(sound_id, delay)
+        self._index[step.id] = len(self.steps)
         self.steps.append(step)
         return step
     
     def remove_step(self, step_id: str):
         """Remove a step from the macro"""
-        self.steps = [step for step in self.steps if step.id != step_id]
+        i = self._index.pop(step_id, None)
+        if i is None:
+            return
+        
+        del self.steps[i]
+        
+        # Only the steps after the removed one shift
+        for j in range(i, len(self.steps)):
+            self._index[self.steps[j].id] = j
     
     def move_step_up(self, step_id: str):
         """Move a step up in the sequence"""
-        for i, step in enumerate(self.steps):
-            if step.id == step_id and i > 0:
-                self.steps[i], self.steps[i-1] = self.steps[i-1], self.steps[i]
-                return True
-        return False
+        i = self._index.get(step_id)
+        if i is None or i == 0:
+            return False
+        
+        self._swap_steps(i, i - 1)
+        return True
     
     def move_step_down(self, step_id: str):
         """Move a step down in the sequence"""
-        for i, step in enumerate(self.steps):
-            if step.id == step_id and i < len(self.steps) - 1:
-                self.steps[i], self.steps[i+1] = self.steps[i+1], self.steps[i]
-                return True
-        return False
+        i = self._index.get(step_id)
+        if i is None or i == len(self.steps) - 1:
+            return False
+        
+        self._swap_steps(i, i + 1)
+        return True
+    
+    def _swap_steps(self, i: int, j: int):
+        """Swap two steps and their index entries"""
+        self.steps[i], self.steps[j] = self.steps[j], self.steps[i]
+        self._index[self.steps[i].id] = i
+        self._index[self.steps[j].id] = j
+    
+    def _rebuild_index(self):
+        """Rebuild the step index after steps was replaced"""
+        self._index = {step.id: i for i, step in enumerate(self.steps)}
     
     def to_dict(self):
         """Convert to dictionary for serialization"""
@@ -81,10 +112,12 @@ class Macro:
     @classmethod
     def from_dict(cls, data):
         """Create from dictionary"""
-        macro = cls()
-        macro.id = data.get('id', str(uuid.uuid4()))
+        # Skip __init__ so a fresh id is only generated when none was saved
+        macro = cls.__new__(cls)
+        macro.id = data.get('id') or uuid.uuid4().hex
         macro.name = data.get('name', "Unnamed Macro")
         macro.steps = [MacroStep.from_dict(step_data) for step_data in data.get('steps', [])]
+        macro._rebuild_index()
         macro.hotkey = data.get('hotkey')
         return macro
 
@@ -96,11 +129,22 @@ class MacroManager(QObject):
     macro_started = pyqtSignal(str)  # Macro ID
     macro_step_played = pyqtSignal(str, str)  # Macro ID, Step ID
     macro_finished = pyqtSignal(str)  # Macro ID
+    macros_saved = pyqtSignal()  # A save_macros_async write completed
+    
+    # Steps closer together than this are played in the same timer tick
+    STEP_COALESCE_MS = 2
     
     def __init__(self, base_directory: str):
         super().__init__()
         self.macros: Dict[str, Macro] = {}
+        self._loaded_files: Dict[str, Tuple[int, str]] = {}  # path -> (st_mtime_ns, macro id)
         self.active_macros: Dict[str, Dict[str, Any]] = {}
+        self._pending_signals: List[Tuple[str, Optional[str]]] = []  # Emitted by _flush_signals
+        
+        # Runs save_macros_async writes one at a time, in submission order
+        self._save_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='macro-save'
+        )
         self.base_directory = base_directory
         self.macros_directory = os.path.join(base_directory, 'resources', 'macros')
         
@@ -111,37 +155,142 @@ class MacroManager(QObject):
         self.load_macros()
     
     def load_macros(self):
-        """Load macros from files"""
-        self.macros.clear()
+        """Load macros from files
         
+        Macros whose file is unchanged since the last load are kept as they
+        are; only new or modified files are parsed, and macros whose file
+        disappeared are dropped.
+        """
         # Check if directory exists
         if not os.path.exists(self.macros_directory):
+            self.macros.clear()
+            self._loaded_files.clear()
             return
         
-        # Load each macro file
-        for filename in os.listdir(self.macros_directory):
-            if filename.endswith('.macro'):
-                try:
-                    with open(os.path.join(self.macros_directory, filename), 'r') as f:
-                        data = json.load(f)
-                        macro = Macro.from_dict(data)
-                        self.macros[macro.id] = macro
-                except Exception as e:
-                    print(f"Error loading macro {filename}: {e}")
+        # Find the macro files; scandir entries carry their own path and type
+        with os.scandir(self.macros_directory) as entries:
+            macro_files = {entry.path: entry.stat().st_mtime_ns for entry in entries
+                           if entry.name.endswith('.macro') and entry.is_file()}
+        
+        # Keep macros whose file hasn't changed
+        macros = {}
+        loaded_files = {}
+        paths = []
+        for path, mtime in macro_files.items():
+            loaded = self._loaded_files.get(path)
+            if loaded is not None and loaded[0] == mtime and loaded[1] in self.macros:
+                macros[loaded[1]] = self.macros[loaded[1]]
+                loaded_files[path] = loaded
+            else:
+                paths.append(path)
+        
+        # Load the rest, overlapping file reads on larger batches
+        if len(paths) < 4:
+            loaded_macros = [self._load_macro_file(path) for path in paths]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+                loaded_macros = list(pool.map(self._load_macro_file, paths))
+        
+        for path, macro in zip(paths, loaded_macros):
+            if macro is not None:
+                macros[macro.id] = macro
+                loaded_files[path] = (macro_files[path], macro.id)
+        
+        self.macros.clear()
+        self.macros.update(macros)
+        self._loaded_files = loaded_files
+    
+    def _load_macro_file(self, file_path: str):
+        """Load a single macro file, returning None if it can't be read"""
+        try:
+            return Macro.from_dict(json_file_cache.load_json(file_path))
+        except Exception as e:
+            print(f"Error loading macro {os.path.basename(file_path)}: {e}")
+            return None
     
     def save_macros(self):
-        """Save all macros to files"""
-        # Create directory if it doesn't exist
-        os.makedirs(self.macros_directory, exist_ok=True)
+        """Save all macros to files
+        
+        Every macro is written to a temporary file first and the files are
+        then swapped in together, so a failure part way through never leaves
+        a truncated macro file behind.
+        """
+        self._write_macro_files(self._encode_macros())
+    
+    def save_macros_async(self) -> concurrent.futures.Future:
+        """Save all macros to files without blocking the calling thread
+        
+        The macros are encoded right away, so later edits don't leak into
+        this save; the files are written on a background thread and
+        macros_saved is emitted once they are in place.
         
-        # Save each macro
-        for macro_id, macro in self.macros.items():
+        Returns:
+            Future completing when the files are written
+        """
+        future = self._save_pool.submit(self._write_macro_files, self._encode_macros())
+        future.add_done_callback(lambda _: self.macros_saved.emit())
+        return future
+    
+    def _encode_macros(self) -> List[Tuple[str, str, bytes]]:
+        """Encode every macro as (macro name, file path, JSON bytes)"""
+        encoded = []
+        for macro in self.macros.values():
             try:
-                filename = f"{self._sanitize_filename(macro.name)}.macro"
-                with open(os.path.join(self.macros_directory, filename), 'w') as f:
-                    json.dump(macro.to_dict(), f, indent=2)
+                file_path = os.path.join(self.macros_directory, f"{sanitize_filename(macro.name, MAX_FILENAME_LENGTH)}.macro")
+                encoded.append((macro.name, file_path, orjson.dumps(macro.to_dict(), option=orjson.OPT_INDENT_2)))
             except Exception as e:
                 print(f"Error saving macro {macro.name}: {e}")
+        return encoded
+    
+    def _write_macro_files(self, encoded: List[Tuple[str, str, bytes]]):
+        """Write encoded macros through temporary files and swap them in"""
+        pending = []  # (macro name, temporary path, final path)
+        
+        # Write each macro to its temporary file
+        for name, file_path, data in encoded:
+            try:
+                temp_path = f"{file_path}.tmp"
+                try:
+                    f = open(temp_path, 'wb')
+                except FileNotFoundError:
+                    # The directory is created on startup; only recreate it
+                    # when it has gone missing since
+                    os.makedirs(self.macros_directory, exist_ok=True)
+                    f = open(temp_path, 'wb')
+                with f:
+                    f.write(data)
+                pending.append((name, temp_path, file_path))
+            except Exception as e:
+                print(f"Error saving macro {name}: {e}")
+        
+        # Swap them all in
+        for name, temp_path, file_path in pending:
+            try:
+                os.replace(temp_path, file_path)
+                json_file_cache.invalidate(file_path)
+            except Exception as e:
+                print(f"Error saving macro {name}: {e}")
+        
+        # Persist the renames with a single directory sync
+        if pending:
+            self._sync_macros_directory()
+    
+    def _sync_macros_directory(self):
+        """Flush the macros directory entry changes to disk, where supported"""
+        # Windows can't open a directory to sync it
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        
+        try:
+            fd = os.open(self.macros_directory, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass  # Some filesystems don't support syncing directories
+        finally:
+            os.close(fd)
     
     def create_macro(self, name: str = "New Macro"):
         """Create a new macro"""
@@ -157,7 +306,7 @@ class MacroManager(QObject):
             
             # Delete the file
             try:
-                filename = f"{self._sanitize_filename(macro.name)}.macro"
+                filename = f"{sanitize_filename(macro.name, MAX_FILENAME_LENGTH)}.macro"
                 file_path = os.path.join(self.macros_directory, filename)
                 if os.path.exists(file_path):
                     os.remove(file_path)
@@ -195,29 +344,37 @@ class MacroManager(QObject):
         if not macro.steps:
             return False
         
-        # Create a timer for each step
-        timers = []
-        total_delay = 0
+        # Restarting a playing macro starts it over
+        if macro_id in self.active_macros:
+            self._discard_timer(self.active_macros.pop(macro_id))
         
+        # Snapshot the steps so editing the macro doesn't affect this run.
+        # Each step's delay is relative to the step before it, so sum them into
+        # offsets from the start of the run.
+        steps = []
+        total_delay = 0
         for step in macro.steps:
             total_delay += step.delay
-            timer = QTimer(self)
-            timer.setSingleShot(True)
-            timer.timeout.connect(
-                lambda s=step: self._play_step(macro_id, s.id, s.sound_id, play_callback)
-            )
-            timer.setInterval(int(total_delay * 1000))  # Convert to milliseconds
-            timers.append(timer)
+            steps.append((int(total_delay * 1000), step.id, step.sound_id))
+        
+        # One timer walks the steps. It is re-armed against the start of the
+        # run, so lateness of one tick does not push back later steps.
+        elapsed = QElapsedTimer()
+        elapsed.start()
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(functools.partial(self._play_step, macro_id))
         
         # Store active macro info
         self.active_macros[macro_id] = {
-            'timers': timers,
-            'current_step': -1
+            'timer': timer,
+            'elapsed': elapsed,
+            'steps': steps,
+            'current_step': 0,
+            'play_callback': play_callback
         }
         
-        # Start all timers
-        for timer in timers:
-            timer.start()
+        timer.start(steps[0][0])
         
         # Emit signal
         self.macro_started.emit(macro_id)
@@ -227,14 +384,11 @@ class MacroManager(QObject):
     def stop_macro(self, macro_id: str):
         """Stop a playing macro"""
         if macro_id in self.active_macros:
-            # Stop all timers
-            for timer in self.active_macros[macro_id]['timers']:
-                timer.stop()
+            # Stop the timer and remove from active macros
+            self._discard_timer(self.active_macros.pop(macro_id))
             
-            # Remove from active macros
-            del self.active_macros[macro_id]
-            
-            # Emit signal
+            # Deliver any queued step signals first, then emit finished
+            self._flush_signals()
             self.macro_finished.emit(macro_id)
             
             return True
@@ -246,37 +400,61 @@ class MacroManager(QObject):
         for macro_id in macro_ids:
             self.stop_macro(macro_id)
     
-    def _play_step(self, macro_id: str, step_id: str, sound_id: str, play_callback):
-        """Play a step in a macro"""
-        # Call the play callback
-        play_callback(sound_id)
+    def _play_step(self, macro_id: str):
+        """Play the current step of a macro and schedule the next one
         
-        # Emit signal
-        self.macro_step_played.emit(macro_id, step_id)
+        Steps due within STEP_COALESCE_MS are played in the same timer
+        tick. Their signals are queued and emitted together once the timer
+        callback returns, so slots never delay the sounds themselves.
+        """
+        active_info = self.active_macros.get(macro_id)
+        if active_info is None:
+            return
         
-        # Check if this is the last step
-        if macro_id in self.active_macros:
-            macro = self.macros[macro_id]
-            active_info = self.active_macros[macro_id]
-            active_info['current_step'] += 1
+        steps = active_info['steps']
+        step_index = active_info['current_step']
+        play_callback = active_info['play_callback']
+        elapsed = active_info['elapsed']
+        
+        while True:
+            _, step_id, sound_id = steps[step_index]
+            
+            # Call the play callback
+            play_callback(sound_id)
+            self._queue_signal(macro_id, step_id)
             
-            # If all steps have been played, emit finished signal
-            if active_info['current_step'] >= len(macro.steps) - 1:
-                # Remove from active macros
-                del self.active_macros[macro_id]
-                
-                # Emit signal
+            # The callback may have stopped or restarted the macro
+            if self.active_macros.get(macro_id) is not active_info:
+                return
+            
+            step_index += 1
+            if step_index >= len(steps) or steps[step_index][0] - elapsed.elapsed() >= self.STEP_COALESCE_MS:
+                break
+        
+        if step_index < len(steps):
+            active_info['current_step'] = step_index
+            active_info['timer'].start(max(steps[step_index][0] - elapsed.elapsed(), 0))
+        else:
+            # All steps have been played, remove from active macros
+            self._discard_timer(self.active_macros.pop(macro_id))
+            self._queue_signal(macro_id, None)
+    
+    def _queue_signal(self, macro_id: str, step_id: Optional[str]):
+        """Queue a step played signal, or macro finished if step_id is None"""
+        if not self._pending_signals:
+            QTimer.singleShot(0, self._flush_signals)
+        self._pending_signals.append((macro_id, step_id))
+    
+    def _flush_signals(self):
+        """Emit queued step played and macro finished signals in order"""
+        pending, self._pending_signals = self._pending_signals, []
+        for macro_id, step_id in pending:
+            if step_id is None:
                 self.macro_finished.emit(macro_id)
+            else:
+                self.macro_step_played.emit(macro_id, step_id)
     
-    def _sanitize_filename(self, filename: str):
-        """Sanitize a filename to be safe for the filesystem"""
-        # Replace invalid characters with underscores
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        
-        # Limit length
-        if len(filename) > 255:
-            filename = filename[:255]
-        
-        return filename
+    def _discard_timer(self, active_info: Dict[str, Any]):
+        """Stop and release the timer of a macro run"""
+        active_info['timer'].stop()
+        active_info['timer'].deleteLater()
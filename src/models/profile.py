@@ -1,16 +1,18 @@
 """
 Profile model - Represents a saved soundboard configuration
 """
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
-import json
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Iterator
 import os
+import orjson
 from pathlib import Path
 
+from models import json_file_cache
+from models.compat import DATACLASS_OPTIONS
 from models.sound import Sound
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Tab:
     """Class representing a tab in the soundboard"""
     name: str
@@ -32,7 +34,7 @@ class Tab:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Profile:
     """Class representing a saved soundboard configuration"""
     name: str
@@ -41,6 +43,9 @@ class Profile:
     active_tab_index: int = 0
     active_ambient_index: int = -1  # -1 means no ambient track is active
     
+    # (abspath, st_mtime_ns, hash of the encoded profile) of the last save
+    _last_saved: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert the profile to a dictionary for serialization"""
         return {
@@ -51,6 +56,11 @@ class Profile:
             'active_ambient_index': self.active_ambient_index
         }
     
+    def all_sounds(self) -> Iterator[Sound]:
+        """Iterate over the sounds in every tab"""
+        for tab in self.tabs:
+            yield from tab.sounds
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Profile':
         """Create a Profile object from a dictionary"""
@@ -62,11 +72,44 @@ class Profile:
             active_ambient_index=data.get('active_ambient_index', -1)
         )
     
+    def is_saved_as(self, file_path: str, data: bytes) -> bool:
+        """Check whether file_path still holds exactly this encoded profile
+        
+        Args:
+            file_path: Path the profile would be saved to
+            data: The encoded profile
+        
+        Returns:
+            True if this profile last wrote the same bytes there and the file
+            hasn't been modified since
+        """
+        if self._last_saved is None:
+            return False
+        try:
+            mtime = os.stat(file_path).st_mtime_ns
+        except OSError:
+            return False
+        return self._last_saved == (os.path.abspath(file_path), mtime, hash(data))
+    
+    def mark_saved(self, file_path: str, data: bytes):
+        """Record that the encoded profile was just written to file_path"""
+        self._last_saved = (os.path.abspath(file_path), os.stat(file_path).st_mtime_ns, hash(data))
+    
     def save_to_file(self, file_path: str) -> bool:
-        """Save the profile to a file"""
+        """Save the profile to a file, skipping the write if it is unchanged"""
         try:
-            with open(file_path, 'w') as f:
-                json.dump(self.to_dict(), f, indent=2)
+            data = orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2)
+            if self.is_saved_as(file_path, data):
+                return True
+            
+            # Write to a temporary file and swap it in so a crash mid-write
+            # never leaves a truncated profile behind
+            temp_path = f"{file_path}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, file_path)
+            json_file_cache.invalidate(file_path)
+            self.mark_saved(file_path, data)
             return True
         except Exception as e:
             print(f"Error saving profile: {e}")
@@ -79,9 +122,7 @@ class Profile:
             if not os.path.exists(file_path):
                 return None
             
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            
+            data = json_file_cache.load_json(file_path)
             return cls.from_dict(data)
         except Exception as e:
             print(f"Error loading profile: {e}")
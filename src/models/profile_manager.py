@@ -2,12 +2,14 @@
 Profile manager - Handles profile file operations
 """
 import os
-import json
+import orjson
 from typing import Optional, List, Dict, Any
-from pathlib import Path
 
+from models import json_file_cache
+from models.filenames import sanitize_filename
 from models.profile import Profile
 
+
 class ProfileManager:
     """Class for managing profile files"""
     
@@ -18,6 +20,13 @@ class ProfileManager:
         
         # Create directory if it doesn't exist
         os.makedirs(self.profiles_directory, exist_ok=True)
+        
+        # Resolved once; deletes are only allowed for files under this prefix
+        self._profiles_prefix = os.path.realpath(self.profiles_directory) + os.sep
+        
+        # Profile list from get_available_profiles, valid while the directory mtime matches
+        self._profiles_cache: List[Dict[str, str]] = []
+        self._profiles_cache_mtime = -1
     
     def save_profile(self, profile: Profile, name: Optional[str] = None) -> str:
         """
@@ -34,17 +43,37 @@ class ProfileManager:
         profile_name = name or profile.name
         
         # Sanitize filename
-        safe_name = self._sanitize_filename(profile_name)
+        safe_name = sanitize_filename(profile_name)
         
         # Create the file path
         file_path = os.path.join(self.profiles_directory, f"{safe_name}.profile")
         
-        # Convert profile to JSON
-        profile_data = profile.to_dict()
+        # Encode the whole profile up front, pretty-printed for human
+        # readability, so it goes to disk in a single write
+        profile_data = orjson.dumps(profile.to_dict(), option=orjson.OPT_INDENT_2)
         
-        # Save to file with pretty formatting for human readability
-        with open(file_path, 'w') as f:
-            json.dump(profile_data, f, indent=2)
+        # Nothing to do if the file already holds this profile
+        if profile.is_saved_as(file_path, profile_data):
+            return file_path
+        
+        # Write to a temporary file and swap it in so a crash mid-write
+        # never leaves a truncated profile behind
+        temp_path = f"{file_path}.tmp"
+        try:
+            f = open(temp_path, 'wb')
+        except FileNotFoundError:
+            # The directory is created on startup; only recreate it when it
+            # has gone missing since
+            os.makedirs(self.profiles_directory, exist_ok=True)
+            f = open(temp_path, 'wb')
+        with f:
+            f.write(profile_data)
+        os.replace(temp_path, file_path)
+        json_file_cache.invalidate(file_path)
+        profile.mark_saved(file_path, profile_data)
+        
+        # Coarse directory timestamps may not change when a file is added
+        self.invalidate_available_profiles()
         
         return file_path
     
@@ -64,11 +93,12 @@ class ProfileManager:
                 return None
             
             # Load JSON data
-            with open(file_path, 'r') as f:
-                profile_data = json.load(f)
+            profile_data = json_file_cache.load_json(file_path)
             
-            # Create profile from data
-            return Profile.from_dict(profile_data)
+            # Create profile from data, named after its file
+            profile = Profile.from_dict(profile_data)
+            profile.name = os.path.splitext(os.path.basename(file_path))[0]
+            return profile
         
         except Exception as e:
             print(f"Error loading profile: {e}")
@@ -84,21 +114,35 @@ class ProfileManager:
         profiles = []
         
         # Check if directory exists
-        if not os.path.isdir(self.profiles_directory):
+        try:
+            mtime = os.stat(self.profiles_directory).st_mtime_ns
+        except OSError:
             return profiles
         
-        # List all .profile files
-        for file_name in os.listdir(self.profiles_directory):
-            if file_name.endswith('.profile'):
-                file_path = os.path.join(self.profiles_directory, file_name)
-                profile_name = Path(file_name).stem
-                
-                profiles.append({
-                    'name': profile_name,
-                    'path': file_path
-                })
-        
-        return profiles
+        # Reuse the last scan while the directory is unchanged
+        if mtime == self._profiles_cache_mtime:
+            return list(self._profiles_cache)
+        
+        # List all .profile files; scandir entries carry their own path and type
+        with os.scandir(self.profiles_directory) as entries:
+            for entry in entries:
+                if entry.name.endswith('.profile') and entry.is_file():
+                    profiles.append({
+                        'name': os.path.splitext(entry.name)[0],
+                        'path': entry.path
+                    })
+        
+        self._profiles_cache = profiles
+        self._profiles_cache_mtime = mtime
+        
+        return list(profiles)
+    
+    def invalidate_available_profiles(self):
+        """Make the next get_available_profiles rescan the directory
+        
+        Call this after adding files to the profiles directory directly.
+        """
+        self._profiles_cache_mtime = -1
     
     def delete_profile(self, file_path: str) -> bool:
         """
@@ -112,7 +156,7 @@ class ProfileManager:
         """
         try:
             # Check if the file is within our profiles directory
-            if not file_path.startswith(self.profiles_directory):
+            if not os.path.realpath(file_path).startswith(self._profiles_prefix):
                 return False
             
             # Check if the file exists
@@ -121,25 +165,10 @@ class ProfileManager:
             
             # Delete the file
             os.remove(file_path)
+            json_file_cache.invalidate(file_path)
+            self.invalidate_available_profiles()
             return True
         
         except Exception as e:
             print(f"Error deleting profile: {e}")
             return False
-    
-    def _sanitize_filename(self, filename: str) -> str:
-        """
-        Sanitize a filename to be safe for the filesystem
-        
-        Args:
-            filename: The filename to sanitize
-            
-        Returns:
-            Sanitized filename
-        """
-        # Replace invalid characters with underscores
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        
-        return filename
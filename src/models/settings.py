@@ -1,12 +1,15 @@
 """
 Settings model - Represents application settings and preferences
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
-import json
 import os
+import orjson
 from enum import Enum
 
+from models import json_file_cache
+from models.compat import DATACLASS_OPTIONS
+
 
 class Theme(Enum):
     """Enum for different UI themes"""
@@ -15,65 +18,69 @@ class Theme(Enum):
     CUSTOM = "custom"
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Settings:
     """Class representing application settings and preferences"""
     theme: Theme = Theme.DARK
+    custom_theme: str = ""  # Name of the theme file used by Theme.CUSTOM
     font_size: int = 10
     font_family: str = "Arial"
     master_volume: float = 0.8
     ambient_volume: float = 0.5
     effects_volume: float = 0.7
+    voice_ducking_enabled: bool = True
     voice_ducking_amount: float = 0.5
     fade_in_duration: int = 1000  # milliseconds
     fade_out_duration: int = 1000  # milliseconds
     last_profile: str = ""
-    hotkeys: Dict[str, str] = None
+    hotkeys: Dict[str, str] = field(default_factory=dict)
     
-    def __post_init__(self):
-        """Initialize default values for mutable fields"""
-        if self.hotkeys is None:
-            self.hotkeys = {}
+    # Serialized keys, in file order, and converters from their JSON values
+    _KEYS = ('theme', 'custom_theme', 'font_size', 'font_family', 'master_volume', 'ambient_volume',
+             'effects_volume', 'voice_ducking_enabled', 'voice_ducking_amount', 'fade_in_duration',
+             'fade_out_duration', 'last_profile', 'hotkeys')
+    _CONVERTERS = {
+        'theme': Theme,
+        'hotkeys': dict  # Parsed data is shared, don't alias it
+    }
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the settings to a dictionary for serialization"""
-        return {
-            'theme': self.theme.value,
-            'font_size': self.font_size,
-            'font_family': self.font_family,
-            'master_volume': self.master_volume,
-            'ambient_volume': self.ambient_volume,
-            'effects_volume': self.effects_volume,
-            'voice_ducking_amount': self.voice_ducking_amount,
-            'fade_in_duration': self.fade_in_duration,
-            'fade_out_duration': self.fade_out_duration,
-            'last_profile': self.last_profile,
-            'hotkeys': self.hotkeys
-        }
+        data = {key: getattr(self, key) for key in self._KEYS}
+        data['theme'] = self.theme.value
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Settings':
-        """Create a Settings object from a dictionary"""
-        return cls(
-            theme=Theme(data.get('theme', Theme.DARK.value)),
-            font_size=data.get('font_size', 10),
-            font_family=data.get('font_family', 'Arial'),
-            master_volume=data.get('master_volume', 0.8),
-            ambient_volume=data.get('ambient_volume', 0.5),
-            effects_volume=data.get('effects_volume', 0.7),
-            voice_ducking_amount=data.get('voice_ducking_amount', 0.5),
-            fade_in_duration=data.get('fade_in_duration', 1000),
-            fade_out_duration=data.get('fade_out_duration', 1000),
-            last_profile=data.get('last_profile', ''),
-            hotkeys=data.get('hotkeys', {})
-        )
+        """Create a Settings object from a dictionary
+        
+        Missing keys keep their defaults and unknown keys are ignored.
+        """
+        converters = cls._CONVERTERS
+        values = {}
+        for key, value in data.items():
+            if key in cls._KEYS:
+                convert = converters.get(key)
+                values[key] = convert(value) if convert else value
+        return cls(**values)
     
     def save_to_file(self, file_path: str) -> bool:
         """Save the settings to a file"""
         try:
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, 'w') as f:
-                json.dump(self.to_dict(), f, indent=2)
+            # Write to a temporary file and swap it in so a crash mid-write
+            # never leaves a truncated settings file behind
+            temp_path = f"{file_path}.tmp"
+            try:
+                f = open(temp_path, 'wb')
+            except FileNotFoundError:
+                # The directory is normally created up front; only recreate
+                # it when it has actually gone missing
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                f = open(temp_path, 'wb')
+            with f:
+                f.write(orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2))
+            os.replace(temp_path, file_path)
+            json_file_cache.invalidate(file_path)
             return True
         except Exception as e:
             print(f"Error saving settings: {e}")
@@ -86,9 +93,7 @@ class Settings:
             if not os.path.exists(file_path):
                 return cls()
             
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            
+            data = json_file_cache.load_json(file_path)
             return cls.from_dict(data)
         except Exception as e:
             print(f"Error loading settings: {e}")
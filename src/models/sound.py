@@ -5,7 +5,9 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional, List, Dict, Any, Set
 import os
-from pathlib import Path
+import time
+
+from models.compat import DATACLASS_OPTIONS
 
 
 class PlaybackMode(Enum):
@@ -23,7 +25,18 @@ class ChannelType(Enum):
     EFFECTS_3 = 3
 
 
-@dataclass
+# Extensions of the audio formats we can play
+VALID_AUDIO_EXTENSIONS = frozenset({'.mp3', '.wav', '.ogg', '.flac'})
+
+# How long a file existence check is trusted, in seconds
+FILE_EXISTS_TTL = 2.0
+
+# Enum members by serialized value, for loading without Enum.__call__
+_CHANNEL_BY_VALUE = {channel.value: channel for channel in ChannelType}
+_PLAYBACK_MODE_BY_VALUE = {mode.value: mode for mode in PlaybackMode}
+
+
+@dataclass(**DATACLASS_OPTIONS)
 class Sound:
     """Class representing a sound effect or ambient track"""
     name: str
@@ -37,37 +50,50 @@ class Sound:
     fade_in_enabled: bool = False
     fade_out_enabled: bool = False
     color: str = "#3498db"  # Default button color
-    tags: List[str] = field(default_factory=list)  # List of tags for the sound
+    tags: Set[str] = field(default_factory=set)  # Lowercased tags for the sound
     hotkey: Optional[str] = None  # Hotkey for triggering this sound
     
+    # Caches keyed on the file path they were computed for, so editing
+    # file_path invalidates them
+    _extension_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    _exists_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    
     @property
     def file_exists(self) -> bool:
-        """Check if the sound file exists"""
-        return os.path.isfile(self.file_path)
+        """Check if the sound file exists, rechecking at most every FILE_EXISTS_TTL seconds"""
+        now = time.monotonic()
+        cached = self._exists_cache
+        if cached is not None and cached[0] == self.file_path and now - cached[1] < FILE_EXISTS_TTL:
+            return cached[2]
+        
+        exists = os.path.isfile(self.file_path)
+        self._exists_cache = (self.file_path, now, exists)
+        return exists
     
     @property
     def file_extension(self) -> str:
         """Get the file extension"""
-        return Path(self.file_path).suffix.lower()
+        cached = self._extension_cache
+        if cached is None or cached[0] != self.file_path:
+            cached = (self.file_path, os.path.splitext(self.file_path)[1].lower())
+            self._extension_cache = cached
+        return cached[1]
     
     @property
     def is_valid_audio_file(self) -> bool:
         """Check if the file is a valid audio file"""
-        valid_extensions = ['.mp3', '.wav', '.ogg', '.flac']
-        return self.file_exists and self.file_extension in valid_extensions
+        return self.file_extension in VALID_AUDIO_EXTENSIONS and self.file_exists
     
     def add_tag(self, tag: str):
         """Add a tag to the sound"""
         # Convert to lowercase and strip whitespace
         tag = tag.lower().strip()
-        if tag and tag not in self.tags:
-            self.tags.append(tag)
+        if tag:
+            self.tags.add(tag)
     
     def remove_tag(self, tag: str):
         """Remove a tag from the sound"""
-        tag = tag.lower().strip()
-        if tag in self.tags:
-            self.tags.remove(tag)
+        self.tags.discard(tag.lower().strip())
     
     def has_tag(self, tag: str) -> bool:
         """Check if the sound has a specific tag"""
@@ -84,7 +110,7 @@ class Sound:
     
     def get_tags_as_string(self) -> str:
         """Get tags as a comma-separated string"""
-        return ','.join(self.tags)
+        return ','.join(sorted(self.tags))
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the sound to a dictionary for serialization"""
@@ -100,7 +126,7 @@ class Sound:
             'fade_in_enabled': self.fade_in_enabled,
             'fade_out_enabled': self.fade_out_enabled,
             'color': self.color,
-            'tags': self.tags,
+            'tags': sorted(self.tags),  # Stable order on disk
             'hotkey': self.hotkey
         }
     
@@ -110,9 +136,9 @@ class Sound:
         sound = cls(
             name=data['name'],
             file_path=data['file_path'],
-            channel=ChannelType(data['channel']),
+            channel=_CHANNEL_BY_VALUE[data['channel']],
             volume=data['volume'],
-            playback_mode=PlaybackMode(data['playback_mode']),
+            playback_mode=_PLAYBACK_MODE_BY_VALUE[data['playback_mode']],
             repeat_count=data['repeat_count'],
             fade_in=data['fade_in'],
             fade_out=data['fade_out'],
@@ -120,15 +146,13 @@ class Sound:
         )
         
         # Add optional properties if present
-        if 'fade_in_enabled' in data:
-            sound.fade_in_enabled = data['fade_in_enabled']
-        if 'fade_out_enabled' in data:
-            sound.fade_out_enabled = data['fade_out_enabled']
-        if 'hotkey' in data:
-            sound.hotkey = data['hotkey']
+        sound.fade_in_enabled = data.get('fade_in_enabled', sound.fade_in_enabled)
+        sound.fade_out_enabled = data.get('fade_out_enabled', sound.fade_out_enabled)
+        sound.hotkey = data.get('hotkey', sound.hotkey)
         
         # Add tags if present
-        if 'tags' in data:
-            sound.tags = data['tags']
+        tags = data.get('tags')
+        if tags is not None:
+            sound.tags = set(tags)
             
         return sound
@@ -0,0 +1,167 @@
+"""
+Sound cache - Decoded audio shared by local and Discord playback
+"""
+import os
+import subprocess
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+
+# Keep Windows from opening a console for every FFmpeg run in the windowed build
+_SUBPROCESS_FLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+
+
+class SoundCache:
+    """LRU cache of decoded PCM audio
+    
+    Sounds are decoded once with FFmpeg to 48 kHz stereo signed 16-bit
+    little-endian PCM, the format Discord expects, and the same bytes feed
+    both the local audio player and the Discord bot. Without FFmpeg,
+    soundfile decodes instead. Entries are keyed on the file's path and
+    modification time, so a file replaced on disk is decoded again.
+    """
+    
+    SAMPLE_RATE = 48000
+    CHANNELS = 2
+    
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024):
+        """Initialize the sound cache
+        
+        Args:
+            max_bytes: Upper bound on decoded audio kept in memory
+        """
+        self.max_bytes = max_bytes
+        self._cache: OrderedDict[Tuple, bytes] = OrderedDict()  # Keyed by _key, least recently used first
+        self._size = 0
+        self._lock = threading.Lock()  # Used from the GUI, bot and pre-decode threads
+        self._decoding: Dict[Tuple, Future] = {}  # Decodes in progress, shared by every caller
+        self._ffmpeg_available = True  # Cleared once FFmpeg turns out to be missing
+    
+    @staticmethod
+    def _key(file_path: str) -> Tuple:
+        """Cache key for the current contents of a file"""
+        try:
+            mtime = os.stat(file_path).st_mtime_ns
+        except OSError:
+            mtime = None  # Missing files fail to decode and are never cached
+        return (file_path, mtime)
+    
+    def has_pcm(self, file_path: str) -> bool:
+        """Check whether a file's PCM is cached, so get_pcm will not decode"""
+        key = self._key(file_path)
+        with self._lock:
+            return key in self._cache
+    
+    def contains(self, file_path: str) -> bool:
+        """Check whether a file is cached or already being decoded"""
+        key = self._key(file_path)
+        with self._lock:
+            return key in self._cache or key in self._decoding
+    
+    def get_pcm(self, file_path: str) -> Optional[bytes]:
+        """Get decoded PCM for a file, decoding it on a cache miss
+        
+        Args:
+            file_path: Path to the sound file
+        
+        Returns:
+            Decoded PCM, or None if the file could not be decoded
+        """
+        key = self._key(file_path)
+        with self._lock:
+            pcm = self._cache.get(key)
+            if pcm is not None:
+                self._cache.move_to_end(key)
+                return pcm
+            
+            # Wait for a decode of the same file another thread started
+            decoding = self._decoding.get(key)
+            if decoding is None:
+                decoding = self._decoding[key] = Future()
+                owner = True
+            else:
+                owner = False
+        
+        if not owner:
+            return decoding.result()
+        
+        pcm = None
+        try:
+            pcm = self._decode(file_path)
+        finally:
+            with self._lock:
+                # Too large to cache, hand it out without keeping it
+                if pcm is not None and len(pcm) <= self.max_bytes:
+                    self._cache[key] = pcm
+                    self._size += len(pcm)
+                    
+                    # Evict least recently used entries until back under budget
+                    while self._size > self.max_bytes:
+                        _, evicted = self._cache.popitem(last=False)
+                        self._size -= len(evicted)
+                
+                del self._decoding[key]
+            decoding.set_result(pcm)
+        
+        return pcm
+    
+    def _decode(self, file_path: str) -> Optional[bytes]:
+        """Decode a file to PCM with FFmpeg, falling back to soundfile"""
+        if self._ffmpeg_available:
+            try:
+                result = subprocess.run(
+                    ['ffmpeg', '-v', 'error', '-i', file_path,
+                     '-f', 's16le', '-ar', str(self.SAMPLE_RATE),
+                     '-ac', str(self.CHANNELS), '-'],
+                    capture_output=True, check=True, creationflags=_SUBPROCESS_FLAGS
+                )
+                return result.stdout
+            except FileNotFoundError:
+                # Report a missing FFmpeg once, then stop trying it; concurrent
+                # decodes can all get here, so only the first one reports
+                with self._lock:
+                    report = self._ffmpeg_available
+                    self._ffmpeg_available = False
+                if report:
+                    print("FFmpeg was not found on PATH; decoding sounds with soundfile instead")
+            except (OSError, subprocess.CalledProcessError) as e:
+                print(f"Error decoding sound {file_path} with FFmpeg: {e}")
+                return None
+        
+        return self._decode_with_soundfile(file_path)
+    
+    def _decode_with_soundfile(self, file_path: str) -> Optional[bytes]:
+        """Decode a file with soundfile, converting it to the cache's format"""
+        try:
+            import numpy as np
+            import soundfile as sf
+        except ImportError:
+            print(f"Cannot decode sound {file_path}: install FFmpeg or the soundfile package")
+            return None
+        
+        try:
+            data, sample_rate = sf.read(file_path, dtype='float32', always_2d=True)
+        except Exception as e:
+            print(f"Error decoding sound {file_path} with soundfile: {e}")
+            return None
+        
+        # Match the channel count: duplicate mono, drop extra channels
+        if data.shape[1] == 1:
+            data = np.repeat(data, self.CHANNELS, axis=1)
+        else:
+            data = data[:, :self.CHANNELS]
+        
+        # Resample linearly to the cache's rate
+        if sample_rate != self.SAMPLE_RATE and len(data):
+            frames = int(round(len(data) * self.SAMPLE_RATE / sample_rate))
+            source_times = np.arange(len(data)) / sample_rate
+            target_times = np.arange(frames) / self.SAMPLE_RATE
+            data = np.column_stack([
+                np.interp(target_times, source_times, data[:, channel])
+                for channel in range(self.CHANNELS)
+            ])
+        
+        pcm = np.clip(data * 32767.0, -32768, 32767).astype('<i2')
+        return pcm.tobytes()
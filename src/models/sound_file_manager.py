@@ -3,7 +3,6 @@ Sound file manager - Handles sound file operations
 """
 import os
 import shutil
-from pathlib import Path
 import uuid
 from typing import Optional, Tuple
 
@@ -19,6 +18,12 @@ class SoundFileManager:
         # Create directories if they don't exist
         os.makedirs(self.sounds_directory, exist_ok=True)
         os.makedirs(self.ambient_directory, exist_ok=True)
+        
+        # Resolved once; deletes are only allowed for files under these prefixes
+        self._managed_prefixes = (
+            os.path.realpath(self.sounds_directory) + os.sep,
+            os.path.realpath(self.ambient_directory) + os.sep
+        )
     
     def import_sound_file(self, source_path: str, is_ambient: bool = False) -> Tuple[bool, str]:
         """
@@ -40,21 +45,45 @@ class SoundFileManager:
             target_dir = self.ambient_directory if is_ambient else self.sounds_directory
             
             # Generate a unique filename to avoid conflicts
-            file_extension = Path(source_path).suffix
-            original_filename = Path(source_path).stem
+            original_filename, file_extension = os.path.splitext(os.path.basename(source_path))
             unique_filename = f"{original_filename}_{uuid.uuid4().hex[:8]}{file_extension}"
             
             # Create the target path
             target_path = os.path.join(target_dir, unique_filename)
             
             # Copy the file
-            shutil.copy2(source_path, target_path)
+            self._copy_file(source_path, target_path)
             
             return True, target_path
         
         except Exception as e:
             return False, f"Error importing sound file: {e}"
     
+    def _copy_file(self, source_path: str, target_path: str):
+        """
+        Copy a file with its metadata, keeping the data in the kernel
+        
+        os.copy_file_range (Linux) can clone the file on copy-on-write
+        filesystems; elsewhere, or if it fails, shutil.copy2 is used.
+        """
+        copy_file_range = getattr(os, 'copy_file_range', None)
+        if copy_file_range is not None:
+            try:
+                with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+                    remaining = os.fstat(src.fileno()).st_size
+                    while remaining > 0:
+                        # May copy less than asked for, so loop until done
+                        copied = copy_file_range(src.fileno(), dst.fileno(), remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                shutil.copystat(source_path, target_path)
+                return
+            except OSError:
+                pass  # e.g. unsupported by the filesystem, fall back below
+        
+        shutil.copy2(source_path, target_path)
+    
     def delete_sound_file(self, file_path: str) -> bool:
         """
         Delete a sound file from the application's directory structure
@@ -67,8 +96,7 @@ class SoundFileManager:
         """
         try:
             # Check if the file is within our managed directories
-            if not (file_path.startswith(self.sounds_directory) or 
-                    file_path.startswith(self.ambient_directory)):
+            if not os.path.realpath(file_path).startswith(self._managed_prefixes):
                 return False
             
             # Check if the file exists
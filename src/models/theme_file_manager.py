@@ -1,14 +1,54 @@
 """
 Theme manager model - Handles theme file operations
 """
+import logging
 import os
-import json
+import orjson
 from typing import Optional, List, Dict, Any
-from pathlib import Path
 from enum import Enum
+from types import MappingProxyType
 
+from models.filenames import sanitize_filename
 from models.settings import Theme
 
+logger = logging.getLogger(__name__)
+
+# Colors of the themes created on first run; read-only, copied into ThemeFile
+_LIGHT_COLORS = MappingProxyType({
+    'window': '#f0f0f0',
+    'windowText': '#000000',
+    'base': '#ffffff',
+    'alternateBase': '#f5f5f5',
+    'toolTipBase': '#ffffdc',
+    'toolTipText': '#000000',
+    'text': '#000000',
+    'button': '#f0f0f0',
+    'buttonText': '#000000',
+    'brightText': '#ff0000',
+    'link': '#0000ff',
+    'highlight': '#2a82da',
+    'highlightedText': '#ffffff'
+})
+
+_DARK_COLORS = MappingProxyType({
+    'window': '#353535',
+    'windowText': '#ffffff',
+    'base': '#191919',
+    'alternateBase': '#353535',
+    'toolTipBase': '#353535',
+    'toolTipText': '#ffffff',
+    'text': '#ffffff',
+    'button': '#353535',
+    'buttonText': '#ffffff',
+    'brightText': '#ff0000',
+    'link': '#2a82da',
+    'highlight': '#2a82da',
+    'highlightedText': '#ffffff'
+})
+
+_DEFAULT_THEMES = (("Light", _LIGHT_COLORS), ("Dark", _DARK_COLORS))
+
+
 class ThemeFile:
     """Class representing a theme file"""
     
@@ -36,67 +76,35 @@ class ThemeFile:
 class ThemeFileManager:
     """Class for managing theme files"""
     
+    # Themes directories already created and seeded in this process
+    _initialized_dirs = set()
+    
     def __init__(self, base_directory: str):
         """Initialize the theme manager"""
         self.base_directory = base_directory
         self.themes_directory = os.path.join(base_directory, 'resources', 'themes')
         
-        # Create directory if it doesn't exist
-        os.makedirs(self.themes_directory, exist_ok=True)
+        # Theme list from get_available_themes, valid while the directory mtime matches
+        self._themes_cache: List[Dict[str, str]] = []
+        self._themes_cache_mtime = -1
         
-        # Create default themes if they don't exist
-        self._create_default_themes()
+        # Later managers for the same directory skip the filesystem setup
+        if self.themes_directory not in ThemeFileManager._initialized_dirs:
+            # Create directory and default themes if they don't exist
+            os.makedirs(self.themes_directory, exist_ok=True)
+            self._create_default_themes()
+            ThemeFileManager._initialized_dirs.add(self.themes_directory)
+        
+        # Resolved once; deletes are only allowed for files under this prefix
+        self._themes_prefix = os.path.realpath(self.themes_directory) + os.sep
     
     def _create_default_themes(self):
         """Create default themes if they don't exist"""
-        # Light theme
-        light_theme = ThemeFile(
-            name="Light",
-            colors={
-                'window': '#f0f0f0',
-                'windowText': '#000000',
-                'base': '#ffffff',
-                'alternateBase': '#f5f5f5',
-                'toolTipBase': '#ffffdc',
-                'toolTipText': '#000000',
-                'text': '#000000',
-                'button': '#f0f0f0',
-                'buttonText': '#000000',
-                'brightText': '#ff0000',
-                'link': '#0000ff',
-                'highlight': '#2a82da',
-                'highlightedText': '#ffffff'
-            }
-        )
-        
-        # Dark theme
-        dark_theme = ThemeFile(
-            name="Dark",
-            colors={
-                'window': '#353535',
-                'windowText': '#ffffff',
-                'base': '#191919',
-                'alternateBase': '#353535',
-                'toolTipBase': '#353535',
-                'toolTipText': '#ffffff',
-                'text': '#ffffff',
-                'button': '#353535',
-                'buttonText': '#ffffff',
-                'brightText': '#ff0000',
-                'link': '#2a82da',
-                'highlight': '#2a82da',
-                'highlightedText': '#ffffff'
-            }
-        )
-        
-        # Save default themes if they don't exist
-        light_path = os.path.join(self.themes_directory, "Light.theme")
-        if not os.path.exists(light_path):
-            self.save_theme(light_theme)
-        
-        dark_path = os.path.join(self.themes_directory, "Dark.theme")
-        if not os.path.exists(dark_path):
-            self.save_theme(dark_theme)
+        for name, colors in _DEFAULT_THEMES:
+            # Only build and save a theme whose file is missing
+            theme_path = os.path.join(self.themes_directory, f"{name}.theme")
+            if not os.path.exists(theme_path):
+                self.save_theme(ThemeFile(name=name, colors=dict(colors)))
     
     def save_theme(self, theme: ThemeFile) -> str:
         """
@@ -109,7 +117,7 @@ class ThemeFileManager:
             Path to the saved theme file
         """
         # Sanitize filename
-        safe_name = self._sanitize_filename(theme.name)
+        safe_name = sanitize_filename(theme.name)
         
         # Create the file path
         file_path = os.path.join(self.themes_directory, f"{safe_name}.theme")
@@ -117,9 +125,16 @@ class ThemeFileManager:
         # Convert theme to JSON
         theme_data = theme.to_dict()
         
-        # Save to file with pretty formatting for human readability
-        with open(file_path, 'w') as f:
-            json.dump(theme_data, f, indent=2)
+        # Save to file with pretty formatting for human readability, writing
+        # a temporary file and swapping it in so a crash mid-write never
+        # leaves a truncated theme behind
+        temp_path = f"{file_path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(orjson.dumps(theme_data, option=orjson.OPT_INDENT_2))
+        os.replace(temp_path, file_path)
+        
+        # Coarse directory timestamps may not change when a file is added
+        self._themes_cache_mtime = -1
         
         return file_path
     
@@ -134,19 +149,18 @@ class ThemeFileManager:
             Loaded theme or None if loading failed
         """
         try:
-            # Check if the file exists
-            if not os.path.isfile(file_path):
-                return None
-            
-            # Load JSON data
-            with open(file_path, 'r') as f:
-                theme_data = json.load(f)
+            # Load JSON data; a missing file is reported by open itself
+            with open(file_path, 'rb') as f:
+                theme_data = orjson.loads(f.read())
             
             # Create theme from data
             return ThemeFile.from_dict(theme_data)
         
-        except Exception as e:
-            print(f"Error loading theme: {e}")
+        except FileNotFoundError:
+            return None
+        
+        except Exception:
+            logger.exception("Error loading theme %s", file_path)
             return None
     
     def get_available_themes(self) -> List[Dict[str, str]]:
@@ -159,21 +173,29 @@ class ThemeFileManager:
         themes = []
         
         # Check if directory exists
-        if not os.path.isdir(self.themes_directory):
+        try:
+            mtime = os.stat(self.themes_directory).st_mtime_ns
+        except OSError:
             return themes
         
-        # List all .theme files
-        for file_name in os.listdir(self.themes_directory):
-            if file_name.endswith('.theme'):
-                file_path = os.path.join(self.themes_directory, file_name)
-                theme_name = Path(file_name).stem
-                
-                themes.append({
-                    'name': theme_name,
-                    'path': file_path
-                })
-        
-        return themes
+        # Reuse the last scan while the directory is unchanged
+        if mtime == self._themes_cache_mtime:
+            return list(self._themes_cache)
+        
+        # List all .theme files; scandir entries carry their own path and type
+        with os.scandir(self.themes_directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith('.theme') and entry.is_file(follow_symlinks=False):
+                    themes.append({
+                        'name': name[:-len('.theme')],
+                        'path': entry.path
+                    })
+        
+        self._themes_cache = themes
+        self._themes_cache_mtime = mtime
+        
+        return list(themes)
     
     def delete_theme(self, file_path: str) -> bool:
         """
@@ -187,34 +209,17 @@ class ThemeFileManager:
         """
         try:
             # Check if the file is within our themes directory
-            if not file_path.startswith(self.themes_directory):
-                return False
-            
-            # Check if the file exists
-            if not os.path.isfile(file_path):
+            if not os.path.realpath(file_path).startswith(self._themes_prefix):
                 return False
             
-            # Delete the file
+            # Delete the file; a missing file is reported by remove itself
             os.remove(file_path)
+            self._themes_cache_mtime = -1
             return True
         
-        except Exception as e:
-            print(f"Error deleting theme: {e}")
+        except FileNotFoundError:
             return False
-    
-    def _sanitize_filename(self, filename: str) -> str:
-        """
-        Sanitize a filename to be safe for the filesystem
         
-        Args:
-            filename: The filename to sanitize
-            
-        Returns:
-            Sanitized filename
-        """
-        # Replace invalid characters with underscores
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        
-        return filename
+        except Exception:
+            logger.exception("Error deleting theme %s", file_path)
+            return False
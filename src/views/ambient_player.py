@@ -74,10 +74,11 @@ class AmbientPlayerView(QGroupBox):
     
     def update_track_list(self, tracks):
         """Update the ambient track list"""
+        # Repopulate in one insert without emitting index changes on the way
+        self.track_combo.blockSignals(True)
         self.track_combo.clear()
-        
-        for track in tracks:
-            self.track_combo.addItem(track.name)
+        self.track_combo.addItems([track.name for track in tracks])
+        self.track_combo.blockSignals(False)
     
     def set_active_track(self, index):
         """Set the active track"""
@@ -1,11 +1,13 @@
 """
 Channel mixer view - Controls for audio channels
 """
+from functools import partial
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QSlider, QGroupBox, QCheckBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 
 from models.sound import ChannelType
 
@@ -18,8 +20,20 @@ class ChannelMixerView(QGroupBox):
     voice_ducking_toggled = pyqtSignal(bool)  # Enabled
     voice_ducking_amount_changed = pyqtSignal(float)  # Amount
     
+    # Slider changes are forwarded at most once per interval (about 60 Hz)
+    FLUSH_INTERVAL_MS = 16
+    
     def __init__(self, parent=None):
         super().__init__("Channel Mixer", parent)
+        
+        # Latest slider values waiting to be emitted by _flush
+        self._pending_volumes = {}
+        self._pending_ducking_amount = None
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush)
+        
         self.init_ui()
     
     def init_ui(self):
@@ -27,22 +41,25 @@ class ChannelMixerView(QGroupBox):
         main_layout = QVBoxLayout(self)
         
         # Create sliders for each channel
-        self.channel_sliders = {}
-        self.channel_labels = {}
+        # Indexed by ChannelType value, one entry per channel
+        self.channel_sliders = [None] * len(ChannelType)
+        self.channel_labels = [None] * len(ChannelType)
         
         # Ambient channel
         ambient_layout = QHBoxLayout()
         ambient_layout.addWidget(QLabel("Ambient:"))
         
-        self.channel_sliders[ChannelType.AMBIENT] = QSlider(Qt.Orientation.Horizontal)
-        self.channel_sliders[ChannelType.AMBIENT].setRange(0, 100)
-        self.channel_sliders[ChannelType.AMBIENT].setValue(50)
-        self.channel_sliders[ChannelType.AMBIENT].setTickPosition(QSlider.TickPosition.TicksBelow)
-        self.channel_sliders[ChannelType.AMBIENT].setTickInterval(10)
-        ambient_layout.addWidget(self.channel_sliders[ChannelType.AMBIENT])
+        slider = QSlider(Qt.Orientation.Horizontal)
+        slider.setRange(0, 100)
+        slider.setValue(50)
+        slider.setTickPosition(QSlider.TickPosition.TicksBelow)
+        slider.setTickInterval(10)
+        self.channel_sliders[ChannelType.AMBIENT.value] = slider
+        ambient_layout.addWidget(slider)
         
-        self.channel_labels[ChannelType.AMBIENT] = QLabel("50%")
-        ambient_layout.addWidget(self.channel_labels[ChannelType.AMBIENT])
+        label = QLabel("50%")
+        self.channel_labels[ChannelType.AMBIENT.value] = label
+        ambient_layout.addWidget(label)
         
         main_layout.addLayout(ambient_layout)
         
@@ -51,15 +68,17 @@ class ChannelMixerView(QGroupBox):
             layout = QHBoxLayout()
             layout.addWidget(QLabel(f"Effects {i+1}:"))
             
-            self.channel_sliders[channel_type] = QSlider(Qt.Orientation.Horizontal)
-            self.channel_sliders[channel_type].setRange(0, 100)
-            self.channel_sliders[channel_type].setValue(70)
-            self.channel_sliders[channel_type].setTickPosition(QSlider.TickPosition.TicksBelow)
-            self.channel_sliders[channel_type].setTickInterval(10)
-            layout.addWidget(self.channel_sliders[channel_type])
+            slider = QSlider(Qt.Orientation.Horizontal)
+            slider.setRange(0, 100)
+            slider.setValue(70)
+            slider.setTickPosition(QSlider.TickPosition.TicksBelow)
+            slider.setTickInterval(10)
+            self.channel_sliders[channel_type.value] = slider
+            layout.addWidget(slider)
             
-            self.channel_labels[channel_type] = QLabel("70%")
-            layout.addWidget(self.channel_labels[channel_type])
+            label = QLabel("70%")
+            self.channel_labels[channel_type.value] = label
+            layout.addWidget(label)
             
             main_layout.addLayout(layout)
         
@@ -95,10 +114,9 @@ class ChannelMixerView(QGroupBox):
     def connect_signals(self):
         """Connect signals and slots"""
         # Channel volume sliders
-        for channel_type, slider in self.channel_sliders.items():
-            slider.valueChanged.connect(
-                lambda value, ct=channel_type: self.on_channel_volume_changed(ct, value)
-            )
+        for channel_type in ChannelType:
+            slider = self.channel_sliders[channel_type.value]
+            slider.valueChanged.connect(partial(self.on_channel_volume_changed, channel_type))
         
         # Voice ducking controls
         self.ducking_checkbox.toggled.connect(self.on_ducking_toggled)
@@ -106,8 +124,10 @@ class ChannelMixerView(QGroupBox):
     
     def on_channel_volume_changed(self, channel_type, value):
         """Handle channel volume slider change"""
-        self.channel_labels[channel_type].setText(f"{value}%")
-        self.channel_volume_changed.emit(channel_type, value / 100.0)
+        self.channel_labels[channel_type.value].setText(f"{value}%")
+        self._pending_volumes[channel_type] = value / 100.0
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
     
     def on_ducking_toggled(self, enabled):
         """Handle voice ducking checkbox toggle"""
@@ -117,17 +137,53 @@ class ChannelMixerView(QGroupBox):
     def on_ducking_amount_changed(self, value):
         """Handle voice ducking amount slider change"""
         self.ducking_label.setText(f"{value}%")
-        self.voice_ducking_amount_changed.emit(value / 100.0)
+        self._pending_ducking_amount = value / 100.0
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+    
+    def _flush(self):
+        """Emit the latest value of each slider changed since the last flush"""
+        pending, self._pending_volumes = self._pending_volumes, {}
+        for channel_type, volume in pending.items():
+            self.channel_volume_changed.emit(channel_type, volume)
+        
+        if self._pending_ducking_amount is not None:
+            amount, self._pending_ducking_amount = self._pending_ducking_amount, None
+            self.voice_ducking_amount_changed.emit(amount)
     
     def set_channel_volume(self, channel_type, volume):
         """Set the volume for a channel"""
         value = int(volume * 100)
-        self.channel_sliders[channel_type].setValue(value)
-        self.channel_labels[channel_type].setText(f"{value}%")
+        self.channel_sliders[channel_type.value].setValue(value)
+        self.channel_labels[channel_type.value].setText(f"{value}%")
+    
+    def set_channel_volumes(self, volumes):
+        """Set the volume for several channels at once
+        
+        Slider signals are blocked so programmatic updates are not echoed
+        back as channel_volume_changed.
+        """
+        for channel_type, volume in volumes.items():
+            value = int(volume * 100)
+            slider = self.channel_sliders[channel_type.value]
+            slider.blockSignals(True)
+            slider.setValue(value)
+            slider.blockSignals(False)
+            self.channel_labels[channel_type.value].setText(f"{value}%")
     
     def set_voice_ducking(self, enabled, amount):
-        """Set voice ducking settings"""
+        """Set voice ducking settings
+        
+        Signals are blocked so programmatic updates are not echoed back as
+        voice_ducking_toggled or voice_ducking_amount_changed.
+        """
+        self.ducking_checkbox.blockSignals(True)
         self.ducking_checkbox.setChecked(enabled)
+        self.ducking_checkbox.blockSignals(False)
+        self.ducking_slider.setEnabled(enabled)
+        
         value = int(amount * 100)
+        self.ducking_slider.blockSignals(True)
         self.ducking_slider.setValue(value)
+        self.ducking_slider.blockSignals(False)
         self.ducking_label.setText(f"{value}%")
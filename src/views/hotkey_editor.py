@@ -8,7 +8,17 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 
-import keyboard
+# keyboard loads its native hook backend on import; defer it until recording
+_keyboard = None
+
+
+def _get_keyboard():
+    """Import the keyboard module on first use"""
+    global _keyboard
+    if _keyboard is None:
+        import keyboard
+        _keyboard = keyboard
+    return _keyboard
 
 
 class HotkeyRecordButton(QPushButton):
@@ -42,7 +52,7 @@ class HotkeyRecordButton(QPushButton):
         self.setStyleSheet("background-color: #ffcccc;")
         
         # Hook keyboard events
-        keyboard.hook(self.on_key_event)
+        _get_keyboard().hook(self.on_key_event)
     
     def stop_recording(self):
         """Stop recording hotkeys"""
@@ -52,7 +62,7 @@ class HotkeyRecordButton(QPushButton):
         self.setChecked(False)
         
         # Unhook keyboard events
-        keyboard.unhook(self.on_key_event)
+        _get_keyboard().unhook(self.on_key_event)
         
         # Emit the hotkey if valid
         if self.current_hotkey and self.current_hotkey != "escape":
@@ -64,7 +74,11 @@ class HotkeyRecordButton(QPushButton):
             return
         
         # Check if key is pressed
-        if event.event_type == keyboard.KEY_DOWN:
+        if event.event_type == _keyboard.KEY_DOWN:
+            # Held keys auto-repeat; the combination only changes on a new key
+            if event.name in self.keys_pressed:
+                return
+            
             # Add key to pressed keys
             self.keys_pressed.add(event.name)
             
@@ -80,7 +94,7 @@ class HotkeyRecordButton(QPushButton):
             self.setText(f"Keys: {self.current_hotkey}")
         
         # Check if key is released
-        elif event.event_type == keyboard.KEY_UP:
+        elif event.event_type == _keyboard.KEY_UP:
             # Remove key from pressed keys
             if event.name in self.keys_pressed:
                 self.keys_pressed.remove(event.name)
@@ -161,14 +175,31 @@ class HotkeyEditorDialog(QDialog):
     
     def load_hotkeys(self):
         """Load registered hotkeys"""
-        self.hotkey_list.clear()
-        
         hotkeys = self.hotkey_manager.get_registered_hotkeys()
+        hotkey_list = self.hotkey_list
+        
+        # Update the existing items in place and repaint once at the end
+        hotkey_list.setUpdatesEnabled(False)
+        hotkey_list.blockSignals(True)
+        
+        for row, hotkey in enumerate(hotkeys):
+            text = f"{hotkey['name']} ({hotkey['key_combination']})"
+            item = hotkey_list.item(row)
+            
+            if item is None:
+                item = QListWidgetItem(text)
+                item.setData(Qt.ItemDataRole.UserRole, hotkey['key_combination'])
+                hotkey_list.addItem(item)
+            elif item.data(Qt.ItemDataRole.UserRole) != hotkey['key_combination'] or item.text() != text:
+                item.setText(text)
+                item.setData(Qt.ItemDataRole.UserRole, hotkey['key_combination'])
+        
+        # Drop items for hotkeys that are gone
+        for row in range(hotkey_list.count() - 1, len(hotkeys) - 1, -1):
+            hotkey_list.takeItem(row)
         
-        for hotkey in hotkeys:
-            item = QListWidgetItem(f"{hotkey['name']} ({hotkey['key_combination']})")
-            item.setData(Qt.ItemDataRole.UserRole, hotkey['key_combination'])
-            self.hotkey_list.addItem(item)
+        hotkey_list.blockSignals(False)
+        hotkey_list.setUpdatesEnabled(True)
     
     def on_hotkey_recorded(self, hotkey):
         """Handle recorded hotkey"""
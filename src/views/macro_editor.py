@@ -6,16 +6,199 @@ from PyQt6.QtWidgets import (
     QPushButton, QListWidget, QMessageBox,
     QListWidgetItem, QLineEdit, QSpinBox,
     QDoubleSpinBox, QComboBox, QGroupBox,
-    QTableWidget, QTableWidgetItem, QHeaderView
+    QTableView, QHeaderView, QStyledItemDelegate,
+    QStyle, QStyleOptionButton, QApplication
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import (
+    Qt, pyqtSignal, QAbstractTableModel, QModelIndex, QEvent, QRect, QTimer
+)
+from PyQt6.QtGui import QStandardItem, QStandardItemModel
 
 from models.macro_manager import Macro, MacroStep
 
 
+class MacroStepsModel(QAbstractTableModel):
+    """Table model exposing a macro's steps directly to a view
+    
+    Edits go through the model so the view only updates the affected rows
+    instead of being rebuilt.
+    """
+    
+    HEADERS = ("Sound", "Delay (sec)", "Actions")
+    
+    def __init__(self, macro, sound_manager, parent=None):
+        super().__init__(parent)
+        self.macro = macro
+        self.sound_manager = sound_manager
+        
+        # sound id -> display name, built in one pass over the known sounds
+        sounds = sound_manager.get_all_sounds() if hasattr(sound_manager, 'get_all_sounds') else []
+        self._sound_names = {sound.id: sound.name for sound in sounds}
+        
+        # Row -> values shown for it, rebuilt lazily after rows move
+        self._rows = {}
+    
+    def rowCount(self, parent=QModelIndex()):
+        """Number of steps in the macro"""
+        return 0 if parent.isValid() else len(self.macro.steps)
+    
+    def columnCount(self, parent=QModelIndex()):
+        """Sound, delay and actions columns"""
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """Data for a cell; the actions column is painted by its delegate"""
+        # Views ask for many styling roles per cell on every paint; only
+        # these two are provided, so check the role before anything else
+        if role == Qt.ItemDataRole.DisplayRole:
+            if index.isValid():
+                return self._row(index.row())[0][index.column()]
+        elif role == Qt.ItemDataRole.UserRole:
+            if index.isValid() and index.column() == 0:
+                return self._row(index.row())[1]
+        
+        return None
+    
+    def _row(self, row):
+        """Get the cached (display texts by column, sound id) of a row"""
+        cached = self._rows.get(row)
+        if cached is None:
+            step = self.macro.steps[row]
+            cached = ((self._sound_name(step.sound_id), f"{step.delay:.1f}", None), step.sound_id)
+            self._rows[row] = cached
+        return cached
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        """Column titles and 1-based row numbers"""
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return section + 1
+    
+    def _sound_name(self, sound_id):
+        """Get the display name of a sound"""
+        name = self._sound_names.get(sound_id)
+        if name is None:
+            # Not among the sounds known at construction; look it up once
+            name = "Unknown Sound"
+            if hasattr(self.sound_manager, 'get_sound'):
+                sound = self.sound_manager.get_sound(sound_id)
+                if sound:
+                    name = sound.name
+            self._sound_names[sound_id] = name
+        return name
+    
+    def add_step(self, sound_id, delay):
+        """Append a step to the macro"""
+        row = len(self.macro.steps)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.macro.add_step(sound_id, delay)
+        self.endInsertRows()
+    
+    def move_step_up(self, row):
+        """Move the step at a row up one place"""
+        if row <= 0 or row >= len(self.macro.steps):
+            return
+        
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), row - 1)
+        self.macro.move_step_up(self.macro.steps[row].id)
+        self._rows.pop(row, None)
+        self._rows.pop(row - 1, None)
+        self.endMoveRows()
+    
+    def move_step_down(self, row):
+        """Move the step at a row down one place"""
+        if row < 0 or row >= len(self.macro.steps) - 1:
+            return
+        
+        # Qt's destination is the row the step is inserted before
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), row + 2)
+        self.macro.move_step_down(self.macro.steps[row].id)
+        self._rows.pop(row, None)
+        self._rows.pop(row + 1, None)
+        self.endMoveRows()
+    
+    def remove_step(self, row):
+        """Remove the step at a row"""
+        if row < 0 or row >= len(self.macro.steps):
+            return
+        
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.macro.remove_step(self.macro.steps[row].id)
+        
+        # Rows after the removed one shift up
+        for cached_row in [r for r in self._rows if r >= row]:
+            del self._rows[cached_row]
+        self.endRemoveRows()
+
+
+class StepActionsDelegate(QStyledItemDelegate):
+    """Delegate painting the move up, move down and delete buttons of a step
+    
+    A single delegate serves every row, replacing three push buttons per row;
+    the buttons are only drawn, so off-screen rows cost nothing.
+    """
+    
+    # Signals
+    action_triggered = pyqtSignal(int, int)  # Row, index into ACTIONS
+    
+    ACTIONS = ("↑", "↓", "×")
+    ACTION_WIDTH = 30
+    MARGIN = 2
+    
+    MOVE_UP, MOVE_DOWN, DELETE = range(3)
+    
+    def _action_rects(self, rect):
+        """Rectangles of the action buttons within a cell"""
+        margin = self.MARGIN
+        width = self.ACTION_WIDTH
+        return [
+            QRect(rect.x() + margin + i * (width + margin), rect.y() + margin,
+                  width, rect.height() - 2 * margin)
+            for i in range(len(self.ACTIONS))
+        ]
+    
+    def paint(self, painter, option, index):
+        """Paint the selection background and the action buttons"""
+        super().paint(painter, option, index)
+        
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        
+        button = QStyleOptionButton()
+        button.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
+        for rect, glyph in zip(self._action_rects(option.rect), self.ACTIONS):
+            button.rect = rect
+            button.text = glyph
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, widget)
+    
+    def sizeHint(self, option, index):
+        """Room for all action buttons"""
+        size = super().sizeHint(option, index)
+        size.setWidth(len(self.ACTIONS) * (self.ACTION_WIDTH + self.MARGIN) + self.MARGIN)
+        return size
+    
+    def editorEvent(self, event, model, option, index):
+        """Trigger the action whose button was clicked"""
+        if event.type() != QEvent.Type.MouseButtonRelease:
+            return False
+        
+        pos = event.position().toPoint()
+        for action, rect in enumerate(self._action_rects(option.rect)):
+            if rect.contains(pos):
+                self.action_triggered.emit(index.row(), action)
+                return True
+        
+        return False
+
+
 class MacroEditorDialog(QDialog):
     """Dialog for creating and editing macros"""
     
+    STEP_ROW_HEIGHT = 28
+    
     def __init__(self, macro_manager, sound_manager, parent=None, macro=None):
         super().__init__(parent)
         self.macro_manager = macro_manager
@@ -44,11 +227,22 @@ class MacroEditorDialog(QDialog):
         # Steps table
         main_layout.addWidget(QLabel("Macro Steps:"))
         
-        self.steps_table = QTableWidget(0, 3)
-        self.steps_table.setHorizontalHeaderLabels(["Sound", "Delay (sec)", "Actions"])
+        self.steps_model = MacroStepsModel(self.macro, self.sound_manager, self)
+        self.actions_delegate = StepActionsDelegate(self)
+        self.actions_delegate.action_triggered.connect(self.on_step_action)
+        
+        self.steps_table = QTableView()
+        self.steps_table.setModel(self.steps_model)
+        self.steps_table.setItemDelegateForColumn(2, self.actions_delegate)
         self.steps_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.steps_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         self.steps_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        
+        # Every row has the same fixed height, so rows are never measured
+        self.steps_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.steps_table.verticalHeader().setDefaultSectionSize(self.STEP_ROW_HEIGHT)
+        self.steps_table.setShowGrid(False)
+        self.steps_table.setWordWrap(False)
         main_layout.addWidget(self.steps_table)
         
         # Add step section
@@ -58,7 +252,9 @@ class MacroEditorDialog(QDialog):
         sound_layout = QHBoxLayout()
         sound_layout.addWidget(QLabel("Sound:"))
         self.sound_combo = QComboBox()
-        self.populate_sound_combo()
+        
+        # Fill the sound list once the dialog has painted
+        QTimer.singleShot(0, self.populate_sound_combo)
         sound_layout.addWidget(self.sound_combo)
         add_layout.addLayout(sound_layout)
         
@@ -95,63 +291,22 @@ class MacroEditorDialog(QDialog):
         button_layout.addWidget(self.cancel_button)
         
         main_layout.addLayout(button_layout)
-        
-        # Load macro steps
-        self.load_steps()
     
     def populate_sound_combo(self):
         """Populate the sound combo box"""
-        self.sound_combo.clear()
-        
         # Add all available sounds
         sounds = self.sound_manager.get_all_sounds() if hasattr(self.sound_manager, 'get_all_sounds') else []
         
+        # Build the items off-view and hand the combo a finished model
+        items = []
         for sound in sounds:
-            self.sound_combo.addItem(sound.name, sound.id)
-    
-    def load_steps(self):
-        """Load macro steps into the table"""
-        self.steps_table.setRowCount(0)
+            item = QStandardItem(sound.name)
+            item.setData(sound.id, Qt.ItemDataRole.UserRole)
+            items.append(item)
         
-        for i, step in enumerate(self.macro.steps):
-            self.steps_table.insertRow(i)
-            
-            # Sound name
-            sound_name = "Unknown Sound"
-            if hasattr(self.sound_manager, 'get_sound'):
-                sound = self.sound_manager.get_sound(step.sound_id)
-                if sound:
-                    sound_name = sound.name
-            
-            sound_item = QTableWidgetItem(sound_name)
-            sound_item.setData(Qt.ItemDataRole.UserRole, step.sound_id)
-            self.steps_table.setItem(i, 0, sound_item)
-            
-            # Delay
-            delay_item = QTableWidgetItem(f"{step.delay:.1f}")
-            self.steps_table.setItem(i, 1, delay_item)
-            
-            # Actions
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(2, 2, 2, 2)
-            
-            up_button = QPushButton("↑")
-            up_button.setFixedWidth(30)
-            up_button.clicked.connect(lambda _, s=step.id: self.on_move_step_up(s))
-            actions_layout.addWidget(up_button)
-            
-            down_button = QPushButton("↓")
-            down_button.setFixedWidth(30)
-            down_button.clicked.connect(lambda _, s=step.id: self.on_move_step_down(s))
-            actions_layout.addWidget(down_button)
-            
-            delete_button = QPushButton("×")
-            delete_button.setFixedWidth(30)
-            delete_button.clicked.connect(lambda _, s=step.id: self.on_delete_step(s))
-            actions_layout.addWidget(delete_button)
-            
-            self.steps_table.setCellWidget(i, 2, actions_widget)
+        model = QStandardItemModel(self.sound_combo)
+        model.invisibleRootItem().appendRows(items)
+        self.sound_combo.setModel(model)
     
     def on_add_step(self):
         """Handle add step button click"""
@@ -163,25 +318,16 @@ class MacroEditorDialog(QDialog):
             return
         
         # Add step to macro
-        self.macro.add_step(sound_id, delay)
-        
-        # Reload steps
-        self.load_steps()
-    
-    def on_move_step_up(self, step_id):
-        """Handle move step up button click"""
-        self.macro.move_step_up(step_id)
-        self.load_steps()
-    
-    def on_move_step_down(self, step_id):
-        """Handle move step down button click"""
-        self.macro.move_step_down(step_id)
-        self.load_steps()
+        self.steps_model.add_step(sound_id, delay)
     
-    def on_delete_step(self, step_id):
-        """Handle delete step button click"""
-        self.macro.remove_step(step_id)
-        self.load_steps()
+    def on_step_action(self, row, action):
+        """Handle a click on one of a step's action glyphs"""
+        if action == StepActionsDelegate.MOVE_UP:
+            self.steps_model.move_step_up(row)
+        elif action == StepActionsDelegate.MOVE_DOWN:
+            self.steps_model.move_step_down(row)
+        elif action == StepActionsDelegate.DELETE:
+            self.steps_model.remove_step(row)
     
     def on_test(self):
         """Handle test macro button click"""
@@ -212,7 +358,8 @@ class MacroEditorDialog(QDialog):
         if self.macro.id not in self.macro_manager.macros:
             self.macro_manager.macros[self.macro.id] = self.macro
         
-        self.macro_manager.save_macros()
+        # Write the files in the background so the dialog closes at once
+        self.macro_manager.save_macros_async()
         
         self.accept()
     
@@ -7,15 +7,12 @@ from PyQt6.QtWidgets import (
     QScrollArea, QGridLayout, QFileDialog, QMessageBox,
     QDialog, QLineEdit, QColorDialog, QSpinBox, QCheckBox
 )
-from PyQt6.QtCore import Qt, QSize, pyqtSignal, QTimer
-from PyQt6.QtGui import QIcon, QFont, QAction
+from PyQt6.QtCore import Qt, QSize, pyqtSignal, QTimer, QEvent
+from PyQt6.QtGui import QIcon, QFont, QAction, QStandardItem, QStandardItemModel
 
 from views.sound_button import SoundButton
 from views.channel_mixer import ChannelMixerView
 from views.ambient_player import AmbientPlayerView
-from views.settings_dialog import SettingsDialog
-from views.sound_editor import SoundEditorDialog
-from views.profile_dialog import ProfileDialog
 from views.sound_search import SoundSearchBar
 
 
@@ -39,6 +36,12 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Thamyris - Soundboard for Roleplaying")
         self.setMinimumSize(800, 600)
         
+        # Channel list currently shown in the channel dropdown
+        self._last_channels = None
+        
+        # Sound editor dialog, created on first edit and reused after
+        self._sound_editor = None
+        
         # Initialize UI components
         self.init_ui()
         
@@ -185,6 +188,7 @@ class MainWindow(QMainWindow):
         self.tab_widget = QTabWidget()
         self.tab_widget.setTabsClosable(True)
         self.tab_widget.tabCloseRequested.connect(self.on_tab_close_requested)
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         
         # Add a default tab
         self.add_tab("General")
@@ -212,7 +216,10 @@ class MainWindow(QMainWindow):
         self.master_volume_slider.valueChanged.connect(self.on_master_volume_changed)
         
     def on_search_changed(self, search_text, tag_filters):
-        """Handle search text or tag filters change"""
+        """Show only the current tab's buttons matching the search
+        
+        The search bar debounces typing, so this runs once per pause.
+        """
         # Get the current tab
         current_index = self.tab_widget.currentIndex()
         if current_index < 0:
@@ -224,26 +231,33 @@ class MainWindow(QMainWindow):
         # Get the tab content widget
         tab_content = scroll.widget()
         
-        # Get all sound buttons in the tab
-        for i in range(tab_content.layout().count()):
-            item = tab_content.layout().itemAt(i)
-            if item and item.widget():
-                button = item.widget()
-                if isinstance(button, SoundButton):
-                    # Check if the button matches the search criteria
-                    sound = button.sound
-                    name_match = not search_text or search_text.lower() in sound.name.lower()
-                    
-                    # Check tag filters
-                    tag_match = True
-                    if tag_filters:
-                        tag_match = any(sound.has_tag(tag) for tag in tag_filters)
-                    
-                    # Show or hide the button based on the search
-                    button.setVisible(name_match and tag_match)
+        # Normalize the criteria once rather than per button
+        search_text = search_text.lower()
+        tag_filters = frozenset(tag.lower().strip() for tag in tag_filters)
+        
+        # Toggle the tab's buttons with a single repaint at the end
+        tab_content.setUpdatesEnabled(False)
+        for button in tab_content.button_list:
+            # Check if the button matches the search criteria
+            name_match = not search_text or search_text in button.name_lower
+            
+            # Check tag filters
+            tag_match = not tag_filters or not tag_filters.isdisjoint(button.sound.tags)
+            
+            # Show or hide the button based on the search
+            button.setVisible(name_match and tag_match)
+        tab_content.setUpdatesEnabled(True)
     
     def add_tab(self, name):
         """Add a new tab with the given name"""
+        # Add the scroll area to the tab widget
+        self.tab_widget.addTab(self._create_tab_page(), name)
+        
+        # Set the new tab as the current tab
+        self.tab_widget.setCurrentIndex(self.tab_widget.count() - 1)
+    
+    def _create_tab_page(self):
+        """Create the scroll area and content widget for a tab"""
         # Create a scroll area for the tab content
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
@@ -251,6 +265,18 @@ class MainWindow(QMainWindow):
         # Create a widget for the tab content
         tab_content = QWidget()
         
+        # Sounds shown in this tab and their buttons, in button order
+        tab_content.sound_list = []
+        tab_content.button_list = []
+        
+        # Set while the tab's buttons have not been built yet; hidden tabs
+        # get their buttons when first shown
+        tab_content.buttons_pending = False
+        
+        # Button columns that fit the tab, kept current by eventFilter
+        tab_content.grid_columns = 1
+        tab_content.installEventFilter(self)
+        
         # Create a grid layout for the sound buttons
         grid_layout = QGridLayout(tab_content)
         grid_layout.setSpacing(10)
@@ -258,37 +284,185 @@ class MainWindow(QMainWindow):
         # Set the tab content as the scroll area's widget
         scroll.setWidget(tab_content)
         
-        # Add the scroll area to the tab widget
-        self.tab_widget.addTab(scroll, name)
-        
-        # Set the new tab as the current tab
-        self.tab_widget.setCurrentIndex(self.tab_widget.count() - 1)
+        return scroll
+    
+    def _create_sound_button(self, sound):
+        """Create a sound button connected to the main window"""
+        button = SoundButton(sound)
+        button.play_clicked.connect(self.on_play_sound)
+        button.edit_clicked.connect(self.on_edit_sound)
+        return button
+    
+    def _grid_columns(self, tab_content):
+        """Get the number of button columns that fit in a tab"""
+        return tab_content.grid_columns
+    
+    def eventFilter(self, obj, event):
+        """Recompute a tab's button columns only when it is resized"""
+        if event.type() == QEvent.Type.Resize and hasattr(obj, 'grid_columns'):
+            obj.grid_columns = max(1, obj.width() // 150)  # Approximate button width + spacing
+        return super().eventFilter(obj, event)
     
     def add_sound_button(self, tab_index, sound):
         """Add a sound button to the specified tab"""
+        self.add_sound_buttons(tab_index, [sound])
+    
+    def add_sound_buttons(self, tab_index, sounds):
+        """Add sound buttons for several sounds to the specified tab
+        
+        The tab is repainted once after all buttons have been placed.
+        """
         # Get the tab's scroll area
         scroll = self.tab_widget.widget(tab_index)
         
         # Get the tab content widget
         tab_content = scroll.widget()
         
+        # Buttons will be built with the rest of the tab when it is shown
+        if tab_content.buttons_pending:
+            tab_content.sound_list.extend(sounds)
+            return
+        
         # Get the grid layout
         grid_layout = tab_content.layout()
         
-        # Calculate the row and column for the new button
+        # Calculate the starting position for the new buttons once
         count = grid_layout.count()
-        cols = max(1, tab_content.width() // 150)  # Approximate button width + spacing
-        row = count // cols
-        col = count % cols
+        cols = self._grid_columns(tab_content)
         
-        # Create a sound button
-        button = SoundButton(sound)
-        button.play_signal.connect(self.on_play_sound)
-        button.stop_signal.connect(self.on_stop_sound)
-        button.edit_signal.connect(self.on_edit_sound)
+        tab_content.setUpdatesEnabled(False)
+        for i, sound in enumerate(sounds, count):
+            # Create a sound button
+            button = self._create_sound_button(sound)
+            
+            # Add the button to the grid layout
+            grid_layout.addWidget(button, i // cols, i % cols)
+            tab_content.sound_list.append(sound)
+            tab_content.button_list.append(button)
+        tab_content.setUpdatesEnabled(True)
+        tab_content.updateGeometry()
+    
+    def sync_tabs(self, tabs):
+        """Make the tabs match a list of profile tabs
+        
+        Existing tab pages and sound buttons are reused where possible
+        instead of tearing the whole UI down and rebuilding it.
+        """
+        current = [
+            (self.tab_widget.tabText(i), self.tab_widget.widget(i))
+            for i in range(self.tab_widget.count())
+        ]
+        
+        # Only reorder the tab widget if the tab names differ
+        if [name for name, _ in current] != [tab.name for tab in tabs]:
+            # Pages available for reuse, by tab name
+            pages = {}
+            for name, scroll in current:
+                pages.setdefault(name, []).append(scroll)
+            
+            # Removing tabs does not delete their pages
+            self.tab_widget.clear()
+            
+            for tab in tabs:
+                reusable = pages.get(tab.name)
+                if reusable:
+                    self.tab_widget.addTab(reusable.pop(0), tab.name)
+                else:
+                    self.add_tab(tab.name)
+            
+            # Delete the pages that were not reused
+            for scrolls in pages.values():
+                for scroll in scrolls:
+                    scroll.deleteLater()
+        
+        # Update the sounds in each tab
+        for tab_index, tab in enumerate(tabs):
+            self.sync_tab_to_sounds(tab_index, tab.sounds)
+    
+    def sync_tab_to_sounds(self, tab_index, sounds):
+        """Make a tab's sound buttons match a list of sounds
+        
+        Buttons for sounds with the same file are reused, so only added or
+        removed sounds create or delete widgets. Tabs that are not shown
+        only record their sounds; their buttons are built by on_tab_changed.
+        """
+        tab_content = self.tab_widget.widget(tab_index).widget()
+        
+        if tab_index != self.tab_widget.currentIndex():
+            tab_content.sound_list = list(sounds)
+            tab_content.buttons_pending = True
+            return
+        
+        self._build_tab_buttons(tab_content, sounds)
+    
+    def on_tab_changed(self, index):
+        """Build the buttons of a tab the first time it is shown"""
+        if index < 0:
+            return
         
-        # Add the button to the grid layout
-        grid_layout.addWidget(button, row, col)
+        tab_content = self.tab_widget.widget(index).widget()
+        if tab_content.buttons_pending:
+            self._build_tab_buttons(tab_content, tab_content.sound_list)
+    
+    def _build_tab_buttons(self, tab_content, sounds):
+        """Make a tab's sound buttons match a list of sounds"""
+        grid_layout = tab_content.layout()
+        tab_content.buttons_pending = False
+        
+        # Repaint once after the whole tab has been laid out
+        tab_content.setUpdatesEnabled(False)
+        
+        # Buttons available for reuse, by file path
+        buttons_by_path = {}
+        for button in tab_content.button_list:
+            buttons_by_path.setdefault(button.sound.file_path, []).append(button)
+        
+        buttons = []
+        for sound in sounds:
+            reusable = buttons_by_path.get(sound.file_path)
+            if reusable:
+                button = reusable.pop(0)
+                if button.sound != sound:
+                    button.set_sound(sound)
+                else:
+                    # Equal but maybe a different object; bind the one the
+                    # tab's sound list holds so edits reach it
+                    button.sound = sound
+            else:
+                button = self._create_sound_button(sound)
+            buttons.append(button)
+        
+        # Delete the buttons that were not reused
+        for leftovers in buttons_by_path.values():
+            for button in leftovers:
+                grid_layout.removeWidget(button)
+                button.deleteLater()
+        
+        # Lay the buttons out again in the new order
+        for button in tab_content.button_list:
+            grid_layout.removeWidget(button)
+        
+        cols = self._grid_columns(tab_content)
+        for i, button in enumerate(buttons):
+            grid_layout.addWidget(button, i // cols, i % cols)
+        
+        tab_content.sound_list = list(sounds)
+        tab_content.button_list = buttons
+        
+        tab_content.setUpdatesEnabled(True)
+        tab_content.updateGeometry()
+    
+    def set_master_volume(self, volume):
+        """Show a master volume without echoing it back as a change
+        
+        Slider signals are blocked so programmatic updates are not emitted
+        as master_volume_changed_signal.
+        """
+        value = int(volume * 100)
+        self.master_volume_slider.blockSignals(True)
+        self.master_volume_slider.setValue(value)
+        self.master_volume_slider.blockSignals(False)
+        self.master_volume_label.setText(f"{value}%")
     
     def on_master_volume_changed(self, value):
         """Handle master volume slider change"""
@@ -335,15 +509,29 @@ class MainWindow(QMainWindow):
         # Emit signal to stop all sounds
         self.stop_all_sounds_signal.emit()
     
+    def _get_sound_editor(self, sound):
+        """Get the shared sound editor dialog, filled in for a sound"""
+        if self._sound_editor is None:
+            # Create the dialog on first use, loading its module then
+            from views.sound_editor import SoundEditorDialog
+            self._sound_editor = SoundEditorDialog(parent=self)
+        
+        self._sound_editor.set_sound(sound)
+        return self._sound_editor
+    
     def on_edit_sound(self, sound, button):
         """Handle edit sound button click"""
-        # Create a sound editor dialog
-        dialog = SoundEditorDialog(sound, self)
+        # Reuse the sound editor dialog for this sound
+        dialog = self._get_sound_editor(sound)
         
         # Show the dialog
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            # Get the edited sound
-            edited_sound = dialog.get_sound()
+            # Apply the edits to the button's sound
+            edited_sound = dialog.apply_edits()
+            
+            # Keep the tab's sound list pointing at the edited sound
+            tab_content = button.parentWidget()
+            tab_content.sound_list[tab_content.button_list.index(button)] = edited_sound
             
             # Update the button
             button.set_sound(edited_sound)
@@ -397,8 +585,8 @@ class MainWindow(QMainWindow):
             file_path=file_path
         )
         
-        # Create a sound editor dialog
-        dialog = SoundEditorDialog(sound, self)
+        # Reuse the sound editor dialog for this sound
+        dialog = self._get_sound_editor(sound)
         
         # Show the dialog
         if dialog.exec() == QDialog.DialogCode.Accepted:
@@ -430,7 +618,8 @@ class MainWindow(QMainWindow):
     
     def on_open_profile(self):
         """Handle open profile action"""
-        # Create a profile dialog
+        # Create a profile dialog, loading the module on first use
+        from views.profile_dialog import ProfileDialog
         dialog = ProfileDialog(self, mode=ProfileDialog.Mode.OPEN)
         
         # Show the dialog
@@ -454,7 +643,8 @@ class MainWindow(QMainWindow):
     
     def on_save_profile_as(self):
         """Handle save profile as action"""
-        # Create a profile dialog
+        # Create a profile dialog, loading the module on first use
+        from views.profile_dialog import ProfileDialog
         dialog = ProfileDialog(self, mode=ProfileDialog.Mode.SAVE)
         
         # Show the dialog
@@ -470,7 +660,8 @@ class MainWindow(QMainWindow):
     
     def on_settings(self):
         """Handle settings action"""
-        # Create a settings dialog
+        # Create a settings dialog, loading the module on first use
+        from views.settings_dialog import SettingsDialog
         dialog = SettingsDialog(self)
         
         # Show the dialog
@@ -488,7 +679,20 @@ class MainWindow(QMainWindow):
     
     def update_channel_list(self, channels):
         """Update the voice channel dropdown list"""
-        self.channel_combo.clear()
+        # The bot hands out the same list until guild state changes
+        if channels is self._last_channels:
+            return
+        self._last_channels = channels
         
+        # Build the items off-view and hand the combo a finished model
+        items = []
         for channel in channels:
-            self.channel_combo.addItem(f"{channel['server']} - {channel['name']}", channel['id'])
+            item = QStandardItem(f"{channel['guild']} - {channel['name']}")
+            item.setData(channel['id'], Qt.ItemDataRole.UserRole)
+            items.append(item)
+        
+        model = QStandardItemModel(self.channel_combo)
+        model.invisibleRootItem().appendRows(items)
+        
+        # The combo owns the previous model and deletes it itself
+        self.channel_combo.setModel(model)
@@ -3,12 +3,158 @@ Profile dialog - Dialog for profile management
 """
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-    QLineEdit, QListWidget, QPushButton, QMessageBox,
-    QFileDialog, QListWidgetItem, QInputDialog
+    QLineEdit, QListView, QPushButton, QMessageBox,
+    QFileDialog, QInputDialog, QProgressDialog
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QAbstractListModel, QModelIndex
 
+import concurrent.futures
 import os
+import threading
+
+from models.filenames import sanitize_filename
+
+# Profile import and export copies run here, off the GUI thread
+_copy_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='profile-copy')
+
+# Enum members resolved once; the roles are compared on every data() call
+_DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+_USER_ROLE = Qt.ItemDataRole.UserRole
+_YES = QMessageBox.StandardButton.Yes
+_NO = QMessageBox.StandardButton.No
+_OK = QMessageBox.StandardButton.Ok
+_YES_NO = _YES | _NO
+
+COPY_CHUNK_SIZE = 1 << 20  # Bytes copied between progress reports
+
+
+class _CopyCancelled(Exception):
+    """Raised on the copy thread when the user cancels a copy"""
+
+
+def _copy_with_progress(source_path, target_path, progress, cancelled):
+    """Copy a file in chunks, reporting progress and honouring cancellation
+    
+    The copy is written beside the target and only replaces it once
+    complete, so a cancelled or failed copy leaves an existing target intact.
+    
+    Args:
+        source_path: File to copy
+        target_path: Destination file
+        progress: Called with (bytes copied, total bytes) after each chunk
+        cancelled: threading.Event set when the copy should stop
+    """
+    # Copying a file onto itself would only truncate it
+    if os.path.exists(target_path) and os.path.samefile(source_path, target_path):
+        raise ValueError(f"Cannot copy '{source_path}' onto itself")
+    
+    total = os.path.getsize(source_path)
+    done = 0
+    temp_path = target_path + '.tmp'
+    
+    try:
+        with open(source_path, 'rb') as source, open(temp_path, 'wb') as target:
+            while True:
+                if cancelled.is_set():
+                    raise _CopyCancelled()
+                
+                chunk = source.read(COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                
+                target.write(chunk)
+                done += len(chunk)
+                progress(done, total)
+        
+        os.replace(temp_path, target_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ProfileListModel(QAbstractListModel):
+    """List model over the profile dicts from get_available_profiles
+    
+    Updates keep the current rows and only remove and append the profiles
+    that changed; a placeholder message is shown as a single unselectable
+    row when there are no profiles.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._profiles = []
+        self._placeholder = None
+    
+    def set_profiles(self, profiles, placeholder=None):
+        """Replace the listed profiles
+        
+        Args:
+            profiles: Dictionaries with 'name' and 'path' keys; the model
+                may keep and modify this list
+            placeholder: Message shown when there are no profiles
+        """
+        # The placeholder row comes and goes with an empty list; reset then
+        if not self._profiles or not profiles:
+            self.beginResetModel()
+            self._profiles = profiles
+            self._placeholder = placeholder
+            self.endResetModel()
+            return
+        
+        self._placeholder = placeholder
+        
+        # Otherwise remove and insert only the rows that changed, so the
+        # view keeps its selection and relays out just those rows
+        new_paths = {profile['path'] for profile in profiles}
+        for row in range(len(self._profiles) - 1, -1, -1):
+            if self._profiles[row]['path'] not in new_paths:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._profiles[row]
+                self.endRemoveRows()
+        
+        current_paths = {profile['path'] for profile in self._profiles}
+        added = [profile for profile in profiles if profile['path'] not in current_paths]
+        if added:
+            first = len(self._profiles)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            self._profiles.extend(added)
+            self.endInsertRows()
+    
+    def has_path(self, path: str) -> bool:
+        """Check whether a profile file is in the listed profiles"""
+        return any(profile['path'] == path for profile in self._profiles)
+    
+    def rowCount(self, parent=QModelIndex()):
+        """Number of profiles, or one row for the placeholder"""
+        if parent.isValid():
+            return 0
+        if self._profiles:
+            return len(self._profiles)
+        return 1 if self._placeholder else 0
+    
+    def data(self, index, role=_DISPLAY_ROLE):
+        """Profile name for display and its path under UserRole"""
+        if not index.isValid():
+            return None
+        
+        if not self._profiles:
+            return self._placeholder if role == _DISPLAY_ROLE else None
+        
+        profile = self._profiles[index.row()]
+        if role == _DISPLAY_ROLE:
+            return profile['name']
+        if role == _USER_ROLE:
+            return profile['path']
+        return None
+    
+    def flags(self, index):
+        """Profiles are selectable; the placeholder row is not"""
+        if not self._profiles:
+            return Qt.ItemFlag.NoItemFlags
+        return super().flags(index)
 
 
 class ProfileDialog(QDialog):
@@ -16,10 +162,15 @@ class ProfileDialog(QDialog):
     
     # Signals
     load_profile_signal = pyqtSignal(str)  # Profile path
+    copy_finished = pyqtSignal(bool, str, str)  # Import (True) or export, profile name, error ('' on success)
+    copy_progress = pyqtSignal(int, int)  # Bytes copied, total bytes
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.profile_manager = parent.profile_manager if hasattr(parent, 'profile_manager') else None
+        self.copy_finished.connect(self.on_copy_finished)
+        self.copy_progress.connect(self.on_copy_progress)
+        self._progress_dialog = None  # Shown while a copy runs
         self.init_ui()
     
     def init_ui(self):
@@ -36,8 +187,10 @@ class ProfileDialog(QDialog):
         # Profile list
         main_layout.addWidget(QLabel("Available Profiles:"))
         
-        self.profile_list = QListWidget()
-        self.profile_list.itemDoubleClicked.connect(self.on_profile_double_clicked)
+        self.profile_model = ProfileListModel(self)
+        self.profile_list = QListView()
+        self.profile_list.setModel(self.profile_model)
+        self.profile_list.doubleClicked.connect(self.on_profile_double_clicked)
         self.profile_list.setAlternatingRowColors(True)
         main_layout.addWidget(self.profile_list)
         
@@ -79,24 +232,26 @@ class ProfileDialog(QDialog):
     
     def load_profiles(self):
         """Load profiles from the profiles directory"""
-        self.profile_list.clear()
-        
         if not self.profile_manager:
-            self.profile_list.addItem("No profile manager available")
+            self.profile_model.set_profiles([], "No profile manager available")
             return
         
         profiles = self.profile_manager.get_available_profiles()
+        self.profile_model.set_profiles(profiles, "No profiles available")
+    
+    def _selected_profile(self):
+        """Get the (name, path) of the selected profile, or None"""
+        index = self.profile_list.currentIndex()
+        if not index.isValid():
+            return None
         
-        if not profiles:
-            self.profile_list.addItem("No profiles available")
-            return
+        profile_path = index.data(_USER_ROLE)
+        if profile_path is None:
+            return None
         
-        for profile in profiles:
-            item = QListWidgetItem(profile['name'])
-            item.setData(Qt.ItemDataRole.UserRole, profile['path'])
-            self.profile_list.addItem(item)
+        return index.data(_DISPLAY_ROLE), profile_path
     
-    def on_profile_double_clicked(self, item):
+    def on_profile_double_clicked(self, index):
         """Handle profile double click"""
         self.load_selected_profile()
     
@@ -108,38 +263,53 @@ class ProfileDialog(QDialog):
             # Create a new profile
             if self.profile_manager:
                 # Create a safe filename
-                safe_name = self.profile_manager._sanitize_filename(name)
+                safe_name = sanitize_filename(name)
                 profile_path = os.path.join(self.profile_manager.profiles_directory, f"{safe_name}.profile")
                 
-                # Check if profile already exists
-                if os.path.exists(profile_path):
-                    reply = QMessageBox.question(
-                        self, "Profile Exists",
-                        f"Profile '{name}' already exists. Overwrite?",
-                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                        QMessageBox.StandardButton.No
-                    )
-                    
-                    if reply != QMessageBox.StandardButton.Yes:
-                        return
+                if not self._confirm_overwrite(profile_path, name):
+                    return
                 
                 # Signal to create a new profile
                 self.load_profile_signal.emit(profile_path)
                 self.accept()
     
+    def _confirm_overwrite(self, path: str, name: str) -> bool:
+        """Ask before replacing an existing profile
+        
+        Checks against the listed profiles rather than stat the file,
+        which can block on a network-mounted profiles directory.
+        
+        Args:
+            path: Profile file that would be written
+            name: Profile name shown in the prompt
+        
+        Returns:
+            True if the profile is new or the user agreed to overwrite it
+        """
+        if not self.profile_model.has_path(path):
+            return True
+        
+        reply = QMessageBox.question(
+            self, "Profile Exists",
+            f"Profile '{name}' already exists. Overwrite?",
+            _YES_NO,
+            _NO
+        )
+        return reply == _YES
+    
     def on_load(self):
         """Handle load button click"""
         self.load_selected_profile()
     
     def on_save(self):
         """Handle save button click"""
-        current_item = self.profile_list.currentItem()
-        if not current_item:
+        selected = self._selected_profile()
+        if not selected:
             # No profile selected, prompt for a new name
             self.on_new()
             return
         
-        profile_path = current_item.data(Qt.ItemDataRole.UserRole)
+        _, profile_path = selected
         
         # Signal to save the current profile
         self.load_profile_signal.emit(profile_path)
@@ -147,35 +317,34 @@ class ProfileDialog(QDialog):
     
     def on_delete(self):
         """Handle delete button click"""
-        current_item = self.profile_list.currentItem()
-        if not current_item:
+        selected = self._selected_profile()
+        if not selected:
             QMessageBox.warning(self, "No Selection", "Please select a profile to delete.")
             return
         
-        profile_name = current_item.text()
-        profile_path = current_item.data(Qt.ItemDataRole.UserRole)
+        profile_name, profile_path = selected
         
         reply = QMessageBox.question(
             self, "Confirm Delete",
             f"Are you sure you want to delete the profile '{profile_name}'?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-            QMessageBox.StandardButton.No
+            _YES_NO,
+            _NO
         )
         
-        if reply == QMessageBox.StandardButton.Yes:
+        if reply == _YES:
             if self.profile_manager and self.profile_manager.delete_profile(profile_path):
                 # Reload profiles
                 self.load_profiles()
                 QMessageBox.information(
                     self, "Delete Successful",
                     f"Profile '{profile_name}' deleted successfully.",
-                    QMessageBox.StandardButton.Ok
+                    _OK
                 )
             else:
                 QMessageBox.critical(
                     self, "Error",
                     f"Failed to delete profile '{profile_name}'.",
-                    QMessageBox.StandardButton.Ok
+                    _OK
                 )
     
     def on_import(self):
@@ -195,53 +364,33 @@ class ProfileDialog(QDialog):
                 QMessageBox.critical(
                     self, "Error",
                     "No profile manager available.",
-                    QMessageBox.StandardButton.Ok
+                    _OK
                 )
                 return
             
             # Copy the file to the profiles directory
-            import shutil
             dest_path = os.path.join(self.profile_manager.profiles_directory, f"{profile_name}.profile")
             
-            # Check if profile already exists
-            if os.path.exists(dest_path):
-                reply = QMessageBox.question(
-                    self, "Profile Exists",
-                    f"Profile '{profile_name}' already exists. Overwrite?",
-                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                    QMessageBox.StandardButton.No
-                )
-                
-                if reply != QMessageBox.StandardButton.Yes:
-                    return
+            if not self._confirm_overwrite(dest_path, profile_name):
+                return
             
             # Copy the file
-            shutil.copy2(file_path, dest_path)
-            
-            # Reload profiles
-            self.load_profiles()
-            
-            QMessageBox.information(
-                self, "Import Successful",
-                f"Profile '{profile_name}' imported successfully.",
-                QMessageBox.StandardButton.Ok
-            )
+            self._copy_in_background(True, profile_name, file_path, dest_path)
         except Exception as e:
             QMessageBox.critical(
                 self, "Error",
                 f"Failed to import profile: {e}",
-                QMessageBox.StandardButton.Ok
+                _OK
             )
     
     def on_export(self):
         """Handle export button click"""
-        current_item = self.profile_list.currentItem()
-        if not current_item:
+        selected = self._selected_profile()
+        if not selected:
             QMessageBox.warning(self, "No Selection", "Please select a profile to export.")
             return
         
-        profile_name = current_item.text()
-        profile_path = current_item.data(Qt.ItemDataRole.UserRole)
+        profile_name, profile_path = selected
         
         # Get export location
         export_path, _ = QFileDialog.getSaveFileName(
@@ -251,31 +400,94 @@ class ProfileDialog(QDialog):
         if not export_path:
             return
         
-        try:
-            # Copy the file
-            import shutil
-            shutil.copy2(profile_path, export_path)
+        # Copy the file
+        self._copy_in_background(False, profile_name, profile_path, export_path)
+    
+    def _copy_in_background(self, is_import, profile_name, source_path, target_path):
+        """Copy a profile file on the copy thread and report via copy_finished
+        
+        A progress dialog appears if the copy takes more than a moment;
+        cancelling it stops the copy and leaves any existing file untouched.
+        """
+        cancelled = threading.Event()
+        
+        # A cancelled copy leaves its dialog behind; drop it
+        if self._progress_dialog is not None:
+            self._progress_dialog.deleteLater()
+        
+        action = "Importing" if is_import else "Exporting"
+        self._progress_dialog = QProgressDialog(f"{action} profile '{profile_name}'...", "Cancel", 0, 100, self)
+        self._progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self._progress_dialog.setMinimumDuration(500)
+        self._progress_dialog.canceled.connect(cancelled.set)
+        
+        def report_progress(done, total):
+            # Called on the copy thread; the signal delivers on the GUI thread
+            try:
+                self.copy_progress.emit(done, total)
+            except RuntimeError:
+                cancelled.set()  # The dialog was closed, stop copying
+        
+        future = _copy_pool.submit(_copy_with_progress, source_path, target_path, report_progress, cancelled)
+        
+        def on_done(future):
+            try:
+                future.result()
+                error = ''
+            except _CopyCancelled:
+                return  # The user cancelled; nothing to report
+            except Exception as e:
+                error = str(e) or type(e).__name__
             
-            QMessageBox.information(
-                self, "Export Successful",
-                f"Profile '{profile_name}' exported successfully.",
-                QMessageBox.StandardButton.Ok
-            )
-        except Exception as e:
+            # Emitted from the copy thread; delivered on the GUI thread
+            try:
+                self.copy_finished.emit(is_import, profile_name, error)
+            except RuntimeError:
+                pass  # The dialog was closed before the copy finished
+        
+        future.add_done_callback(on_done)
+    
+    def on_copy_progress(self, done, total):
+        """Show the progress of the running copy"""
+        if self._progress_dialog is not None and not self._progress_dialog.wasCanceled():
+            self._progress_dialog.setValue(done * 100 // total if total else 100)
+    
+    def on_copy_finished(self, is_import, profile_name, error):
+        """Report a finished import or export"""
+        if self._progress_dialog is not None:
+            self._progress_dialog.reset()
+            self._progress_dialog.deleteLater()
+            self._progress_dialog = None
+        
+        action = "import" if is_import else "export"
+        
+        if error:
             QMessageBox.critical(
                 self, "Error",
-                f"Failed to export profile: {e}",
-                QMessageBox.StandardButton.Ok
+                f"Failed to {action} profile: {error}",
+                _OK
             )
+            return
+        
+        if is_import:
+            # Reload profiles
+            self.profile_manager.invalidate_available_profiles()
+            self.load_profiles()
+        
+        QMessageBox.information(
+            self, f"{action.capitalize()} Successful",
+            f"Profile '{profile_name}' {action}ed successfully.",
+            _OK
+        )
     
     def load_selected_profile(self):
         """Load the selected profile"""
-        current_item = self.profile_list.currentItem()
-        if not current_item:
+        selected = self._selected_profile()
+        if not selected:
             QMessageBox.warning(self, "No Selection", "Please select a profile to load.")
             return
         
-        profile_path = current_item.data(Qt.ItemDataRole.UserRole)
+        _, profile_path = selected
         
         self.load_profile_signal.emit(profile_path)
         self.accept()
@@ -3,20 +3,32 @@ Settings dialog - Dialog for application settings
 """
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-    QComboBox, QSpinBox, QFontComboBox, QPushButton,
-    QGroupBox, QTabWidget
+    QComboBox, QSpinBox, QPushButton,
+    QGroupBox, QTabWidget, QWidget
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QStringListModel
+from PyQt6.QtGui import QFont, QFontDatabase, QFontInfo
 
 from models.settings import Settings, Theme
 
 
+# Font families, listed once per process and shared by every settings dialog
+_font_model = None
+
+
+def _get_font_model() -> QStringListModel:
+    """Get the shared model of installed font families"""
+    global _font_model
+    if _font_model is None:
+        _font_model = QStringListModel(QFontDatabase.families())
+    return _font_model
+
+
 class SettingsDialog(QDialog):
     """Dialog for application settings"""
     
     # Signals
-    settings_changed = pyqtSignal(object)  # Settings object
+    settings_changed = pyqtSignal(object, set)  # Settings object, names of the changed fields
     
     def __init__(self, parent=None, settings=None):
         super().__init__(parent)
@@ -30,12 +42,49 @@ class SettingsDialog(QDialog):
         
         main_layout = QVBoxLayout(self)
         
-        # Create tab widget
-        tab_widget = QTabWidget()
-        main_layout.addWidget(tab_widget)
+        # Create tab widget; each tab's contents are built the first time it is shown
+        self.tab_widget = QTabWidget()
+        self.tab_widget.addTab(QWidget(), "Appearance")
+        self.tab_widget.addTab(QWidget(), "Audio")
+        self._tab_built = [False, False]
+        self.tab_widget.currentChanged.connect(self._ensure_tab_built)
+        main_layout.addWidget(self.tab_widget)
+        
+        # Build the visible tab once the dialog is up, so the first font
+        # enumeration does not delay the dialog's first paint
+        QTimer.singleShot(0, lambda: self._ensure_tab_built(self.tab_widget.currentIndex()))
+        
+        # Button box
+        button_box = QHBoxLayout()
+        
+        self.ok_button = QPushButton("OK")
+        self.ok_button.clicked.connect(self.accept)
+        button_box.addWidget(self.ok_button)
+        
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.reject)
+        button_box.addWidget(self.cancel_button)
         
-        # Appearance tab
-        appearance_tab = QWidget()
+        main_layout.addLayout(button_box)
+    
+    def _ensure_tab_built(self, index: int):
+        """Build a tab's contents if they have not been built yet
+        
+        Args:
+            index: Index of the tab in the tab widget
+        """
+        if index < 0 or self._tab_built[index]:
+            return
+        
+        self._tab_built[index] = True
+        tab = self.tab_widget.widget(index)
+        if index == 0:
+            self._build_appearance_tab(tab)
+        else:
+            self._build_audio_tab(tab)
+    
+    def _build_appearance_tab(self, appearance_tab: QWidget):
+        """Build the theme and font controls"""
         appearance_layout = QVBoxLayout(appearance_tab)
         
         # Theme
@@ -59,8 +108,14 @@ class SettingsDialog(QDialog):
         font_layout = QHBoxLayout()
         font_layout.addWidget(QLabel("Font:"))
         
-        self.font_combo = QFontComboBox()
-        self.font_combo.setCurrentFont(QFont(self.settings.font_family))
+        # A plain combo over the shared model; QFontComboBox would enumerate
+        # the installed fonts again for every dialog
+        self.font_combo = QComboBox()
+        self.font_combo.setModel(_get_font_model())
+        
+        # Select the family the saved font actually resolves to
+        family = QFontInfo(QFont(self.settings.font_family)).family()
+        self.font_combo.setCurrentIndex(self.font_combo.findText(family))
         font_layout.addWidget(self.font_combo)
         
         font_layout.addWidget(QLabel("Size:"))
@@ -71,12 +126,9 @@ class SettingsDialog(QDialog):
         font_layout.addWidget(self.font_size_spin)
         
         appearance_layout.addLayout(font_layout)
-        
-        # Add appearance tab
-        tab_widget.addTab(appearance_tab, "Appearance")
-        
-        # Audio tab
-        audio_tab = QWidget()
+    
+    def _build_audio_tab(self, audio_tab: QWidget):
+        """Build the default volume and fade controls"""
         audio_layout = QVBoxLayout(audio_tab)
         
         # Default volumes
@@ -87,10 +139,7 @@ class SettingsDialog(QDialog):
         master_layout = QHBoxLayout()
         master_layout.addWidget(QLabel("Master:"))
         
-        self.master_volume_spin = QSpinBox()
-        self.master_volume_spin.setRange(0, 100)
-        self.master_volume_spin.setSuffix("%")
-        self.master_volume_spin.setValue(int(self.settings.master_volume * 100))
+        self.master_volume_spin = self._make_volume_spin(self.settings.master_volume)
         master_layout.addWidget(self.master_volume_spin)
         
         volumes_layout.addLayout(master_layout)
@@ -99,10 +148,7 @@ class SettingsDialog(QDialog):
         ambient_layout = QHBoxLayout()
         ambient_layout.addWidget(QLabel("Ambient:"))
         
-        self.ambient_volume_spin = QSpinBox()
-        self.ambient_volume_spin.setRange(0, 100)
-        self.ambient_volume_spin.setSuffix("%")
-        self.ambient_volume_spin.setValue(int(self.settings.ambient_volume * 100))
+        self.ambient_volume_spin = self._make_volume_spin(self.settings.ambient_volume)
         ambient_layout.addWidget(self.ambient_volume_spin)
         
         volumes_layout.addLayout(ambient_layout)
@@ -111,10 +157,7 @@ class SettingsDialog(QDialog):
         effects_layout = QHBoxLayout()
         effects_layout.addWidget(QLabel("Effects:"))
         
-        self.effects_volume_spin = QSpinBox()
-        self.effects_volume_spin.setRange(0, 100)
-        self.effects_volume_spin.setSuffix("%")
-        self.effects_volume_spin.setValue(int(self.settings.effects_volume * 100))
+        self.effects_volume_spin = self._make_volume_spin(self.settings.effects_volume)
         effects_layout.addWidget(self.effects_volume_spin)
         
         volumes_layout.addLayout(effects_layout)
@@ -129,11 +172,7 @@ class SettingsDialog(QDialog):
         fade_in_layout = QHBoxLayout()
         fade_in_layout.addWidget(QLabel("Default Fade In:"))
         
-        self.fade_in_spin = QSpinBox()
-        self.fade_in_spin.setRange(0, 10000)
-        self.fade_in_spin.setSuffix(" ms")
-        self.fade_in_spin.setSingleStep(100)
-        self.fade_in_spin.setValue(self.settings.fade_in_duration)
+        self.fade_in_spin = self._make_ms_spin(self.settings.fade_in_duration)
         fade_in_layout.addWidget(self.fade_in_spin)
         
         fade_layout.addLayout(fade_in_layout)
@@ -142,47 +181,58 @@ class SettingsDialog(QDialog):
         fade_out_layout = QHBoxLayout()
         fade_out_layout.addWidget(QLabel("Default Fade Out:"))
         
-        self.fade_out_spin = QSpinBox()
-        self.fade_out_spin.setRange(0, 10000)
-        self.fade_out_spin.setSuffix(" ms")
-        self.fade_out_spin.setSingleStep(100)
-        self.fade_out_spin.setValue(self.settings.fade_out_duration)
+        self.fade_out_spin = self._make_ms_spin(self.settings.fade_out_duration)
         fade_out_layout.addWidget(self.fade_out_spin)
         
         fade_layout.addLayout(fade_out_layout)
         
         audio_layout.addWidget(fade_group)
-        
-        # Add audio tab
-        tab_widget.addTab(audio_tab, "Audio")
-        
-        # Button box
-        button_box = QHBoxLayout()
-        
-        self.ok_button = QPushButton("OK")
-        self.ok_button.clicked.connect(self.accept)
-        button_box.addWidget(self.ok_button)
-        
-        self.cancel_button = QPushButton("Cancel")
-        self.cancel_button.clicked.connect(self.reject)
-        button_box.addWidget(self.cancel_button)
-        
-        main_layout.addLayout(button_box)
+    
+    @staticmethod
+    def _make_volume_spin(volume: float) -> QSpinBox:
+        """Create a 0-100% spin box showing a 0.0-1.0 volume"""
+        spin = QSpinBox()
+        spin.setRange(0, 100)
+        spin.setSuffix("%")
+        spin.setValue(round(volume * 100))
+        return spin
+    
+    @staticmethod
+    def _make_ms_spin(duration: int) -> QSpinBox:
+        """Create a 0-10000 ms spin box stepping by 100 ms"""
+        spin = QSpinBox()
+        spin.setRange(0, 10000)
+        spin.setSuffix(" ms")
+        spin.setSingleStep(100)
+        spin.setValue(duration)
+        return spin
     
     def accept(self):
         """Handle OK button click"""
-        # Update settings
-        self.settings.theme = Theme(self.theme_combo.currentData())
-        self.settings.font_family = self.font_combo.currentFont().family()
-        self.settings.font_size = self.font_size_spin.value()
-        self.settings.master_volume = self.master_volume_spin.value() / 100.0
-        self.settings.ambient_volume = self.ambient_volume_spin.value() / 100.0
-        self.settings.effects_volume = self.effects_volume_spin.value() / 100.0
-        self.settings.fade_in_duration = self.fade_in_spin.value()
-        self.settings.fade_out_duration = self.fade_out_spin.value()
-        
-        # Emit signal
-        self.settings_changed.emit(self.settings)
+        # Read values from the tabs that were built; the others are unchanged
+        values = {}
+        if self._tab_built[0]:
+            values['theme'] = Theme(self.theme_combo.currentData())
+            if self.font_combo.currentIndex() >= 0:
+                values['font_family'] = self.font_combo.currentText()
+            values['font_size'] = self.font_size_spin.value()
+        if self._tab_built[1]:
+            values['master_volume'] = self.master_volume_spin.value() / 100.0
+            values['ambient_volume'] = self.ambient_volume_spin.value() / 100.0
+            values['effects_volume'] = self.effects_volume_spin.value() / 100.0
+            values['fade_in_duration'] = self.fade_in_spin.value()
+            values['fade_out_duration'] = self.fade_out_spin.value()
+        
+        # Update only the settings that differ
+        changed = set()
+        for field, value in values.items():
+            if getattr(self.settings, field) != value:
+                setattr(self.settings, field, value)
+                changed.add(field)
+        
+        # Emit signal only when something changed, naming what did
+        if changed:
+            self.settings_changed.emit(self.settings, changed)
         
         # Close dialog
         super().accept()
@@ -1,13 +1,36 @@
 """
 Sound button view - A button for playing sounds
 """
-from PyQt6.QtWidgets import QPushButton, QMenu, QAction, QSizePolicy
+import functools
+
+from PyQt6.QtWidgets import QPushButton, QMenu, QSizePolicy
 from PyQt6.QtCore import Qt, pyqtSignal, QSize
-from PyQt6.QtGui import QIcon, QFont
+from PyQt6.QtGui import QIcon, QFont, QAction, QColor
 
 from models.sound import Sound, PlaybackMode
 
 
+@functools.lru_cache(maxsize=64)
+def _stylesheet_for_color(color: str) -> str:
+    """Build the stylesheet for a sound colour, memoized per colour
+    
+    A widget's own stylesheet outranks the application's, so the sound
+    colour survives every theme, including while hovered or pressed.
+    
+    Args:
+        color: Sound colour name, such as '#aa2222'
+    
+    Returns:
+        The stylesheet
+    """
+    base = QColor(color)
+    return (
+        f"QPushButton {{ background-color: {base.name()}; color: white; }}"
+        f" QPushButton:hover {{ background-color: {base.lighter(125).name()}; }}"
+        f" QPushButton:pressed {{ background-color: {base.darker(125).name()}; }}"
+    )
+
+
 class SoundButton(QPushButton):
     """Button for playing sounds with context menu for editing"""
     
@@ -16,73 +39,100 @@ class SoundButton(QPushButton):
     edit_clicked = pyqtSignal(object, object)  # Emits the Sound object and button reference
     delete_clicked = pyqtSignal(object, object)  # Emits the Sound object and button reference
     
+    # Bold font shared by all buttons, created once a QApplication exists
+    _bold_font = None
+    
     def __init__(self, sound: Sound, parent=None):
         super().__init__(parent)
         self.sound = sound
+        self._menu = None  # Context menu, built on the first right-click
+        self._stylesheet = None  # Last stylesheet set, so unchanged colours skip the reparse
         self.init_ui()
     
     def init_ui(self):
-        """Initialize the button UI"""
-        # Set button style
-        self.setStyleSheet(f"background-color: {self.sound.color}; color: white;")
+        """Initialize the button UI
         
+        Runs once per button; set_sound only refreshes the parts that
+        depend on the sound.
+        """
         # Set button size
         self.setMinimumSize(QSize(120, 80))
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
         
         # Set font
-        font = QFont()
-        font.setBold(True)
-        self.setFont(font)
+        if SoundButton._bold_font is None:
+            SoundButton._bold_font = QFont()
+            SoundButton._bold_font.setBold(True)
+        self.setFont(SoundButton._bold_font)
         
-        # Create button text with name, playback mode, and tags
-        button_text = self.sound.name
+        # Connect click event
+        self.clicked.connect(self.on_clicked)
         
-        # Add playback mode indicator
-        if self.sound.playback_mode == PlaybackMode.LOOP:
-            button_text += "\n[Loop]"
-        elif self.sound.playback_mode == PlaybackMode.PLAY_N_TIMES:
-            button_text += f"\n[x{self.sound.repeat_count}]"
+        self._refresh()
+    
+    def _refresh(self):
+        """Update the style and text from the current sound"""
+        # Set button colours; every call reparses, so only when they change
+        stylesheet = _stylesheet_for_color(self.sound.color)
+        if stylesheet != self._stylesheet:
+            self.setStyleSheet(stylesheet)
+            self._stylesheet = stylesheet
         
-        # Add tags if present
-        if self.sound.tags:
-            tags_text = ", ".join(self.sound.tags)
-            button_text += f"\n[{tags_text}]"
+        # Lowercased name, matched against search text by the main window
+        self.name_lower = self.sound.name.lower()
         
-        self.setText(button_text)
+        # Drag payload, serialized again on the next drag
+        self._mime_blob = None
         
-        # Connect click event
-        self.clicked.connect(self.on_clicked)
+        # Playback mode indicator
+        if self.sound.playback_mode == PlaybackMode.LOOP:
+            mode_text = "\n[Loop]"
+        elif self.sound.playback_mode == PlaybackMode.PLAY_N_TIMES:
+            mode_text = f"\n[x{self.sound.repeat_count}]"
+        else:
+            mode_text = ""
+        
+        # Tags if present
+        tags_text = f"\n[{', '.join(sorted(self.sound.tags))}]" if self.sound.tags else ""
         
-        # Set up context menu
-        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.customContextMenuRequested.connect(self.show_context_menu)
+        # Create button text with name, playback mode, and tags in one string
+        self.setText(f"{self.sound.name}{mode_text}{tags_text}")
     
     def set_sound(self, sound: Sound):
         """Update the button with a new sound"""
         self.sound = sound
-        self.init_ui()
+        self._refresh()
     
     def on_clicked(self):
         """Handle button click"""
         self.play_clicked.emit(self.sound)
     
-    def show_context_menu(self, pos):
+    def _emit_edit(self):
+        """Emit edit_clicked for the current sound"""
+        self.edit_clicked.emit(self.sound, self)
+    
+    def _emit_delete(self):
+        """Emit delete_clicked for the current sound"""
+        self.delete_clicked.emit(self.sound, self)
+    
+    def contextMenuEvent(self, event):
         """Show context menu for the button"""
-        menu = QMenu(self)
-        
-        # Add actions
-        play_action = QAction("Play", self)
-        play_action.triggered.connect(self.on_clicked)
-        menu.addAction(play_action)
-        
-        edit_action = QAction("Edit", self)
-        edit_action.triggered.connect(lambda: self.edit_clicked.emit(self.sound, self))
-        menu.addAction(edit_action)
-        
-        delete_action = QAction("Delete", self)
-        delete_action.triggered.connect(lambda: self.delete_clicked.emit(self.sound, self))
-        menu.addAction(delete_action)
+        if self._menu is None:
+            # Build the menu once and reuse it for every right-click
+            self._menu = QMenu(self)
+            
+            # Add actions
+            play_action = QAction("Play", self)
+            play_action.triggered.connect(self.on_clicked)
+            self._menu.addAction(play_action)
+            
+            edit_action = QAction("Edit", self)
+            edit_action.triggered.connect(self._emit_edit)
+            self._menu.addAction(edit_action)
+            
+            delete_action = QAction("Delete", self)
+            delete_action.triggered.connect(self._emit_delete)
+            self._menu.addAction(delete_action)
         
         # Show the menu
-        menu.exec(self.mapToGlobal(pos))
+        self._menu.exec(event.globalPos())
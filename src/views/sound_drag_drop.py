@@ -1,17 +1,26 @@
 """
 Drag and drop support for sound buttons
 """
-from PyQt6.QtCore import Qt, QMimeData, QUrl
+import orjson
+from PyQt6.QtCore import Qt, QMimeData, QUrl, QObject, QEvent
 from PyQt6.QtGui import QDrag
 from PyQt6.QtWidgets import QWidget, QApplication
 
 class SoundDragDrop:
     """Mixin class for drag and drop support for sound buttons"""
     
+    # Serialized sound for drags, reset to None whenever the sound changes
+    _mime_blob = None
+    
+    # QApplication.startDragDistance(), read on the first press
+    _drag_threshold = None
+    
     def mousePressEvent(self, event):
         """Handle mouse press event for drag and drop"""
         if event.button() == Qt.MouseButton.LeftButton:
             self.drag_start_position = event.position().toPoint()
+            if SoundDragDrop._drag_threshold is None:
+                SoundDragDrop._drag_threshold = QApplication.startDragDistance()
         
         # Call the parent class's mousePressEvent
         super().mousePressEvent(event)
@@ -22,7 +31,9 @@ class SoundDragDrop:
             return
         
         # Check if the mouse has moved far enough to start a drag
-        if (event.position().toPoint() - self.drag_start_position).manhattanLength() < QApplication.startDragDistance():
+        pos = event.position()
+        start = self.drag_start_position
+        if abs(int(pos.x()) - start.x()) + abs(int(pos.y()) - start.y()) < SoundDragDrop._drag_threshold:
             return
         
         # Create a drag object
@@ -31,7 +42,9 @@ class SoundDragDrop:
         
         # Store the sound data
         mime_data.setText(self.sound.file_path)
-        mime_data.setData("application/x-thamyris-sound", self.sound.to_dict().__str__().encode())
+        if self._mime_blob is None:
+            self._mime_blob = orjson.dumps(self.sound.to_dict())
+        mime_data.setData("application/x-thamyris-sound", self._mime_blob)
         
         drag.setMimeData(mime_data)
         
@@ -43,30 +56,39 @@ class SoundDragDrop:
         """Set up a widget as a drop area for sounds"""
         widget.setAcceptDrops(True)
         
-        # Store the original methods
-        original_dragEnterEvent = widget.dragEnterEvent if hasattr(widget, 'dragEnterEvent') else None
-        original_dropEvent = widget.dropEvent if hasattr(widget, 'dropEvent') else None
+        # The widget keeps the filter alive; events it does not accept
+        # fall through to the widget's own handlers
+        drop_filter = SoundDropFilter(callback, widget)
+        widget.installEventFilter(drop_filter)
+        widget._drop_filter = drop_filter
+
+
+class SoundDropFilter(QObject):
+    """Event filter that accepts dropped sounds and file paths"""
+    
+    def __init__(self, callback, parent=None):
+        """Initialize the filter
+        
+        Args:
+            callback: Called with the dropped file path
+            parent: Owner of the filter, usually the drop widget
+        """
+        super().__init__(parent)
+        self.callback = callback
+    
+    def eventFilter(self, obj, event):
+        """Handle drag enter and drop events for sounds"""
+        event_type = event.type()
+        if event_type != QEvent.Type.DragEnter and event_type != QEvent.Type.Drop:
+            return False
         
-        def dragEnterEvent(self, event):
-            """Handle drag enter event"""
-            if event.mimeData().hasText() or event.mimeData().hasFormat("application/x-thamyris-sound"):
-                event.acceptProposedAction()
-            elif original_dragEnterEvent:
-                original_dragEnterEvent(event)
+        mime_data = event.mimeData()
+        if not (mime_data.hasText() or mime_data.hasFormat("application/x-thamyris-sound")):
+            return False
         
-        def dropEvent(self, event):
-            """Handle drop event"""
-            if event.mimeData().hasText() or event.mimeData().hasFormat("application/x-thamyris-sound"):
-                # Get the file path from the mime data
-                file_path = event.mimeData().text()
-                
-                # Call the callback with the file path
-                callback(file_path)
-                
-                event.acceptProposedAction()
-            elif original_dropEvent:
-                original_dropEvent(event)
+        if event_type == QEvent.Type.Drop:
+            # Call the callback with the file path from the mime data
+            self.callback(mime_data.text())
         
-        # Replace the methods
-        widget.dragEnterEvent = dragEnterEvent.__get__(widget, type(widget))
-        widget.dropEvent = dropEvent.__get__(widget, type(widget))
+        event.acceptProposedAction()
+        return True
@@ -1,6 +1,8 @@
 """
 Sound editor dialog - Dialog for editing sound properties
 """
+import os
+
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
     QLineEdit, QComboBox, QSpinBox, QPushButton,
@@ -15,10 +17,32 @@ from models.sound import Sound, PlaybackMode, ChannelType
 class SoundEditorDialog(QDialog):
     """Dialog for editing sound properties"""
     
-    def __init__(self, sound, parent=None):
+    # Combo box items in display order, and each value's index in its combo
+    CHANNEL_ITEMS = (
+        ("Ambient", ChannelType.AMBIENT),
+        ("Effects 1", ChannelType.EFFECTS_1),
+        ("Effects 2", ChannelType.EFFECTS_2),
+        ("Effects 3", ChannelType.EFFECTS_3),
+    )
+    MODE_ITEMS = (
+        ("Play Once", PlaybackMode.PLAY_ONCE),
+        ("Play N Times", PlaybackMode.PLAY_N_TIMES),
+        ("Loop", PlaybackMode.LOOP),
+    )
+    _CHANNEL_INDEX = {channel: i for i, (_, channel) in enumerate(CHANNEL_ITEMS)}
+    _MODE_INDEX = {mode: i for i, (_, mode) in enumerate(MODE_ITEMS)}
+    
+    # Folder the last sound file was picked from, where browsing starts next
+    _last_directory = ""
+    
+    def __init__(self, sound=None, parent=None):
         super().__init__(parent)
-        self.sound = sound
+        self.sound = None
+        self._current_color = QColor()  # Set from the sound by set_sound
         self.init_ui()
+        
+        if sound is not None:
+            self.set_sound(sound)
     
     def init_ui(self):
         """Initialize the user interface"""
@@ -35,7 +59,7 @@ class SoundEditorDialog(QDialog):
         name_layout = QHBoxLayout()
         name_layout.addWidget(QLabel("Name:"))
         
-        self.name_edit = QLineEdit(self.sound.name)
+        self.name_edit = QLineEdit()
         name_layout.addWidget(self.name_edit)
         
         basic_layout.addLayout(name_layout)
@@ -44,7 +68,7 @@ class SoundEditorDialog(QDialog):
         file_layout = QHBoxLayout()
         file_layout.addWidget(QLabel("File:"))
         
-        self.file_edit = QLineEdit(self.sound.file_path)
+        self.file_edit = QLineEdit()
         self.file_edit.setReadOnly(True)
         file_layout.addWidget(self.file_edit)
         
@@ -59,15 +83,8 @@ class SoundEditorDialog(QDialog):
         channel_layout.addWidget(QLabel("Channel:"))
         
         self.channel_combo = QComboBox()
-        self.channel_combo.addItem("Ambient", ChannelType.AMBIENT)
-        self.channel_combo.addItem("Effects 1", ChannelType.EFFECTS_1)
-        self.channel_combo.addItem("Effects 2", ChannelType.EFFECTS_2)
-        self.channel_combo.addItem("Effects 3", ChannelType.EFFECTS_3)
-        
-        # Set current channel
-        index = self.channel_combo.findData(self.sound.channel)
-        if index >= 0:
-            self.channel_combo.setCurrentIndex(index)
+        for text, channel in self.CHANNEL_ITEMS:
+            self.channel_combo.addItem(text, channel)
         
         channel_layout.addWidget(self.channel_combo)
         
@@ -80,7 +97,6 @@ class SoundEditorDialog(QDialog):
         self.volume_spin = QDoubleSpinBox()
         self.volume_spin.setRange(0.0, 1.0)
         self.volume_spin.setSingleStep(0.1)
-        self.volume_spin.setValue(self.sound.volume)
         volume_layout.addWidget(self.volume_spin)
         
         basic_layout.addLayout(volume_layout)
@@ -96,14 +112,8 @@ class SoundEditorDialog(QDialog):
         mode_layout.addWidget(QLabel("Playback Mode:"))
         
         self.mode_combo = QComboBox()
-        self.mode_combo.addItem("Play Once", PlaybackMode.PLAY_ONCE)
-        self.mode_combo.addItem("Play N Times", PlaybackMode.PLAY_N_TIMES)
-        self.mode_combo.addItem("Loop", PlaybackMode.LOOP)
-        
-        # Set current mode
-        index = self.mode_combo.findData(self.sound.playback_mode)
-        if index >= 0:
-            self.mode_combo.setCurrentIndex(index)
+        for text, mode in self.MODE_ITEMS:
+            self.mode_combo.addItem(text, mode)
         
         self.mode_combo.currentIndexChanged.connect(self.on_mode_changed)
         mode_layout.addWidget(self.mode_combo)
@@ -116,7 +126,6 @@ class SoundEditorDialog(QDialog):
         
         self.repeat_spin = QSpinBox()
         self.repeat_spin.setRange(1, 100)
-        self.repeat_spin.setValue(self.sound.repeat_count)
         repeat_layout.addWidget(self.repeat_spin)
         
         playback_layout.addLayout(repeat_layout)
@@ -129,7 +138,6 @@ class SoundEditorDialog(QDialog):
         self.fade_in_spin.setRange(0, 10000)
         self.fade_in_spin.setSuffix(" ms")
         self.fade_in_spin.setSingleStep(100)
-        self.fade_in_spin.setValue(self.sound.fade_in)
         fade_layout.addWidget(self.fade_in_spin)
         
         fade_layout.addWidget(QLabel("Fade Out:"))
@@ -138,7 +146,6 @@ class SoundEditorDialog(QDialog):
         self.fade_out_spin.setRange(0, 10000)
         self.fade_out_spin.setSuffix(" ms")
         self.fade_out_spin.setSingleStep(100)
-        self.fade_out_spin.setValue(self.sound.fade_out)
         fade_layout.addWidget(self.fade_out_spin)
         
         playback_layout.addLayout(fade_layout)
@@ -151,7 +158,7 @@ class SoundEditorDialog(QDialog):
         
         tags_layout.addWidget(QLabel("Tags (comma-separated):"))
         
-        self.tags_edit = QLineEdit(self.sound.get_tags_as_string())
+        self.tags_edit = QLineEdit()
         tags_layout.addWidget(self.tags_edit)
         
         tags_help = QLabel("Example: monster,roar,loud")
@@ -167,7 +174,6 @@ class SoundEditorDialog(QDialog):
         appearance_layout.addWidget(QLabel("Button Color:"))
         
         self.color_button = QPushButton()
-        self.color_button.setStyleSheet(f"background-color: {self.sound.color};")
         self.color_button.setFixedSize(30, 30)
         self.color_button.clicked.connect(self.on_color_select)
         appearance_layout.addWidget(self.color_button)
@@ -186,18 +192,55 @@ class SoundEditorDialog(QDialog):
         button_box.addWidget(self.cancel_button)
         
         main_layout.addLayout(button_box)
+    
+    def set_sound(self, sound):
+        """Fill the fields from a sound so the dialog can be reused
+        
+        Args:
+            sound: The sound to edit
+        """
+        self.sound = sound
+        
+        self.name_edit.setText(sound.name)
+        self.file_edit.setText(sound.file_path)
+        
+        # Set current channel
+        index = self._CHANNEL_INDEX.get(sound.channel)
+        if index is not None:
+            self.channel_combo.setCurrentIndex(index)
+        
+        self.volume_spin.setValue(sound.volume)
+        
+        # Set current mode
+        index = self._MODE_INDEX.get(sound.playback_mode)
+        if index is not None:
+            self.mode_combo.setCurrentIndex(index)
+        
+        self.repeat_spin.setValue(sound.repeat_count)
+        self.fade_in_spin.setValue(sound.fade_in)
+        self.fade_out_spin.setValue(sound.fade_out)
+        self.tags_edit.setText(sound.get_tags_as_string())
+        
+        # Colour kept as a QColor; the swatch stylesheet is display only
+        self._current_color = QColor(sound.color)
+        self.color_button.setStyleSheet(f"background-color: {sound.color};")
         
         # Update UI based on current mode
         self.on_mode_changed(self.mode_combo.currentIndex())
     
     def on_browse(self):
         """Handle browse button click"""
+        # Skip the per-entry symlink and directory icon lookups, which are
+        # slow on large or remote sound folders
+        options = QFileDialog.Option.DontResolveSymlinks | QFileDialog.Option.DontUseCustomDirectoryIcons
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "Open Sound File", "",
-            "Audio Files (*.mp3 *.wav *.ogg *.flac);;All Files (*)"
+            self, "Open Sound File", SoundEditorDialog._last_directory,
+            "Audio Files (*.mp3 *.wav *.ogg *.flac);;All Files (*)",
+            options=options
         )
         
         if file_path:
+            SoundEditorDialog._last_directory = os.path.dirname(file_path)
             self.file_edit.setText(file_path)
     
     def on_mode_changed(self, index):
@@ -209,27 +252,41 @@ class SoundEditorDialog(QDialog):
     
     def on_color_select(self):
         """Handle color button click"""
-        color = QColorDialog.getColor(QColor(self.sound.color), self)
+        color = QColorDialog.getColor(self._current_color, self)
         
         if color.isValid():
+            self._current_color = color
             self.color_button.setStyleSheet(f"background-color: {color.name()};")
     
+    def _edited_fields(self):
+        """Read the edited properties from the widgets, by Sound field name"""
+        return {
+            'name': self.name_edit.text(),
+            'file_path': self.file_edit.text(),
+            'channel': self.channel_combo.currentData(),
+            'volume': self.volume_spin.value(),
+            'playback_mode': self.mode_combo.currentData(),
+            'repeat_count': self.repeat_spin.value(),
+            'fade_in': self.fade_in_spin.value(),
+            'fade_out': self.fade_out_spin.value(),
+            'color': self._current_color.name(),
+            # Normalized as Sound.add_tag does, in one pass over the text
+            'tags': {tag for tag in (part.lower().strip() for part in self.tags_edit.text().split(',')) if tag}
+        }
+    
     def get_sound(self):
-        """Get the edited sound"""
-        # Create a new Sound object with the edited properties
-        sound = Sound(
-            name=self.name_edit.text(),
-            file_path=self.file_edit.text(),
-            channel=self.channel_combo.currentData(),
-            volume=self.volume_spin.value(),
-            playback_mode=self.mode_combo.currentData(),
-            repeat_count=self.repeat_spin.value(),
-            fade_in=self.fade_in_spin.value(),
-            fade_out=self.fade_out_spin.value(),
-            color=self.color_button.styleSheet().split("background-color: ")[1].split(";")[0]
-        )
+        """Get the edited properties as a new sound"""
+        return Sound(**self._edited_fields())
+    
+    def apply_edits(self):
+        """Write the edited properties back onto the sound being edited
         
-        # Add tags from the tags edit field
-        sound.add_tags_from_string(self.tags_edit.text())
+        Fields the dialog does not show, such as the hotkey, are kept.
         
+        Returns:
+            The edited sound
+        """
+        sound = self.sound
+        for field_name, value in self._edited_fields().items():
+            setattr(sound, field_name, value)
         return sound
@@ -3,20 +3,30 @@ Search and filter functionality for sounds
 """
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QLineEdit, QPushButton, QComboBox, QCheckBox
+    QLineEdit, QPushButton, QComboBox, QCheckBox, QFrame
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QEvent, QPoint
 
 class SoundSearchBar(QWidget):
     """Widget for searching and filtering sounds"""
     
     # Signals
-    search_changed = pyqtSignal(str, list)  # Search text, list of tags to filter by
+    search_changed = pyqtSignal(str, object)  # Search text, frozenset of tags to filter by
+    
+    # Idle time after the last keystroke before search_changed is emitted
+    SEARCH_DELAY_MS = 120
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        
+        # A burst of keystrokes emits one search once typing pauses
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self._emit_search)
+        
         self.init_ui()
-        self.active_tags = []
+        self.active_tags = frozenset()
     
     def init_ui(self):
         """Initialize the user interface"""
@@ -40,12 +50,23 @@ class SoundSearchBar(QWidget):
         self.clear_button.clicked.connect(self.clear_search)
         main_layout.addWidget(self.clear_button)
         
-        # Tag filter panel (hidden by default)
-        self.tag_filter_panel = QWidget(self)
-        self.tag_filter_panel.setVisible(False)
+        # Tag filter panel, built the first time it is opened
+        self.tag_filter_panel = None
+        self._available_tags = set()
+        self._tag_checkboxes = {}  # Tag -> checkbox, once the panel exists
+    
+    def _build_tag_panel(self):
+        """Build the tag filter panel with the available tags
+        
+        The panel is a popup window, so it stays out of the search bar's
+        layout and closes by itself on a click outside it.
+        """
+        self.tag_filter_panel = QFrame(self, Qt.WindowType.Popup)
+        self.tag_filter_panel.setFrameShape(QFrame.Shape.StyledPanel)
+        self.tag_filter_panel.installEventFilter(self)
         panel_layout = QVBoxLayout(self.tag_filter_panel)
         
-        # Tag list
+        # Tag list, with each tag's checkbox by name
         self.tag_list_layout = QVBoxLayout()
         panel_layout.addLayout(self.tag_list_layout)
         
@@ -53,60 +74,95 @@ class SoundSearchBar(QWidget):
         self.apply_button = QPushButton("Apply Filters")
         self.apply_button.clicked.connect(self.apply_tag_filters)
         panel_layout.addWidget(self.apply_button)
+        
+        self.update_available_tags(self._available_tags)
     
     def on_search_changed(self, text):
         """Handle search text change"""
-        self.search_changed.emit(text, self.active_tags)
+        # Restarting the timer drops the previous pending search
+        self._search_timer.start()
+    
+    def _emit_search(self):
+        """Emit the current search text and tag filters"""
+        self._search_timer.stop()
+        self.search_changed.emit(self.search_input.text(), self.active_tags)
     
     def on_tag_filter_clicked(self, checked):
         """Handle tag filter button click"""
-        self.tag_filter_panel.setVisible(checked)
+        if self.tag_filter_panel is None:
+            if not checked:
+                return
+            self._build_tag_panel()
         
-        # Position the panel below the search bar
-        if checked:
-            self.tag_filter_panel.move(0, self.height())
-            self.tag_filter_panel.resize(self.width(), 200)
+        if not checked:
+            self.tag_filter_panel.hide()
+            return
+        
+        # Show the panel below the search bar, at least as wide as it
+        self.tag_filter_panel.setMinimumWidth(self.width())
+        self.tag_filter_panel.adjustSize()
+        self.tag_filter_panel.move(self.mapToGlobal(QPoint(0, self.height())))
+        self.tag_filter_panel.show()
+    
+    def eventFilter(self, obj, event):
+        """Uncheck the Tags button when the popup closes itself"""
+        if obj is self.tag_filter_panel and event.type() == QEvent.Type.Hide:
+            self.tag_filter_button.setChecked(False)
+        return super().eventFilter(obj, event)
     
     def clear_search(self):
         """Clear the search input and tag filters"""
         self.search_input.clear()
-        self.active_tags = []
+        self.active_tags = frozenset()
         
-        # Update checkboxes
-        for i in range(self.tag_list_layout.count()):
-            widget = self.tag_list_layout.itemAt(i).widget()
-            if isinstance(widget, QCheckBox):
-                widget.setChecked(False)
+        # Update checkboxes quietly; one search is emitted below
+        for checkbox in self._tag_checkboxes.values():
+            checkbox.blockSignals(True)
+            checkbox.setChecked(False)
+            checkbox.blockSignals(False)
         
-        self.search_changed.emit("", [])
+        self._emit_search()
     
     def update_available_tags(self, tags):
-        """Update the list of available tags"""
-        # Clear existing tags
-        while self.tag_list_layout.count():
-            item = self.tag_list_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # Add new tags
-        for tag in sorted(tags):
-            checkbox = QCheckBox(tag)
+        """Update the list of available tags
+        
+        Checkboxes for tags that remain are kept; only removed tags lose
+        theirs and only new tags get one, inserted in sorted order.
+        """
+        new_tags = set(tags)
+        self._available_tags = new_tags
+        
+        # Without the panel there are no checkboxes to update yet
+        if self.tag_filter_panel is None:
+            return
+        
+        # Remove checkboxes for tags that are gone
+        for tag in self._tag_checkboxes.keys() - new_tags:
+            checkbox = self._tag_checkboxes.pop(tag)
+            self.tag_list_layout.removeWidget(checkbox)
+            checkbox.deleteLater()
+        
+        # Add new tags at their sorted position and refresh the rest
+        for position, tag in enumerate(sorted(new_tags)):
+            checkbox = self._tag_checkboxes.get(tag)
+            if checkbox is None:
+                checkbox = QCheckBox(tag)
+                self.tag_list_layout.insertWidget(position, checkbox)
+                self._tag_checkboxes[tag] = checkbox
+            checkbox.blockSignals(True)
             checkbox.setChecked(tag in self.active_tags)
-            self.tag_list_layout.addWidget(checkbox)
+            checkbox.blockSignals(False)
     
     def apply_tag_filters(self):
         """Apply the selected tag filters"""
-        self.active_tags = []
-        
         # Get selected tags
-        for i in range(self.tag_list_layout.count()):
-            widget = self.tag_list_layout.itemAt(i).widget()
-            if isinstance(widget, QCheckBox) and widget.isChecked():
-                self.active_tags.append(widget.text())
+        self.active_tags = frozenset(
+            tag for tag, checkbox in self._tag_checkboxes.items() if checkbox.isChecked()
+        )
         
-        # Hide the panel
-        self.tag_filter_button.setChecked(False)
-        self.tag_filter_panel.setVisible(False)
+        # Hide the panel; the Tags button is unchecked when it hides
+        if self.tag_filter_panel is not None:
+            self.tag_filter_panel.hide()
         
         # Emit signal
-        self.search_changed.emit(self.search_input.text(), self.active_tags)
+        self._emit_search()
@@ -1,129 +1,329 @@
 """
 Theme manager - Handles application theming
 """
+import functools
+import string
+from typing import Dict, Optional
+
+from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QPalette, QColor
 from PyQt6.QtWidgets import QApplication
 
 from models.settings import Theme
 
+
+# Palette colours per theme, as (role, (r, g, b))
+_LIGHT_COLORS = (
+    (QPalette.ColorRole.Window, (240, 240, 240)),
+    (QPalette.ColorRole.WindowText, (0, 0, 0)),
+    (QPalette.ColorRole.Base, (255, 255, 255)),
+    (QPalette.ColorRole.AlternateBase, (245, 245, 245)),
+    (QPalette.ColorRole.ToolTipBase, (255, 255, 220)),
+    (QPalette.ColorRole.ToolTipText, (0, 0, 0)),
+    (QPalette.ColorRole.Text, (0, 0, 0)),
+    (QPalette.ColorRole.Button, (240, 240, 240)),
+    (QPalette.ColorRole.ButtonText, (0, 0, 0)),
+    (QPalette.ColorRole.BrightText, (255, 0, 0)),
+    (QPalette.ColorRole.Link, (0, 0, 255)),
+    (QPalette.ColorRole.Highlight, (42, 130, 218)),
+    (QPalette.ColorRole.HighlightedText, (255, 255, 255)),
+)
+
+_DARK_COLORS = (
+    (QPalette.ColorRole.Window, (53, 53, 53)),
+    (QPalette.ColorRole.WindowText, (255, 255, 255)),
+    (QPalette.ColorRole.Base, (25, 25, 25)),
+    (QPalette.ColorRole.AlternateBase, (53, 53, 53)),
+    (QPalette.ColorRole.ToolTipBase, (53, 53, 53)),
+    (QPalette.ColorRole.ToolTipText, (255, 255, 255)),
+    (QPalette.ColorRole.Text, (255, 255, 255)),
+    (QPalette.ColorRole.Button, (53, 53, 53)),
+    (QPalette.ColorRole.ButtonText, (255, 255, 255)),
+    (QPalette.ColorRole.BrightText, (255, 0, 0)),
+    (QPalette.ColorRole.Link, (42, 130, 218)),
+    (QPalette.ColorRole.Highlight, (42, 130, 218)),
+    (QPalette.ColorRole.HighlightedText, (255, 255, 255)),
+)
+
+# Stylesheets for additional customization
+_LIGHT_QSS = """
+    QGroupBox {
+        border: 1px solid #cccccc;
+        border-radius: 5px;
+        margin-top: 1ex;
+        font-weight: bold;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top center;
+        padding: 0 3px;
+    }
+"""
+
+_DARK_QSS = """
+    QGroupBox {
+        border: 1px solid #555555;
+        border-radius: 5px;
+        margin-top: 1ex;
+        font-weight: bold;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top center;
+        padding: 0 3px;
+    }
+    QPushButton {
+        background-color: #444444;
+        border: 1px solid #555555;
+        border-radius: 4px;
+        padding: 5px;
+    }
+    QPushButton:hover {
+        background-color: #555555;
+    }
+    QPushButton:pressed {
+        background-color: #333333;
+    }
+    QTabWidget::pane {
+        border: 1px solid #555555;
+        border-radius: 4px;
+    }
+    QTabBar::tab {
+        background-color: #444444;
+        border: 1px solid #555555;
+        border-bottom-color: #555555;
+        border-top-left-radius: 4px;
+        border-top-right-radius: 4px;
+        padding: 5px;
+    }
+    QTabBar::tab:selected {
+        background-color: #333333;
+    }
+    QTabBar::tab:hover {
+        background-color: #555555;
+    }
+"""
+
+# Stylesheet for custom themes, filled in from the theme's colours
+_CUSTOM_QSS_TEMPLATE = string.Template("""
+    QGroupBox {
+        border: 1px solid $border;
+        border-radius: 5px;
+        margin-top: 1ex;
+        font-weight: bold;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top center;
+        padding: 0 3px;
+    }
+    QPushButton {
+        background-color: $button;
+        border: 1px solid $border;
+        border-radius: 4px;
+        padding: 5px;
+    }
+    QPushButton:hover {
+        background-color: $button_hover;
+    }
+    QPushButton:pressed {
+        background-color: $button_pressed;
+    }
+    QTabWidget::pane {
+        border: 1px solid $border;
+        border-radius: 4px;
+    }
+    QTabBar::tab {
+        background-color: $button;
+        border: 1px solid $border;
+        border-bottom-color: $border;
+        border-top-left-radius: 4px;
+        border-top-right-radius: 4px;
+        padding: 5px;
+    }
+    QTabBar::tab:selected {
+        background-color: $button_pressed;
+    }
+    QTabBar::tab:hover {
+        background-color: $button_hover;
+    }
+""")
+
+# Palette role for each colour key in a theme file
+_ROLE_BY_KEY = {
+    'window': QPalette.ColorRole.Window,
+    'windowText': QPalette.ColorRole.WindowText,
+    'base': QPalette.ColorRole.Base,
+    'alternateBase': QPalette.ColorRole.AlternateBase,
+    'toolTipBase': QPalette.ColorRole.ToolTipBase,
+    'toolTipText': QPalette.ColorRole.ToolTipText,
+    'text': QPalette.ColorRole.Text,
+    'button': QPalette.ColorRole.Button,
+    'buttonText': QPalette.ColorRole.ButtonText,
+    'brightText': QPalette.ColorRole.BrightText,
+    'link': QPalette.ColorRole.Link,
+    'highlight': QPalette.ColorRole.Highlight,
+    'highlightedText': QPalette.ColorRole.HighlightedText
+}
+
+
+@functools.lru_cache(maxsize=16)
+def _compile_custom_qss(button: str) -> str:
+    """Fill in the custom stylesheet for a button colour
+    
+    Borders and the hover and pressed shades are derived from the button
+    colour; results are memoized per colour.
+    
+    Args:
+        button: Button colour name, such as '#353535'
+    
+    Returns:
+        The stylesheet
+    """
+    color = QColor(button)
+    return _CUSTOM_QSS_TEMPLATE.substitute(
+        border=color.lighter(160).name(),
+        button=color.lighter(130).name(),
+        button_hover=color.lighter(160).name(),
+        button_pressed=color.name()
+    )
+
+
+@functools.cache
+def _color(rgb) -> QColor:
+    """Get one shared QColor per (r, g, b); setColor copies it"""
+    return QColor(*rgb)
+
+
+@functools.cache
+def _build_palette(colors) -> QPalette:
+    """Build a theme's palette once; later calls share it
+    
+    Args:
+        colors: Tuple of (role, (r, g, b)) pairs
+    
+    Returns:
+        The palette
+    """
+    palette = QPalette()
+    for role, rgb in colors:
+        palette.setColor(role, _color(rgb))
+    return palette
+
+
 class ThemeManager:
     """Class for managing application themes"""
     
+    # Theme last applied to the application, None until one is; custom
+    # themes are recorded with their colours
+    _current_theme = None
+    
+    # Theme waiting for the next event loop pass, so back-to-back
+    # apply_theme calls restyle the application once
+    _pending_theme = None
+    
+    @staticmethod
+    def apply_theme(theme: Theme, colors: Optional[Dict[str, str]] = None):
+        """Apply a theme to the application on the next event loop pass
+        
+        Only the last theme requested before then is applied.
+        
+        Args:
+            theme: Theme to apply
+            colors: Colours for Theme.CUSTOM, as stored by ThemeFileManager
+        """
+        if ThemeManager._pending_theme is None:
+            QTimer.singleShot(0, ThemeManager.flush_pending_theme)
+        ThemeManager._pending_theme = (theme, colors)
+    
     @staticmethod
-    def apply_theme(theme: Theme):
-        """Apply a theme to the application"""
+    def flush_pending_theme():
+        """Apply the pending theme now, if there is one
+        
+        Call this before showing a window so it first paints themed.
+        """
+        pending = ThemeManager._pending_theme
+        ThemeManager._pending_theme = None
+        if pending is not None:
+            ThemeManager._apply_theme_now(*pending)
+    
+    @staticmethod
+    def _apply_theme_now(theme: Theme, colors: Optional[Dict[str, str]] = None):
+        """Apply a theme to the application, unless it is already applied"""
+        if theme == Theme.CUSTOM and colors:
+            ThemeManager.apply_custom_theme(colors)
+            return
+        
+        if theme == ThemeManager._current_theme:
+            return
+        
         if theme == Theme.LIGHT:
-            ThemeManager.apply_light_theme()
+            applied = ThemeManager._apply(_LIGHT_COLORS, _LIGHT_QSS)
         elif theme == Theme.DARK:
-            ThemeManager.apply_dark_theme()
+            applied = ThemeManager._apply(_DARK_COLORS, _DARK_QSS)
         elif theme == Theme.CUSTOM:
-            # Custom theme would be implemented here
-            ThemeManager.apply_dark_theme()  # Default to dark for now
+            # No theme file could be loaded for the custom theme; use dark
+            applied = ThemeManager._apply(_DARK_COLORS, _DARK_QSS)
+        else:
+            applied = False
+        
+        if applied:
+            ThemeManager._current_theme = theme
     
     @staticmethod
     def apply_light_theme():
         """Apply light theme to the application"""
-        app = QApplication.instance()
-        if not app:
-            return
+        ThemeManager._pending_theme = None  # This call supersedes a queued theme
+        if ThemeManager._apply(_LIGHT_COLORS, _LIGHT_QSS):
+            ThemeManager._current_theme = Theme.LIGHT
+    
+    @staticmethod
+    def apply_dark_theme():
+        """Apply dark theme to the application"""
+        ThemeManager._pending_theme = None  # This call supersedes a queued theme
+        if ThemeManager._apply(_DARK_COLORS, _DARK_QSS):
+            ThemeManager._current_theme = Theme.DARK
+    
+    @staticmethod
+    def apply_custom_theme(colors: Dict[str, str]):
+        """Apply a custom theme's colours to the application
         
-        palette = QPalette()
-        palette.setColor(QPalette.ColorRole.Window, QColor(240, 240, 240))
-        palette.setColor(QPalette.ColorRole.WindowText, QColor(0, 0, 0))
-        palette.setColor(QPalette.ColorRole.Base, QColor(255, 255, 255))
-        palette.setColor(QPalette.ColorRole.AlternateBase, QColor(245, 245, 245))
-        palette.setColor(QPalette.ColorRole.ToolTipBase, QColor(255, 255, 220))
-        palette.setColor(QPalette.ColorRole.ToolTipText, QColor(0, 0, 0))
-        palette.setColor(QPalette.ColorRole.Text, QColor(0, 0, 0))
-        palette.setColor(QPalette.ColorRole.Button, QColor(240, 240, 240))
-        palette.setColor(QPalette.ColorRole.ButtonText, QColor(0, 0, 0))
-        palette.setColor(QPalette.ColorRole.BrightText, QColor(255, 0, 0))
-        palette.setColor(QPalette.ColorRole.Link, QColor(0, 0, 255))
-        palette.setColor(QPalette.ColorRole.Highlight, QColor(42, 130, 218))
-        palette.setColor(QPalette.ColorRole.HighlightedText, QColor(255, 255, 255))
+        Args:
+            colors: Colour names by theme file key, as stored by ThemeFileManager
+        """
+        palette_colors = tuple(
+            (_ROLE_BY_KEY[key], QColor(value).getRgb()[:3])
+            for key, value in sorted(colors.items()) if key in _ROLE_BY_KEY
+        )
         
-        app.setPalette(palette)
+        ThemeManager._pending_theme = None  # This call supersedes a queued theme
         
-        # Set stylesheet for additional customization
-        app.setStyleSheet("""
-            QGroupBox {
-                border: 1px solid #cccccc;
-                border-radius: 5px;
-                margin-top: 1ex;
-                font-weight: bold;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top center;
-                padding: 0 3px;
-            }
-        """)
+        # The same custom colours are already applied
+        current = (Theme.CUSTOM, palette_colors)
+        if current == ThemeManager._current_theme:
+            return
+        
+        stylesheet = _compile_custom_qss(colors.get('button', '#353535'))
+        if ThemeManager._apply(palette_colors, stylesheet):
+            ThemeManager._current_theme = current
     
     @staticmethod
-    def apply_dark_theme():
-        """Apply dark theme to the application"""
+    def _apply(colors, stylesheet: str) -> bool:
+        """Apply a palette and stylesheet to the application
+        
+        Re-applying the current stylesheet is skipped, since every
+        setStyleSheet call reparses it and restyles all widgets.
+        
+        Returns:
+            False if there is no application to theme
+        """
         app = QApplication.instance()
         if not app:
-            return
+            return False
         
-        palette = QPalette()
-        palette.setColor(QPalette.ColorRole.Window, QColor(53, 53, 53))
-        palette.setColor(QPalette.ColorRole.WindowText, QColor(255, 255, 255))
-        palette.setColor(QPalette.ColorRole.Base, QColor(25, 25, 25))
-        palette.setColor(QPalette.ColorRole.AlternateBase, QColor(53, 53, 53))
-        palette.setColor(QPalette.ColorRole.ToolTipBase, QColor(53, 53, 53))
-        palette.setColor(QPalette.ColorRole.ToolTipText, QColor(255, 255, 255))
-        palette.setColor(QPalette.ColorRole.Text, QColor(255, 255, 255))
-        palette.setColor(QPalette.ColorRole.Button, QColor(53, 53, 53))
-        palette.setColor(QPalette.ColorRole.ButtonText, QColor(255, 255, 255))
-        palette.setColor(QPalette.ColorRole.BrightText, QColor(255, 0, 0))
-        palette.setColor(QPalette.ColorRole.Link, QColor(42, 130, 218))
-        palette.setColor(QPalette.ColorRole.Highlight, QColor(42, 130, 218))
-        palette.setColor(QPalette.ColorRole.HighlightedText, QColor(255, 255, 255))
+        app.setPalette(_build_palette(colors))
         
-        app.setPalette(palette)
+        if app.styleSheet() != stylesheet:
+            app.setStyleSheet(stylesheet)
         
-        # Set stylesheet for additional customization
-        app.setStyleSheet("""
-            QGroupBox {
-                border: 1px solid #555555;
-                border-radius: 5px;
-                margin-top: 1ex;
-                font-weight: bold;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top center;
-                padding: 0 3px;
-            }
-            QPushButton {
-                background-color: #444444;
-                border: 1px solid #555555;
-                border-radius: 4px;
-                padding: 5px;
-            }
-            QPushButton:hover {
-                background-color: #555555;
-            }
-            QPushButton:pressed {
-                background-color: #333333;
-            }
-            QTabWidget::pane {
-                border: 1px solid #555555;
-                border-radius: 4px;
-            }
-            QTabBar::tab {
-                background-color: #444444;
-                border: 1px solid #555555;
-                border-bottom-color: #555555;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-                padding: 5px;
-            }
-            QTabBar::tab:selected {
-                background-color: #333333;
-            }
-            QTabBar::tab:hover {
-                background-color: #555555;
-            }
-        """)
+        return True
@@ -0,0 +1,82 @@
+"""
+Sound button colours - Pixel checks that the sound colour survives each theme
+"""
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+pytest.importorskip('orjson')
+QtWidgets = pytest.importorskip('PyQt6.QtWidgets')
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+
+from models.sound import Sound
+from views.sound_button import SoundButton
+from views.theme_manager import ThemeManager
+
+
+SOUND_COLOR = '#aa2222'
+
+# Colours as stored in a theme file, for the custom theme
+CUSTOM_COLORS = {
+    'window': '#202830',
+    'windowText': '#ffffff',
+    'base': '#101820',
+    'text': '#ffffff',
+    'button': '#304050',
+    'buttonText': '#ffffff'
+}
+
+
+@pytest.fixture(scope='module')
+def app():
+    """The application, created once for the module"""
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture(params=['light', 'dark', 'custom'])
+def themed_app(request, app):
+    """The application with each theme applied in turn"""
+    if request.param == 'light':
+        ThemeManager.apply_light_theme()
+    elif request.param == 'dark':
+        ThemeManager.apply_dark_theme()
+    else:
+        ThemeManager.apply_custom_theme(CUSTOM_COLORS)
+    yield app
+    app.setStyleSheet('')
+
+
+def _background(button: SoundButton) -> str:
+    """Colour of the button's background, away from its border and text"""
+    image = button.grab().toImage()
+    return image.pixelColor(10, 10).name()
+
+
+def _make_button() -> SoundButton:
+    """A sized button for a coloured sound without text"""
+    button = SoundButton(Sound(name='', file_path='missing.wav', color=SOUND_COLOR))
+    button.resize(120, 80)
+    return button
+
+
+def test_normal_uses_sound_color(themed_app):
+    button = _make_button()
+    assert _background(button) == SOUND_COLOR
+
+
+def test_hover_uses_lighter_sound_color(themed_app):
+    button = _make_button()
+    button.setAttribute(Qt.WidgetAttribute.WA_UnderMouse, True)
+    assert _background(button) == QColor(SOUND_COLOR).lighter(125).name()
+
+
+def test_pressed_uses_darker_sound_color(themed_app):
+    button = _make_button()
+    button.setDown(True)
+    assert _background(button) == QColor(SOUND_COLOR).darker(125).name()